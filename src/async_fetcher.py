@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from rate_limiter import HostRateLimiter
+
+
+class AsyncFetcher:
+    """asyncio 기반 페이지 수집기 (동시 요청 수와 호스트별 초당 요청 수 제한)
+
+    fetch_fn은 항목을 받아 결과를 반환하는 동기 함수이며, 전용 스레드 풀에서 실행된다.
+    속도 제한 대기는 이벤트 루프에서 처리하므로 대기 중인 요청이 스레드를 차지하지 않는다.
+    rate_limiter를 넘기면 크롤러의 다른 요청과 같은 호스트별 예산을 공유하고, url_fn으로 항목에서 URL을 꺼낸다.
+    """
+    def __init__(self, fetch_fn, concurrency=4, rate_limit=2.0, rate_limiter=None, url_fn=None):
+        self.fetch_fn = fetch_fn
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else HostRateLimiter(rate=rate_limit)
+        self.url_fn = url_fn or (lambda item: item)
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        # 스트림 모드의 입력 큐 get / 출력 콜백은 fetch 스레드 풀과 분리 (큐가 막혀도 요청은 계속 진행)
+        self.reader = ThreadPoolExecutor(max_workers=1)
+        self.writer = ThreadPoolExecutor(max_workers=1)
+
+    async def fetch(self, item, semaphore):
+        async with semaphore:
+            await self.rate_limiter.wait_async(self.url_fn(item))
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self.executor, self.fetch_fn, item)
+            except Exception as e:
+                logging.error(f"비동기 수집 실패 ({item}): {e}")
+                return None
+
+    async def fetch_all_async(self, urls):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        return await asyncio.gather(*(self.fetch(url, semaphore) for url in urls))
+
+    def fetch_all(self, urls):
+        """URL 목록을 동시에 수집하여 입력 순서대로 결과 반환 (실패한 URL은 None)"""
+        urls = list(urls)
+        if not urls:
+            return []
+        return asyncio.run(self.fetch_all_async(urls))
+
+    async def stream_async(self, get_item, on_result, stop):
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pending = asyncio.Queue(maxsize=self.concurrency)
+
+        async def worker():
+            while True:
+                item = await pending.get()
+                if item is stop:
+                    break
+                result = await self.fetch(item, semaphore)
+                # on_result가 다음 단계 큐에서 대기하면 이 워커도 멈춰 backpressure가 앞 단계로 전달됨
+                await loop.run_in_executor(self.writer, on_result, item, result)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        while True:
+            item = await loop.run_in_executor(self.reader, get_item)
+            if item is stop:
+                break
+            await pending.put(item)
+        for _ in workers:
+            await pending.put(stop)
+        await asyncio.gather(*workers)
+
+    def stream(self, get_item, on_result, stop):
+        """get_item()이 stop을 반환할 때까지 항목을 꺼내 동시에 수집하고, 끝난 순서대로 on_result(item, result) 호출
+
+        호출한 스레드에서 이벤트 루프를 실행하며, 남은 요청이 모두 끝난 뒤 반환한다.
+        """
+        asyncio.run(self.stream_async(get_item, on_result, stop))
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.reader.shutdown(wait=True)
+        self.writer.shutdown(wait=True)
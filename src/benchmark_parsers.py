@@ -0,0 +1,93 @@
+import argparse
+import json
+import logging
+import time
+
+from html_archive import ArchiveReader
+from html_parser import available_backends
+from rndjob_job_crawler import RndJobCrawler
+
+RNDJOB_LIST_URL = "https://www.rndjob.or.kr/info/sp_rsch.asp"
+REFERENCE_BACKEND = 'bs4'
+
+
+def load_pages(archive_dir, run_id=None, limit=None):
+    """아카이브에 저장된 rndjob 목록/상세 페이지를 (종류, URL, HTML) 목록으로 읽기"""
+    reader = ArchiveReader(archive_dir)
+    pages = reader.latest(run_id)
+    samples = []
+    for entry in pages.values():
+        header, html = reader.read(entry)
+        url = header['url']
+        if 'company_info.asp' in url:
+            continue  # 회사 정보 페이지는 상세 페이지 파싱 중에 아카이브에서 읽음
+        samples.append(('list' if url.startswith(RNDJOB_LIST_URL) else 'detail', url, html))
+        if limit and len(samples) >= limit:
+            break
+    return reader, pages, samples
+
+
+def parse_pages(crawler, samples):
+    """백엔드 하나로 모든 페이지를 파싱하여 (결과 목록, 종류별 소요 시간) 반환"""
+    results = []
+    elapsed = {'list': 0.0, 'detail': 0.0}
+    for kind, url, html in samples:
+        started = time.perf_counter()
+        doc = crawler.parse_html(html)
+        if kind == 'list':
+            result = [crawler.get_board_headers(doc), crawler.get_board_rows(doc), crawler.get_pagination_info(doc)]
+        else:
+            result = crawler.parse_job_detail(doc, url)
+        elapsed[kind] += time.perf_counter() - started
+        results.append(result)
+    return results, elapsed
+
+
+def run_benchmark(archive_dir, backends, run_id=None, limit=None, repeat=3):
+    reader, pages, samples = load_pages(archive_dir, run_id, limit)
+    if not samples:
+        logging.error(f"아카이브에 rndjob 페이지가 없습니다: {archive_dir}")
+        return
+    counts = {kind: sum(1 for sample in samples if sample[0] == kind) for kind in ('list', 'detail')}
+    print(f"페이지 {len(samples)}개 (목록 {counts['list']}, 상세 {counts['detail']})로 {repeat}회 반복 측정")
+
+    # 결과 비교 기준은 기존 BeautifulSoup(html.parser) 방식
+    reference = None
+    for name in [REFERENCE_BACKEND] + [name for name in backends if name != REFERENCE_BACKEND]:
+        crawler = RndJobCrawler(parser_backend=name)
+        crawler.use_archive_pages(reader, pages)
+        best = None
+        for _ in range(repeat):
+            results, elapsed = parse_pages(crawler, samples)
+            if best is None or sum(elapsed.values()) < sum(best.values()):
+                best = elapsed
+        # dict 순서까지 같아야 CSV 컬럼 순서가 같으므로 JSON 문자열로 비교
+        serialized = [json.dumps(result, ensure_ascii=False) for result in results]
+        if reference is None:
+            reference = serialized
+        mismatches = [url for (_, url, _), got, ref in zip(samples, serialized, reference) if got != ref]
+
+        total = sum(best.values())
+        print(f"{name:<11} 전체 {total * 1000:8.1f}ms | 목록 {per_page(best['list'], counts['list']):6.2f}ms/page | "
+              f"상세 {per_page(best['detail'], counts['detail']):6.2f}ms/page | 결과 불일치 {len(mismatches)}건")
+        for url in mismatches[:5]:
+            print(f"    불일치: {url}")
+    reader.close()
+
+
+def per_page(seconds, count):
+    return seconds * 1000 / count if count else 0.0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Compare HTML parser backends on archived rndjob pages')
+    parser.add_argument('--archive-dir', default='crawled_data/html_archive/rndjob', help='rndjob HTML archive directory')
+    parser.add_argument('--run', type=float, help='Run id to benchmark (default: latest page of every URL)')
+    parser.add_argument('--backends', nargs='+', choices=available_backends(), default=available_backends(),
+                        help='Parser backends to compare (bs4 is always run as the reference)')
+    parser.add_argument('--limit', type=int, help='Maximum number of pages to parse')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of timing rounds per backend (best is reported)')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    run_benchmark(args.archive_dir, args.backends, run_id=args.run, limit=args.limit, repeat=args.repeat)
@@ -0,0 +1,59 @@
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+
+
+class CrawlCheckpoint:
+    """크롤링 진행 상황을 JSON 파일로 주기적/원자적으로 저장"""
+    def __init__(self, path, interval=10):
+        self.path = path
+        self.interval = max(1, interval)  # 몇 건의 작업마다 저장할지
+        self.pending_updates = 0
+
+    def load(self):
+        """마지막 체크포인트 읽기 (없거나 손상되었으면 None)"""
+        if not self.path or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+            logging.info(f"체크포인트 로드: {self.path} (저장 시각: {state.get('saved_at')})")
+            return state
+        except (OSError, ValueError) as e:
+            logging.warning(f"체크포인트를 읽을 수 없어 처음부터 시작합니다: {e}")
+            return None
+
+    def save(self, state):
+        """임시 파일에 쓴 뒤 rename하여 중간에 죽어도 이전 체크포인트가 깨지지 않도록 저장"""
+        checkpoint_dir = os.path.dirname(self.path) or '.'
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        state = dict(state, saved_at=datetime.now().isoformat(timespec='seconds'))
+        fd, tmp_path = tempfile.mkstemp(dir=checkpoint_dir, prefix='.checkpoint-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, default=str)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.pending_updates = 0
+
+    def update(self, state_fn, force=False):
+        """작업 1건 완료를 기록하고 interval마다 state_fn()의 결과를 저장"""
+        self.pending_updates += 1
+        if force or self.pending_updates >= self.interval:
+            try:
+                self.save(state_fn())
+            except Exception as e:
+                logging.error(f"체크포인트 저장 실패: {e}")
+
+    def clear(self):
+        """크롤링이 정상 종료되면 체크포인트 삭제"""
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+            logging.info(f"체크포인트 삭제: {self.path}")
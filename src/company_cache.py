@@ -0,0 +1,108 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class CompanyCache:
+    """회사 ID(jsno)를 키로 회사 상세 정보를 저장하는 캐시 (TTL 만료, LRU 크기 제한, SQLite에 영구 저장)
+
+    값은 접두사가 붙지 않은 {항목명: 값} 형태로 저장하여 RndJobCrawler(회사_상세_)와
+    ResearchCompanyCrawler(상세_)가 같은 항목을 공유한다.
+    """
+    def __init__(self, db_path='crawled_data/company_cache.sqlite', ttl=7 * 24 * 3600, max_entries=5000):
+        self.db_path = db_path
+        self.ttl = ttl  # 초 단위 유효 기간 (0 이하이면 항상 만료)
+        self.max_entries = max(1, int(max_entries))
+        self.memory = OrderedDict()  # company_id -> (fetched_at, info), 최근 사용한 항목이 뒤쪽
+        self.lock = threading.Lock()
+        self.stats = {'hit': 0, 'miss': 0, 'expired': 0, 'evicted': 0}
+        self.conn = None
+        if db_path:
+            db_dir = os.path.dirname(db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            with self.lock, self.conn:
+                self.conn.execute("""
+                    CREATE TABLE IF NOT EXISTS companies (
+                        company_id TEXT PRIMARY KEY,
+                        info_json TEXT,
+                        fetched_at REAL,
+                        last_used REAL
+                    )
+                """)
+
+    def is_fresh(self, fetched_at):
+        return self.ttl > 0 and time.time() - fetched_at < self.ttl
+
+    def get(self, company_id):
+        """유효한 캐시 항목 반환 (없거나 만료되었으면 None)"""
+        company_id = str(company_id)
+        with self.lock:
+            entry = self.memory.get(company_id)
+            if entry is None and self.conn:
+                row = self.conn.execute(
+                    "SELECT fetched_at, info_json FROM companies WHERE company_id = ?", (company_id,)
+                ).fetchone()
+                if row:
+                    entry = (row[0], json.loads(row[1]))
+            if entry is None:
+                self.stats['miss'] += 1
+                return None
+            if not self.is_fresh(entry[0]):
+                self.stats['expired'] += 1
+                self.memory.pop(company_id, None)
+                return None
+            self.stats['hit'] += 1
+            self.remember(company_id, entry)
+            if self.conn:
+                with self.conn:
+                    self.conn.execute("UPDATE companies SET last_used = ? WHERE company_id = ?",
+                                      (time.time(), company_id))
+            return dict(entry[1])
+
+    def put(self, company_id, info):
+        """회사 상세 정보 저장 (크기 제한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제)"""
+        company_id = str(company_id)
+        now = time.time()
+        with self.lock:
+            self.remember(company_id, (now, dict(info)))
+            if self.conn:
+                with self.conn:
+                    self.conn.execute("""
+                        INSERT INTO companies (company_id, info_json, fetched_at, last_used)
+                        VALUES (?, ?, ?, ?)
+                        ON CONFLICT(company_id) DO UPDATE SET
+                            info_json = excluded.info_json,
+                            fetched_at = excluded.fetched_at,
+                            last_used = excluded.last_used
+                    """, (company_id, json.dumps(info, ensure_ascii=False), now, now))
+                    evicted = self.conn.execute("""
+                        DELETE FROM companies WHERE company_id IN (
+                            SELECT company_id FROM companies ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                        )
+                    """, (self.max_entries,)).rowcount
+                    self.stats['evicted'] += max(0, evicted)
+
+    def remember(self, company_id, entry):
+        """메모리 LRU에 항목을 넣고 최근 사용 위치로 이동 (lock을 잡은 상태에서 호출)"""
+        self.memory[company_id] = entry
+        self.memory.move_to_end(company_id)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+            if not self.conn:
+                self.stats['evicted'] += 1
+
+    def log_stats(self):
+        logging.info(f"회사 정보 캐시 - 재사용: {self.stats['hit']}건, 신규: {self.stats['miss']}건, "
+                     f"만료: {self.stats['expired']}건, 삭제: {self.stats['evicted']}건")
+
+    def close(self):
+        with self.lock:
+            if self.conn:
+                self.conn.close()
+                self.conn = None
@@ -0,0 +1,75 @@
+import logging
+import re
+
+from http_client import get_client
+from html_parser import get_backend
+
+COMPANY_INFO_URL = "https://www.rndjob.or.kr/info/company_info.asp?jsno={company_id}"
+
+# 회사 정보 팝업을 여는 JavaScript 호출 (예: javascript:info_pop_open('12345'))
+INFO_POP_PATTERN = re.compile(r"info_pop_open\(\s*['\"]([^'\"]+)['\"]\s*\)")
+# 회사 정보 페이지 URL이 직접 들어있는 경우 (예: company_info.asp?jsno=12345)
+JSNO_PATTERN = re.compile(r"company_info\.asp\?(?:[^'\"\s]*&)?jsno=([^&'\"\s]+)")
+
+
+def get_company_info_url(company_id):
+    """회사 ID(jsno)로 회사 정보 페이지 URL 생성"""
+    return COMPANY_INFO_URL.format(company_id=company_id)
+
+
+def extract_company_id(doc, parser):
+    """상세 페이지에서 회사 정보 버튼(info_btn)이 여는 회사 ID(jsno) 추출"""
+    info_btn = parser.select_first(doc, '.info_btn')
+    if info_btn is not None:
+        # 버튼 자체, 버튼을 감싼 a 태그, 버튼 안의 a 태그 순서로 href/onclick 확인
+        candidates = [info_btn, parser.parent(info_btn, 'a')] + parser.select(info_btn, 'a')
+        for tag in candidates:
+            if tag is None:
+                continue
+            for attr in ('href', 'onclick'):
+                company_id = match_company_id(parser.attr(tag, attr, ''))
+                if company_id:
+                    return company_id
+    # 버튼 구조가 바뀐 경우 페이지 전체에서 검색
+    return match_company_id(parser.html(doc))
+
+
+def match_company_id(text):
+    if not text:
+        return None
+    match = INFO_POP_PATTERN.search(text) or JSNO_PATTERN.search(text)
+    return match.group(1) if match else None
+
+
+def parse_company_info(doc, parser):
+    """회사 정보 페이지의 dl.info_dl 항목을 {항목명: 값}으로 변환"""
+    company_info = {}
+    for dl in parser.select(doc, 'dl.info_dl'):
+        for dt, dd in zip(parser.select(dl, 'dt'), parser.select(dl, 'dd')):
+            company_info[parser.text(dt).strip()] = parser.text(dd).strip()
+    return company_info
+
+
+def add_prefix(company_info, prefix):
+    return {f"{prefix}{key}": value for key, value in company_info.items()}
+
+
+def fetch_company_info(company_id, prefix='상세_', client=None, headers=None, cache=None, rate_limiter=None,
+                       parser=None):
+    """회사 정보를 캐시에서 찾거나 HTTP로 가져와 파싱 (실패하면 None)"""
+    company_info = cache.get(company_id) if cache else None
+    if company_info is None:
+        client = client or get_client()
+        url = get_company_info_url(company_id)
+        if rate_limiter:
+            rate_limiter.wait(url)
+        html = client.get_text(url, headers=headers)
+        if not html:
+            logging.error(f"회사 ID {company_id}의 상세 정보 수집 실패")
+            return None
+        # 회사 정보 페이지 본문이 지난번과 같으면 저장된 파싱 결과 재사용
+        parser = parser or get_backend()
+        company_info = client.parse_cached(url, html, lambda text: parse_company_info(parser.parse(text), parser))
+        if cache and company_info:
+            cache.put(company_id, company_info)
+    return add_prefix(company_info, prefix)
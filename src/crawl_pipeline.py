@@ -0,0 +1,157 @@
+import logging
+import queue
+import threading
+import time
+
+from async_fetcher import AsyncFetcher
+
+# 단계 종료 신호
+STOP = object()
+
+
+class CrawlPipeline:
+    """상세 페이지 수집 파이프라인: discovery -> 상세 URL 큐 -> fetch 워커 -> parse 워커 -> writer
+
+    discovery(호출한 스레드)가 submit으로 작업을 넣으면 fetch_fn(item) -> parse_fn(item, fetched) ->
+    write_fn(item, result) 순서로 처리된다. 단계 사이의 큐는 크기가 제한되어 있어 뒤 단계가 밀리면
+    앞 단계가 put에서 대기(backpressure)하므로, 네트워크 I/O와 파싱, 디스크 기록이 번갈아 실행되지 않고
+    겹쳐서 진행된다. write_fn은 writer 스레드 하나에서만 호출되므로 CSV writer/spool/체크포인트를
+    별도 잠금 없이 사용할 수 있다.
+
+    fetch 단계는 asyncio 수집기(AsyncFetcher) 위에서 실행되어 최대 fetch_workers개의 요청을 동시에 보낸다.
+    rate_limiter를 넘기면 요청 전 속도 제한 대기를 이벤트 루프에서 처리하며(url_fn으로 항목의 URL 지정),
+    이 경우 fetch_fn은 직접 대기하지 않아야 한다.
+    """
+    def __init__(self, fetch_fn, parse_fn, write_fn, fetch_workers=4, parse_workers=1, queue_size=32,
+                 name='파이프라인', rate_limiter=None, url_fn=None):
+        self.fetch_fn = fetch_fn
+        self.parse_fn = parse_fn
+        self.write_fn = write_fn
+        self.fetch_workers = max(1, fetch_workers)
+        self.parse_workers = max(1, parse_workers)
+        self.name = name
+        self.rate_limiter = rate_limiter
+        self.url_fn = url_fn
+        self.fetcher = None
+        queue_size = max(1, queue_size)
+        self.url_queue = queue.Queue(maxsize=queue_size)
+        self.parse_queue = queue.Queue(maxsize=queue_size)
+        self.write_queue = queue.Queue(maxsize=queue_size)
+        self.threads = {'fetch': [], 'parse': [], 'write': []}
+        self.stats_lock = threading.Lock()
+        # 단계별 처리 건수, 작업 시간, 다음 큐가 가득 차서 기다린 시간(backpressure)
+        self.stats = {stage: {'count': 0, 'errors': 0, 'busy': 0.0, 'blocked': 0.0}
+                      for stage in ('discovery', 'fetch', 'parse', 'write')}
+        self.started_at = None
+
+    def start(self):
+        if self.started_at is not None:
+            return self
+        self.started_at = time.perf_counter()
+        # rate_limiter가 없으면 속도 제한 없이 동시 요청 수만 제한
+        self.fetcher = AsyncFetcher(self.fetch_item, concurrency=self.fetch_workers, rate_limit=0,
+                                    rate_limiter=self.rate_limiter, url_fn=self.url_fn)
+        # fetch 단계는 이벤트 루프 스레드 하나가 동시 요청을 관리
+        for stage, count, target in (('fetch', 1, self.run_fetch),
+                                     ('parse', self.parse_workers, self.run_parse),
+                                     ('write', 1, self.run_write)):
+            for i in range(count):
+                thread = threading.Thread(target=target, name=f"{stage}-{i}", daemon=True)
+                thread.start()
+                self.threads[stage].append(thread)
+        return self
+
+    def put(self, target, stage, entry):
+        """다음 단계 큐에 넣기 (가득 차 있으면 빈자리가 날 때까지 대기한 시간을 기록)"""
+        started = time.perf_counter()
+        target.put(entry)
+        self.record(stage, blocked=time.perf_counter() - started)
+
+    def record(self, stage, count=0, errors=0, busy=0.0, blocked=0.0):
+        with self.stats_lock:
+            stats = self.stats[stage]
+            stats['count'] += count
+            stats['errors'] += errors
+            stats['busy'] += busy
+            stats['blocked'] += blocked
+
+    def submit(self, item):
+        """상세 페이지 작업 추가 (fetch 단계가 밀려 있으면 대기)"""
+        self.put(self.url_queue, 'discovery', item)
+        self.record('discovery', count=1)
+
+    def emit(self, item, result):
+        """fetch/parse 없이 writer로 바로 전달 (캐시된 상세 정보, 페이지 완료 표시 등)"""
+        self.put(self.write_queue, 'discovery', (item, result))
+
+    def run_fetch(self):
+        self.fetcher.stream(self.url_queue.get, self.fetched, STOP)
+
+    def fetch_item(self, item):
+        """AsyncFetcher의 스레드 풀에서 fetch_fn(item) 실행 (예외는 여기서 처리하고 단계 통계 기록)"""
+        started = time.perf_counter()
+        try:
+            fetched = self.fetch_fn(item)
+            errors = 0
+        except Exception as e:
+            logging.error(f"{self.name} fetch 실패 ({item}): {e}")
+            fetched, errors = None, 1
+        self.record('fetch', count=1, errors=errors, busy=time.perf_counter() - started)
+        return fetched
+
+    def fetched(self, item, fetched):
+        self.put(self.parse_queue, 'fetch', (item, fetched))
+
+    def run_parse(self):
+        while True:
+            entry = self.parse_queue.get()
+            if entry is STOP:
+                break
+            item, fetched = entry
+            started = time.perf_counter()
+            try:
+                result = self.parse_fn(item, fetched)
+                errors = 0
+            except Exception as e:
+                logging.error(f"{self.name} 파싱 실패 ({item}): {e}")
+                result, errors = None, 1
+            self.record('parse', count=1, errors=errors, busy=time.perf_counter() - started)
+            self.put(self.write_queue, 'parse', (item, result))
+
+    def run_write(self):
+        while True:
+            entry = self.write_queue.get()
+            if entry is STOP:
+                break
+            started = time.perf_counter()
+            try:
+                self.write_fn(*entry)
+                errors = 0
+            except Exception as e:
+                logging.error(f"{self.name} 기록 실패 ({entry[0]}): {e}")
+                errors = 1
+            self.record('write', count=1, errors=errors, busy=time.perf_counter() - started)
+
+    def close(self):
+        """남은 작업을 모두 처리하고 단계 순서대로 종료"""
+        if self.started_at is None:
+            return
+        for stage, target in (('fetch', self.url_queue), ('parse', self.parse_queue), ('write', self.write_queue)):
+            for _ in self.threads[stage]:
+                target.put(STOP)
+            for thread in self.threads[stage]:
+                thread.join()
+            if stage == 'fetch':
+                self.fetcher.close()
+        self.log_stats()
+        self.started_at = None
+        self.threads = {'fetch': [], 'parse': [], 'write': []}
+
+    def log_stats(self):
+        elapsed = time.perf_counter() - self.started_at
+        parts = []
+        for stage, stats in self.stats.items():
+            workers = {'fetch': self.fetch_workers, 'parse': self.parse_workers}.get(stage, 1)
+            parts.append(f"{stage} {stats['count']}건(오류 {stats['errors']}, 작업 {stats['busy'] / workers:.1f}초/워커, "
+                         f"큐 대기 {stats['blocked']:.1f}초)")
+        logging.info(f"{self.name} 통계 ({elapsed:.1f}초) - " + ', '.join(parts))
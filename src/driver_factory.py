@@ -0,0 +1,251 @@
+import atexit
+import logging
+import os
+import shutil
+import threading
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from driver_utils import track_round_trips, enable_performance_log, enable_network_blocking
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# 환경 변수가 없으면 Docker 이미지의 경로, PATH 순서로 찾고 그래도 없으면 Selenium Manager에 맡김
+CHROME_BINARY_CANDIDATES = ('/usr/bin/chromium', 'chromium', 'chromium-browser', 'google-chrome', 'google-chrome-stable')
+CHROMEDRIVER_CANDIDATES = ('/usr/local/bin/chromedriver', 'chromedriver')
+
+
+def find_executable(env_name, candidates):
+    path = os.environ.get(env_name)
+    if path:
+        return path
+    for candidate in candidates:
+        found = candidate if os.path.isabs(candidate) and os.path.exists(candidate) else shutil.which(candidate)
+        if found:
+            return found
+    return None
+
+
+def build_chrome_options(page_load_strategy='eager'):
+    """모든 크롤러가 공유하는 헤드리스 Chrome 옵션"""
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--window-size=1920,1080')
+    options.page_load_strategy = page_load_strategy
+    binary = find_executable('CHROME_BINARY', CHROME_BINARY_CANDIDATES)
+    if binary:
+        options.binary_location = binary
+
+    # 성능 최적화를 위한 설정
+    prefs = {
+        'profile.default_content_setting_values': {
+            'images': 2,  # 이미지 로딩 비활성화
+            'plugins': 2,  # 플러그인 비활성화
+            'javascript': 1  # JavaScript는 필요하므로 활성화
+        }
+    }
+    options.add_experimental_option('prefs', prefs)
+    enable_performance_log(options)
+    return options
+
+
+def process_tree_rss(pid):
+    """chromedriver와 하위 브라우저 프로세스 전체의 RSS(바이트), 측정할 수 없으면 None"""
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            return sum(p.memory_info().rss for p in [process] + process.children(recursive=True))
+        except psutil.Error:
+            return None
+    if not os.path.isdir('/proc'):
+        return None
+    # psutil이 없으면 /proc에서 부모-자식 관계를 따라가며 VmRSS 합산 (Linux)
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, []))
+        try:
+            with open(f'/proc/{current}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+
+class DriverManager:
+    """프로세스 안의 모든 크롤러가 공유하는 WebDriver 관리자
+
+    반납된 브라우저는 쿠키를 지우고 대기 목록에 두었다가 다음 acquire에서 그대로 재사용하며,
+    페이지 이동 횟수가 max_navigations를 넘거나 메모리(RSS)가 max_rss_mb를 넘은 브라우저는
+    반납할 때 종료하고 필요할 때 새로 시작한다.
+    """
+    def __init__(self, max_navigations=200, max_rss_mb=1024):
+        self.max_navigations = max_navigations
+        self.max_rss_mb = max_rss_mb
+        self.idle = []
+        self.info = {}  # id(driver) -> {'started', 'startup', 'navigations', 'rss'}
+        self.lock = threading.Lock()
+        self.stats = {'started': 0, 'reused': 0, 'recycled': 0, 'startup_total': 0.0, 'peak_rss': 0}
+
+    def start_driver(self):
+        """새 브라우저 시작 (시작 시간 기록)"""
+        started = time.perf_counter()
+        chromedriver = find_executable('CHROMEDRIVER_PATH', CHROMEDRIVER_CANDIDATES)
+        service = Service(chromedriver) if chromedriver else Service()
+        driver = track_round_trips(webdriver.Chrome(service=service, options=build_chrome_options()))
+        startup = time.perf_counter() - started
+        with self.lock:
+            self.info[id(driver)] = {'started': time.time(), 'startup': startup, 'navigations': 0, 'rss': None}
+            self.stats['started'] += 1
+            self.stats['startup_total'] += startup
+        logging.info(f"WebDriver 시작: {startup:.2f}초")
+        return driver
+
+    def acquire(self, blocked_urls=None):
+        """대기 중인 브라우저를 재사용하거나 새로 시작 (blocked_urls는 매번 CDP로 다시 설정)"""
+        with self.lock:
+            driver = self.idle.pop() if self.idle else None
+            if driver is not None:
+                self.stats['reused'] += 1
+        if driver is not None:
+            try:
+                # 이전 크롤러가 설정한 차단 목록을 이번 크롤러의 목록으로 교체
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(blocked_urls or [])})
+            except Exception as e:
+                logging.warning(f"대기 중이던 WebDriver를 사용할 수 없어 새로 시작합니다: {e}")
+                self.quit(driver)
+                driver = None
+        if driver is None:
+            driver = self.start_driver()
+        enable_network_blocking(driver, blocked_urls or [])
+        return driver
+
+    def record_navigation(self, driver, count=1):
+        """페이지 이동 횟수 기록 (재활용 기준)"""
+        with self.lock:
+            info = self.info.get(id(driver))
+            if info:
+                info['navigations'] += count
+
+    def measure(self, driver):
+        """브라우저 프로세스 전체의 RSS(MB) 측정"""
+        service = getattr(driver, 'service', None)
+        process = getattr(service, 'process', None)
+        rss = process_tree_rss(process.pid) if process else None
+        if rss is None:
+            return None
+        rss_mb = rss / 1024 / 1024
+        with self.lock:
+            info = self.info.get(id(driver))
+            if info:
+                info['rss'] = rss_mb
+            self.stats['peak_rss'] = max(self.stats['peak_rss'], rss_mb)
+        return rss_mb
+
+    def needs_recycle(self, driver):
+        info = self.info.get(id(driver))
+        if info is None:
+            return False
+        if self.max_navigations and info['navigations'] >= self.max_navigations:
+            return f"페이지 이동 {info['navigations']}회"
+        rss_mb = self.measure(driver)
+        if self.max_rss_mb and rss_mb is not None and rss_mb >= self.max_rss_mb:
+            return f"메모리 {rss_mb:.0f}MB"
+        return False
+
+    def recycle_if_needed(self, driver, blocked_urls=None):
+        """기준을 넘은 브라우저는 종료하고 새 브라우저를 반환 (아니면 그대로 반환)"""
+        reason = self.needs_recycle(driver)
+        if not reason:
+            return driver
+        logging.info(f"WebDriver 재시작 ({reason})")
+        with self.lock:
+            self.stats['recycled'] += 1
+        self.quit(driver)
+        return self.acquire(blocked_urls)
+
+    def release(self, driver):
+        """사용이 끝난 브라우저를 반납 (기준을 넘었으면 종료, 아니면 쿠키를 지우고 재사용 대기)"""
+        if driver is None:
+            return
+        reason = self.needs_recycle(driver)
+        if reason:
+            logging.info(f"WebDriver 종료 ({reason})")
+            with self.lock:
+                self.stats['recycled'] += 1
+            self.quit(driver)
+            return
+        try:
+            driver.delete_all_cookies()
+            driver.get_log('performance')  # 다음 크롤러의 NetworkMeter가 이전 요청을 세지 않도록 비움
+        except Exception as e:
+            logging.warning(f"반납한 WebDriver를 사용할 수 없어 종료합니다: {e}")
+            self.quit(driver)
+            return
+        with self.lock:
+            self.idle.append(driver)
+
+    def quit(self, driver):
+        with self.lock:
+            self.info.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def log_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+            drivers = [dict(info) for info in self.info.values()]
+        avg_startup = stats['startup_total'] / stats['started'] if stats['started'] else 0.0
+        logging.info(f"WebDriver 통계 - 시작: {stats['started']}회(평균 {avg_startup:.2f}초), 재사용: {stats['reused']}회, "
+                     f"재시작: {stats['recycled']}회, 최대 메모리: {stats['peak_rss']:.0f}MB")
+        for i, info in enumerate(drivers, 1):
+            rss = f"{info['rss']:.0f}MB" if info['rss'] is not None else '측정 불가'
+            logging.info(f"  WebDriver {i}: 페이지 이동 {info['navigations']}회, 메모리 {rss}, 시작 {info['startup']:.2f}초")
+
+    def close_all(self):
+        """대기 중인 브라우저 모두 종료 (프로세스 종료 시 자동 호출)"""
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for driver in idle:
+            self.quit(driver)
+
+
+_shared_manager = None
+_shared_manager_lock = threading.Lock()
+
+
+def get_driver_manager(max_navigations=None, max_rss_mb=None):
+    """프로세스 안에서 모든 크롤러가 공유하는 DriverManager 반환 (인자를 주면 재활용 기준 변경)"""
+    global _shared_manager
+    with _shared_manager_lock:
+        if _shared_manager is None:
+            _shared_manager = DriverManager()
+            atexit.register(_shared_manager.close_all)
+        if max_navigations is not None:
+            _shared_manager.max_navigations = max_navigations
+        if max_rss_mb is not None:
+            _shared_manager.max_rss_mb = max_rss_mb
+        return _shared_manager
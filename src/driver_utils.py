@@ -0,0 +1,146 @@
+import json
+import logging
+import threading
+
+
+class RoundTripCounter:
+    """WebDriver 명령(chromedriver와의 HTTP 왕복) 횟수 집계"""
+    def __init__(self):
+        self.count = 0  # 마지막 reset 이후 왕복 횟수
+        self.total = 0  # 드라이버 생성 이후 전체 왕복 횟수
+        self.lock = threading.Lock()
+
+    def increment(self):
+        with self.lock:
+            self.count += 1
+            self.total += 1
+
+    def reset(self):
+        """현재까지의 왕복 횟수를 반환하고 0으로 초기화"""
+        with self.lock:
+            count = self.count
+            self.count = 0
+            return count
+
+
+def track_round_trips(driver):
+    """driver.execute를 감싸서 모든 WebDriver 명령 횟수를 driver.round_trips에 기록"""
+    counter = RoundTripCounter()
+    original_execute = driver.execute
+
+    def counting_execute(driver_command, params=None):
+        counter.increment()
+        return original_execute(driver_command, params)
+
+    # WebElement의 명령도 모두 부모 드라이버의 execute를 거치므로 인스턴스 속성만 바꾸면 된다
+    driver.execute = counting_execute
+    driver.round_trips = counter
+    return driver
+
+
+def get_round_trips(driver, reset=True):
+    """드라이버의 WebDriver 왕복 횟수 조회 (추적하지 않는 드라이버는 None)"""
+    counter = getattr(driver, 'round_trips', None)
+    if counter is None:
+        return None
+    return counter.reset() if reset else counter.count
+
+
+# 리소스 종류별 차단 URL 패턴 (Network.setBlockedURLs는 URL 와일드카드만 지원하므로 확장자로 구분)
+RESOURCE_TYPE_EXTENSIONS = {
+    'image': ('png', 'jpg', 'jpeg', 'gif', 'svg', 'ico', 'webp', 'bmp'),
+    'stylesheet': ('css',),
+    'font': ('woff', 'woff2', 'ttf', 'otf', 'eot'),
+    'media': ('mp4', 'webm', 'mp3', 'ogg', 'avi'),
+}
+DEFAULT_BLOCKED_TYPES = ('image', 'stylesheet', 'font', 'media')
+# 페이지 동작과 무관한 외부 분석/광고 스크립트
+DEFAULT_BLOCKED_URLS = (
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*doubleclick.net*',
+    '*facebook.net*',
+    '*wcs.naver.net*',
+    '*hotjar.com*',
+)
+
+
+def blocked_url_patterns(resource_types=DEFAULT_BLOCKED_TYPES, extra_patterns=DEFAULT_BLOCKED_URLS):
+    """차단할 리소스 종류와 추가 URL 패턴으로 Network.setBlockedURLs 패턴 목록 생성"""
+    patterns = []
+    for resource_type in resource_types or ():
+        for extension in RESOURCE_TYPE_EXTENSIONS[resource_type]:
+            # 쿼리 문자열이 붙은 URL(예: style.css?v=3)도 차단
+            patterns.extend([f"*.{extension}", f"*.{extension}?*"])
+    patterns.extend(extra_patterns or ())
+    return patterns
+
+
+def enable_performance_log(options):
+    """NetworkMeter가 읽을 수 있도록 Chrome performance 로그(Network 이벤트) 활성화"""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+
+def enable_network_blocking(driver, patterns):
+    """CDP로 패턴에 맞는 요청을 브라우저에서 바로 차단"""
+    if not patterns:
+        return
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
+
+
+class NetworkMeter:
+    """performance 로그의 Network 이벤트로 페이지별 요청 수, 전송 바이트, 차단된 요청 수 집계 (스레드 안전)
+
+    차단된 요청은 내려받지 않으므로 크기를 알 수 없다. 차단으로 줄어든 바이트는
+    차단을 끈 실행(--no-network-blocking)의 페이지당 전송량과 비교하여 확인한다.
+    """
+    def __init__(self):
+        self.pages = 0
+        self.requests = 0
+        self.bytes = 0
+        self.blocked = 0
+        self.blocked_by_type = {}
+        self.lock = threading.Lock()
+
+    def collect(self, driver, label=None):
+        """마지막 수집 이후의 로그를 읽어 한 페이지의 통계로 기록 (로그를 읽을 수 없으면 None)"""
+        try:
+            entries = driver.get_log('performance')
+        except Exception:
+            return None
+        page = {'requests': 0, 'bytes': 0, 'blocked': 0}
+        blocked_types = {}
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            method, params = message.get('method'), message.get('params', {})
+            if method == 'Network.requestWillBeSent':
+                page['requests'] += 1
+            elif method == 'Network.loadingFinished':
+                page['bytes'] += int(params.get('encodedDataLength') or 0)
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                page['blocked'] += 1
+                resource_type = params.get('type', 'Other')
+                blocked_types[resource_type] = blocked_types.get(resource_type, 0) + 1
+        with self.lock:
+            self.pages += 1
+            self.requests += page['requests']
+            self.bytes += page['bytes']
+            self.blocked += page['blocked']
+            for resource_type, count in blocked_types.items():
+                self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + count
+        logging.debug(f"네트워크 {label or ''} - 요청 {page['requests']}건, 전송 {page['bytes'] / 1024:.1f}KB, "
+                      f"차단 {page['blocked']}건")
+        return page
+
+    def log_summary(self):
+        with self.lock:
+            if not self.pages:
+                return
+            by_type = ', '.join(f"{resource_type} {count}" for resource_type, count in self.blocked_by_type.items())
+            logging.info(f"브라우저 네트워크 - {self.pages}페이지, 페이지당 요청 {self.requests / self.pages:.1f}건(차단 포함, "
+                         f"전송 {self.bytes / self.pages / 1024:.1f}KB), 페이지당 차단 {self.blocked / self.pages:.1f}건 "
+                         f"(전체 {self.blocked}건{': ' + by_type if by_type else ''})")
@@ -0,0 +1,167 @@
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# 회사명에서 제거할 법인 형태 표기 (NFKC 정규화 후이므로 ㈜, （주） 등은 (주)로 통일되어 있음)
+COMPANY_AFFIX_PATTERN = (r'\(\s*(?:주|유|재|사|株)\s*\)|주식회사|유한책임회사|유한회사|재단법인|사단법인|'
+                         r'\b(?:co\.?\s*,?\s*ltd|inc|corp|corporation)\b\.?')
+# 공백, 구두점, 기호 (한글/영문/숫자만 남김, pyarrow 문자열의 정규식은 \W가 ASCII 기준이라 문자 범위를 직접 지정)
+NON_WORD_PATTERN = r'[^0-9a-z가-힣ㄱ-ㅎㅏ-ㅣ]+'
+
+
+def normalize_company_names(names):
+    """회사명 Series 정규화: (주)/주식회사 등 법인 표기와 공백/구두점을 제거하고 소문자로 통일"""
+    text = names.astype('string').fillna('').str.normalize('NFKC').str.lower()
+    text = text.str.replace(COMPANY_AFFIX_PATTERN, '', regex=True)
+    return text.str.replace(NON_WORD_PATTERN, '', regex=True)
+
+
+def normalize_titles(titles):
+    """공고 제목 Series 정규화: 공백/구두점을 제거하고 소문자로 통일"""
+    text = titles.astype('string').fillna('').str.normalize('NFKC').str.lower()
+    return text.str.replace(NON_WORD_PATTERN, '', regex=True)
+
+
+def ngrams(text, n=2):
+    """문자 n-gram 집합 (n보다 짧은 문자열은 문자열 자체)"""
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHashLSH:
+    """문자 n-gram 집합의 MinHash 서명을 밴드로 나눠 버킷에 넣는 LSH 색인
+
+    서명의 한 밴드가 완전히 같은 레코드끼리만 후보 쌍이 되므로, 모든 쌍을 비교하지 않고
+    레코드 수에 거의 비례하는 시간에 비슷한 레코드를 찾는다. (자카드 유사도 s인 쌍이 후보가 될 확률 1-(1-s^rows)^bands)
+    """
+    def __init__(self, bands=20, rows=3, seed=1):
+        self.bands = bands
+        self.rows = rows
+        rng = np.random.default_rng(seed)
+        num_perm = bands * rows
+        # multiply-shift 해시 h(x) = ((a*x + b) mod 2^64) >> 32, a는 홀수 (uint64 곱셈의 오버플로가 곧 mod 2^64)
+        self.a = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64)[:, None] | np.uint64(1)
+        self.b = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64)[:, None]
+        self.buckets = {}
+
+    def signature(self, shingles):
+        values = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+        return ((self.a * values + self.b) >> np.uint64(32)).min(axis=1)
+
+    def add(self, key, shingles):
+        if not shingles:
+            return
+        signature = self.signature(shingles)
+        for band in range(self.bands):
+            band_key = (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            self.buckets.setdefault(band_key, []).append(key)
+
+    def candidate_buckets(self, max_bucket_size=None):
+        """두 개 이상의 레코드가 들어 있는 버킷 목록과 max_bucket_size보다 커서 따로 분리한 버킷 목록"""
+        buckets, oversized = [], []
+        for members in self.buckets.values():
+            if len(members) < 2:
+                continue
+            if max_bucket_size and len(members) > max_bucket_size:
+                oversized.append(members)
+            else:
+                buckets.append(members)
+        return buckets, oversized
+
+
+class UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, x, y):
+        root_x, root_y = self.find(x), self.find(y)
+        if root_x != root_y:
+            self.parent[max(root_x, root_y)] = min(root_x, root_y)
+
+
+def find_duplicate_pairs(df, title_threshold=0.5, company_threshold=0.8, max_bucket_size=50):
+    """소스가 다른 공고 중 회사명과 제목이 비슷한 행 번호 쌍 목록
+
+    후보 쌍은 회사명+제목 bigram의 MinHash LSH 버킷에서만 만들고, 정규화한 회사명이 같거나 bigram 유사도가
+    company_threshold 이상이면서 제목 bigram 유사도가 title_threshold 이상인 쌍을 중복으로 본다.
+    흔한 제목 때문에 max_bucket_size보다 커진 버킷은 그 안에서 정규화한 회사명이 같은 행끼리만 비교한다.
+    """
+    companies = normalize_company_names(df['company_name']).tolist()
+    titles = normalize_titles(df['post_name']).tolist()
+    sources = df['source_type'].astype('string').fillna('').tolist()
+    company_grams = [ngrams(company) for company in companies]
+    title_grams = [ngrams(title) for title in titles]
+
+    lsh = MinHashLSH()
+    for i, company in enumerate(companies):
+        if company:
+            lsh.add(i, company_grams[i] | {f"#{gram}" for gram in title_grams[i]})
+    buckets, oversized = lsh.candidate_buckets(max_bucket_size)
+    for members in oversized:
+        by_company = {}
+        for i in members:
+            by_company.setdefault(companies[i], []).append(i)
+        buckets.extend(group for group in by_company.values() if len(group) > 1)
+
+    pairs, checked = set(), set()
+    for members in buckets:
+        by_source = {}
+        for i in members:
+            by_source.setdefault(sources[i], []).append(i)
+        if len(by_source) < 2:
+            continue
+        groups = list(by_source.values())
+        for g, group in enumerate(groups):
+            for other in groups[g + 1:]:
+                for i in group:
+                    for j in other:
+                        pair = (min(i, j), max(i, j))
+                        if pair in checked:
+                            continue
+                        checked.add(pair)
+                        same_company = (companies[i] == companies[j]
+                                        or jaccard(company_grams[i], company_grams[j]) >= company_threshold)
+                        if same_company and jaccard(title_grams[i], title_grams[j]) >= title_threshold:
+                            pairs.add(pair)
+    print(f"[INFO] 중복 탐지: LSH 버킷 {len(buckets)}개(큰 버킷 {len(oversized)}개는 회사명별로 분할), "
+          f"후보 쌍 {len(checked)}개 비교, 중복 쌍 {len(pairs)}개")
+    return sorted(pairs)
+
+
+def assign_cluster_ids(df, title_threshold=0.5, key_column='source_info'):
+    """같은 공고로 판단된 행들에 공통 cluster_id를 부여한 Series 반환
+
+    cluster_id는 클러스터에 속한 행 중 가장 작은 key_column 값이며, 중복이 없는 행은 자기 자신의 값을 가진다.
+    """
+    if df.empty:
+        return pd.Series([], index=df.index, dtype=object)
+    keys = df[key_column].astype('string').fillna('').tolist()
+    clusters = UnionFind(len(df))
+    for i, j in find_duplicate_pairs(df, title_threshold):
+        clusters.union(i, j)
+
+    members = {}
+    for i in range(len(df)):
+        members.setdefault(clusters.find(i), []).append(i)
+    cluster_ids = [None] * len(df)
+    for rows in members.values():
+        cluster_id = min(keys[i] for i in rows)
+        for i in rows:
+            cluster_ids[i] = cluster_id
+    duplicated = sum(len(rows) for rows in members.values() if len(rows) > 1)
+    print(f"[INFO] 중복 클러스터 {sum(len(rows) > 1 for rows in members.values())}개 ({duplicated} rows)")
+    return pd.Series(cluster_ids, index=df.index, dtype=object)
@@ -0,0 +1,205 @@
+import glob
+import gzip
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 인덱스 레코드: URL 해시, 페이지 종류, 실행 ID(크롤링 시작 시각), 수집 시각, 세그먼트 번호, 오프셋, 길이
+INDEX_RECORD = struct.Struct('<20s8sddIQI')
+INDEX_FILENAME = 'index.bin'
+CODEC_EXTENSIONS = {'gzip': 'gz', 'zstd': 'zst'}
+
+ArchiveEntry = namedtuple('ArchiveEntry', ['url_key', 'kind', 'run_id', 'crawled_at', 'segment', 'offset', 'length'])
+
+
+def url_key(url):
+    """인덱스에 저장하는 고정 길이 URL 키"""
+    return hashlib.sha1(url.encode('utf-8')).digest()
+
+
+def default_codec():
+    return 'zstd' if zstandard else 'gzip'
+
+
+def compress(payload, codec):
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=3).compress(payload)
+    return gzip.compress(payload, compresslevel=6)
+
+
+def decompress(data, codec):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstd 세그먼트를 읽으려면 zstandard 패키지가 필요합니다.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class HtmlArchive:
+    """수집한 원본 HTML을 압축 세그먼트에 추가 기록하는 append-only 저장소
+
+    레코드마다 독립적으로 압축(gzip 멤버 또는 zstd 프레임)하므로 인덱스의 오프셋/길이만으로
+    임의 접근할 수 있다. 인덱스는 고정 길이 레코드 파일이라 ArchiveReader가 mmap으로 읽는다.
+    """
+    def __init__(self, archive_dir='crawled_data/html_archive', run_id=None, codec=None,
+                 segment_size=256 * 1024 * 1024):
+        self.archive_dir = archive_dir
+        self.run_id = run_id or time.time()
+        self.codec = codec or default_codec()
+        if self.codec == 'zstd' and zstandard is None:
+            logging.warning("zstandard 패키지가 없어 gzip으로 압축합니다.")
+            self.codec = 'gzip'
+        self.segment_size = segment_size
+        self.lock = threading.Lock()
+        self.count = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        os.makedirs(archive_dir, exist_ok=True)
+
+        # 마지막 인덱스 레코드가 불완전하면 잘라내고 이어서 기록
+        index_path = os.path.join(archive_dir, INDEX_FILENAME)
+        if os.path.exists(index_path):
+            size = os.path.getsize(index_path)
+            if size % INDEX_RECORD.size:
+                with open(index_path, 'r+b') as f:
+                    f.truncate(size - size % INDEX_RECORD.size)
+        self.index_file = open(index_path, 'ab')
+        self.segment_no = max(segment_numbers(archive_dir), default=0)
+        self.segment_file = None
+        self.open_segment()
+
+    def open_segment(self):
+        """현재 세그먼트가 가득 찼거나 압축 방식이 다르면 새 세그먼트 열기"""
+        path = segment_path(self.archive_dir, self.segment_no, self.codec)
+        if (not self.segment_no or find_segment(self.archive_dir, self.segment_no) != path
+                or os.path.getsize(path) >= self.segment_size):
+            self.segment_no += 1
+            path = segment_path(self.archive_dir, self.segment_no, self.codec)
+        if self.segment_file:
+            self.segment_file.close()
+        self.segment_file = open(path, 'ab')
+
+    def add(self, url, content, kind='page', meta=None):
+        """페이지 하나를 압축하여 기록 (content는 str 또는 bytes)"""
+        is_bytes = isinstance(content, bytes)
+        header = dict(meta or {}, url=url, kind=kind, run_id=self.run_id, crawled_at=time.time(),
+                      type='bytes' if is_bytes else 'text')
+        body = content if is_bytes else content.encode('utf-8')
+        payload = json.dumps(header, ensure_ascii=False).encode('utf-8') + b'\n' + body
+        data = compress(payload, self.codec)
+        with self.lock:
+            if self.segment_file.tell() >= self.segment_size:
+                self.open_segment()
+            offset = self.segment_file.tell()
+            self.segment_file.write(data)
+            self.segment_file.flush()
+            # 세그먼트를 먼저 기록하여 인덱스가 없는 데이터를 가리키지 않도록 함
+            self.index_file.write(INDEX_RECORD.pack(url_key(url), kind.encode('ascii')[:8], self.run_id,
+                                                    header['crawled_at'], self.segment_no, offset, len(data)))
+            self.index_file.flush()
+            self.count += 1
+            self.bytes_in += len(payload)
+            self.bytes_out += len(data)
+
+    def log_stats(self):
+        ratio = self.bytes_out / self.bytes_in * 100 if self.bytes_in else 0.0
+        logging.info(f"HTML 아카이브 - 저장: {self.count}건, 원본 {self.bytes_in / 1024:.1f}KB -> "
+                     f"압축 {self.bytes_out / 1024:.1f}KB ({ratio:.1f}%, {self.codec})")
+
+    def close(self):
+        with self.lock:
+            for f in (self.segment_file, self.index_file):
+                if f and not f.closed:
+                    f.close()
+
+
+def segment_path(archive_dir, segment_no, codec):
+    return os.path.join(archive_dir, f"segment-{segment_no:05d}.{CODEC_EXTENSIONS[codec]}")
+
+
+def find_segment(archive_dir, segment_no):
+    """세그먼트 번호에 해당하는 파일 경로 (압축 방식은 확장자로 구분)"""
+    for codec in CODEC_EXTENSIONS:
+        path = segment_path(archive_dir, segment_no, codec)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def segment_numbers(archive_dir):
+    for path in glob.glob(os.path.join(archive_dir, 'segment-*.*')):
+        name = os.path.basename(path).split('.')[0]
+        try:
+            yield int(name.split('-')[1])
+        except (IndexError, ValueError):
+            continue
+
+
+class ArchiveReader:
+    """HtmlArchive의 인덱스를 mmap으로 읽고 레코드를 임의 접근으로 복원"""
+    def __init__(self, archive_dir='crawled_data/html_archive'):
+        self.archive_dir = archive_dir
+        self.segment_files = {}
+        self.index = None
+        self.count = 0
+        index_path = os.path.join(archive_dir, INDEX_FILENAME)
+        if os.path.exists(index_path) and os.path.getsize(index_path) >= INDEX_RECORD.size:
+            with open(index_path, 'rb') as f:
+                self.index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.count = len(self.index) // INDEX_RECORD.size
+
+    def entries(self):
+        """인덱스 레코드를 기록 순서대로 읽기"""
+        for i in range(self.count):
+            key, kind, run_id, crawled_at, segment, offset, length = INDEX_RECORD.unpack_from(
+                self.index, i * INDEX_RECORD.size)
+            yield ArchiveEntry(key, kind.rstrip(b'\x00').decode('ascii'), run_id, crawled_at, segment, offset, length)
+
+    def runs(self):
+        """아카이브에 기록된 실행 ID 목록 (오래된 순)"""
+        return sorted({entry.run_id for entry in self.entries()})
+
+    def latest(self, run_id=None):
+        """URL별로 run_id 이전(포함)에 수집한 마지막 레코드"""
+        latest = {}
+        for entry in self.entries():
+            if run_id is not None and entry.run_id > run_id:
+                continue
+            current = latest.get(entry.url_key)
+            if current is None or entry.crawled_at >= current.crawled_at:
+                latest[entry.url_key] = entry
+        return latest
+
+    def read(self, entry):
+        """레코드의 (header, content) 반환"""
+        f = self.segment_files.get(entry.segment)
+        if f is None:
+            path = find_segment(self.archive_dir, entry.segment)
+            if path is None:
+                raise FileNotFoundError(f"세그먼트 {entry.segment}를 찾을 수 없습니다.")
+            f = open(path, 'rb')
+            self.segment_files[entry.segment] = f
+        f.seek(entry.offset)
+        codec = 'zstd' if f.name.endswith('.zst') else 'gzip'
+        header_line, body = decompress(f.read(entry.length), codec).split(b'\n', 1)
+        header = json.loads(header_line)
+        return header, body if header.get('type') == 'bytes' else body.decode('utf-8')
+
+    def close(self):
+        for f in self.segment_files.values():
+            f.close()
+        self.segment_files = {}
+        if self.index is not None:
+            self.index.close()
+            self.index = None
@@ -0,0 +1,243 @@
+import logging
+import re
+
+from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+DEFAULT_BACKEND = 'lxml'
+
+# BeautifulSoup(html.parser)의 .text/.stripped_strings에서 제외되는 태그
+NON_TEXT_TAGS = ('script', 'style', 'template')
+
+# lxml/lexbor는 본문의 \r\n을 \n으로 바꾸므로 파싱 전에 \r을 임시 문자로 바꿔두고 텍스트에서 되돌림
+CR_PLACEHOLDER = '\ue00d'
+TAG_PATTERN = re.compile(r'(<[^>]*>)')
+
+# 지원하는 선택자: tag, .class, tag.class (앞에 '>'를 붙이면 직계 자식만)
+SELECTOR_PATTERN = re.compile(r'^(>\s*)?([A-Za-z][A-Za-z0-9]*|\*)?(?:\.([\w-]+))?$')
+
+
+def protect_cr(html):
+    """태그 밖의 텍스트에 있는 \\r을 임시 문자로 치환"""
+    if not isinstance(html, str) or '\r' not in html:
+        return html
+    parts = TAG_PATTERN.split(html)
+    parts[::2] = [part.replace('\r', CR_PLACEHOLDER) for part in parts[::2]]
+    return ''.join(parts)
+
+
+def restore_cr(text):
+    return text.replace(CR_PLACEHOLDER, '\r')
+
+
+def parse_selector(selector):
+    """선택자를 (직계 자식 여부, 태그, 클래스)로 분해"""
+    match = SELECTOR_PATTERN.match(selector.strip())
+    if not match or not (match.group(2) or match.group(3)):
+        raise ValueError(f"지원하지 않는 선택자입니다: {selector}")
+    tag = match.group(2) if match.group(2) != '*' else None
+    return bool(match.group(1)), tag, match.group(3)
+
+
+class ParserBackend:
+    """HTML 파서 백엔드 공통 인터페이스
+
+    추출 코드는 BeautifulSoup의 find/find_all/.text와 같은 의미의 select_first/select/text만 사용하고,
+    선택자는 백엔드마다 처음 사용할 때 한 번만 컴파일하여 재사용한다.
+    """
+    name = None
+
+    def __init__(self):
+        self.compiled = {}
+
+    def query(self, selector):
+        compiled = self.compiled.get(selector)
+        if compiled is None:
+            compiled = self.compile(*parse_selector(selector))
+            self.compiled[selector] = compiled
+        return compiled
+
+    def strings(self, node):
+        """BeautifulSoup의 stripped_strings와 같이 공백을 제거한 비어있지 않은 텍스트 목록"""
+        return [text.strip() for text in self.text_nodes(node) if text.strip()]
+
+    def text(self, node):
+        """BeautifulSoup의 .text와 같은 하위 텍스트 전체"""
+        return ''.join(self.text_nodes(node))
+
+
+class LxmlBackend(ParserBackend):
+    name = 'lxml'
+    TEXT_XPATH = etree.XPath('descendant-or-self::text()[not(ancestor::*[' +
+                             ' or '.join(f'self::{tag}' for tag in NON_TEXT_TAGS) + '])]',
+                             smart_strings=False)
+
+    def parse(self, html):
+        html = protect_cr(html)
+        try:
+            return lxml_html.document_fromstring(html)
+        except ValueError:
+            # XML 선언에 인코딩이 있는 문자열은 bytes로만 파싱 가능
+            return lxml_html.document_fromstring(html.encode('utf-8'))
+        except etree.ParserError:
+            return lxml_html.document_fromstring('<html></html>')
+
+    def compile(self, child_only, tag, class_name):
+        step = tag or '*'
+        if class_name:
+            step += f"[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+        return etree.XPath(('./' if child_only else './/') + step)
+
+    def select(self, node, selector):
+        return self.query(selector)(node)
+
+    def select_first(self, node, selector):
+        found = self.query(selector)(node)
+        return found[0] if found else None
+
+    def text_nodes(self, node):
+        return [restore_cr(text) for text in self.TEXT_XPATH(node)]
+
+    def attr(self, node, name, default=None):
+        return node.get(name, default)
+
+    def classes(self, node):
+        return (node.get('class') or '').split()
+
+    def next_sibling(self, node, tag):
+        return next(node.itersiblings(tag), None)
+
+    def parent(self, node, tag):
+        return next(node.iterancestors(tag), None)
+
+    def html(self, node):
+        return restore_cr(etree.tostring(node, encoding='unicode', method='html'))
+
+
+class SelectolaxBackend(ParserBackend):
+    name = 'selectolax'
+
+    def parse(self, html):
+        return LexborHTMLParser(protect_cr(html)).root
+
+    def compile(self, child_only, tag, class_name):
+        css = (tag or '') + (f'.{class_name}' if class_name else '')
+        return child_only, tag, class_name, css
+
+    def matches(self, node, tag, class_name):
+        return (tag is None or node.tag == tag) and (class_name is None or class_name in self.classes(node))
+
+    def select(self, node, selector):
+        child_only, tag, class_name, css = self.query(selector)
+        if child_only:
+            return [child for child in node.iter() if self.matches(child, tag, class_name)]
+        # lexbor는 기준 요소 자신도 결과에 포함하므로 제외
+        return [found for found in node.css(css) if found != node]
+
+    def select_first(self, node, selector):
+        found = self.select(node, selector)
+        return found[0] if found else None
+
+    def text_nodes(self, node):
+        texts = []
+        for child in node.iter(include_text=True):
+            if child.tag == '-text':
+                texts.append(restore_cr(child.text_content or ''))
+            elif child.tag not in NON_TEXT_TAGS and not child.tag.startswith('-'):
+                texts.extend(self.text_nodes(child))
+        return texts
+
+    def attr(self, node, name, default=None):
+        value = node.attributes.get(name, default)
+        return default if value is None else value
+
+    def classes(self, node):
+        return (node.attributes.get('class') or '').split()
+
+    def next_sibling(self, node, tag):
+        sibling = node.next
+        while sibling is not None and sibling.tag != tag:
+            sibling = sibling.next
+        return sibling
+
+    def parent(self, node, tag):
+        ancestor = node.parent
+        while ancestor is not None and ancestor.tag != tag:
+            ancestor = ancestor.parent
+        return ancestor
+
+    def html(self, node):
+        return restore_cr(node.html or '')
+
+
+class SoupBackend(ParserBackend):
+    """기존 BeautifulSoup(html.parser) 방식 (가장 느리지만 다른 백엔드 결과 비교의 기준)"""
+    name = 'bs4'
+
+    def parse(self, html):
+        return BeautifulSoup(html, 'html.parser')
+
+    def compile(self, child_only, tag, class_name):
+        # class_=None은 class 속성이 없는 태그만 찾으므로 클래스가 없는 선택자는 인자를 넘기지 않음
+        attrs = {'class_': class_name} if class_name else {}
+        return tag, dict(attrs, recursive=not child_only)
+
+    def select(self, node, selector):
+        tag, kwargs = self.query(selector)
+        return node.find_all(tag, **kwargs)
+
+    def select_first(self, node, selector):
+        tag, kwargs = self.query(selector)
+        return node.find(tag, **kwargs)
+
+    def text_nodes(self, node):
+        return list(node.strings)
+
+    def strings(self, node):
+        return list(node.stripped_strings)
+
+    def text(self, node):
+        return node.text
+
+    def attr(self, node, name, default=None):
+        return node.get(name, default)
+
+    def classes(self, node):
+        return node.get('class') or []
+
+    def next_sibling(self, node, tag):
+        return node.find_next_sibling(tag)
+
+    def parent(self, node, tag):
+        return node.find_parent(tag)
+
+    def html(self, node):
+        return str(node)
+
+
+BACKENDS = {
+    'lxml': LxmlBackend,
+    'selectolax': SelectolaxBackend,
+    'bs4': SoupBackend,
+}
+
+
+def available_backends():
+    return [name for name in BACKENDS if name != 'selectolax' or LexborHTMLParser is not None]
+
+
+def get_backend(name=None):
+    """이름에 해당하는 파서 백엔드 생성 (selectolax가 설치되어 있지 않으면 lxml 사용)"""
+    name = name or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 파서 백엔드입니다: {name} (사용 가능: {available_backends()})")
+    if name == 'selectolax' and LexborHTMLParser is None:
+        logging.warning("selectolax가 설치되어 있지 않아 lxml 파서를 사용합니다.")
+        name = 'lxml'
+    return BACKENDS[name]()
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+
+
+def body_hash(text):
+    """응답 본문의 내용 해시"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class HttpCache:
+    """URL별 응답 본문과 검증자(ETag/Last-Modified), 파싱 결과를 저장하는 디스크 HTTP 캐시
+
+    서버가 검증자를 주면 조건부 요청(If-None-Match/If-Modified-Since)으로 304 응답을 받아
+    저장된 본문을 재사용하고, 검증자가 없으면 본문 해시가 같을 때 저장된 파싱 결과를 재사용한다.
+    """
+    def __init__(self, db_path='crawled_data/http_cache.sqlite'):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body_hash TEXT,
+                    body BLOB,
+                    parsed_hash TEXT,
+                    parsed_json TEXT,
+                    fetched_at TEXT
+                )
+            """)
+        # not_modified: 304 응답, unchanged: 200 응답이지만 본문이 같음, changed: 새 URL 또는 본문 변경
+        self.stats = {'not_modified': 0, 'unchanged': 0, 'changed': 0, 'parse_hit': 0, 'parse_miss': 0}
+
+    def get(self, url):
+        """저장된 응답 조회 (없으면 None)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, body_hash, body FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            'etag': row[0],
+            'last_modified': row[1],
+            'body_hash': row[2],
+            'body': zlib.decompress(row[3]).decode('utf-8') if row[3] else None,
+        }
+
+    @staticmethod
+    def validator_headers(entry):
+        """저장된 검증자로 조건부 요청 헤더 생성"""
+        headers = {}
+        if entry and entry.get('body') is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def record_not_modified(self):
+        with self.lock:
+            self.stats['not_modified'] += 1
+
+    def store(self, url, text, etag=None, last_modified=None):
+        """200 응답의 본문과 검증자 저장"""
+        new_hash = body_hash(text)
+        now = datetime.now().isoformat(timespec='seconds')
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT body_hash FROM responses WHERE url = ?", (url,)).fetchone()
+            self.stats['unchanged' if row and row[0] == new_hash else 'changed'] += 1
+            self.conn.execute("""
+                INSERT INTO responses (url, etag, last_modified, body_hash, body, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    body_hash = excluded.body_hash,
+                    body = excluded.body,
+                    fetched_at = excluded.fetched_at
+            """, (url, etag, last_modified, new_hash, zlib.compress(text.encode('utf-8')), now))
+
+    def get_parsed(self, url, text):
+        """본문 해시가 마지막으로 파싱한 본문과 같으면 저장된 파싱 결과 반환 (아니면 None)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT parsed_hash, parsed_json FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row and row[1] is not None and row[0] == body_hash(text):
+                self.stats['parse_hit'] += 1
+                return json.loads(row[1])
+            self.stats['parse_miss'] += 1
+            return None
+
+    def put_parsed(self, url, text, parsed):
+        """본문 해시와 함께 파싱 결과 저장"""
+        with self.lock, self.conn:
+            self.conn.execute("""
+                INSERT INTO responses (url, parsed_hash, parsed_json) VALUES (?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    parsed_hash = excluded.parsed_hash,
+                    parsed_json = excluded.parsed_json
+            """, (url, body_hash(text), json.dumps(parsed, ensure_ascii=False, default=str)))
+
+    def log_stats(self):
+        stats = self.stats
+        logging.info(f"HTTP 캐시 - 304 응답: {stats['not_modified']}건, 본문 동일: {stats['unchanged']}건, "
+                     f"신규/변경: {stats['changed']}건, 파싱 재사용: {stats['parse_hit']}건, "
+                     f"파싱 수행: {stats['parse_miss']}건")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
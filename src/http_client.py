@@ -0,0 +1,230 @@
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from resilience import RetryPolicy, classify_error, retry_after_seconds, get_breaker, log_breakers
+
+try:
+    import brotli  # noqa: F401  (설치되어 있으면 urllib3가 br 응답을 해제)
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# 사이트별 응답 인코딩 (Content-Type에 charset이 없을 때 사용, 본문 기반 인코딩 추측을 하지 않음)
+SITE_ENCODINGS = {
+    'www.rndjob.or.kr': 'utf-8',
+    'work.mma.go.kr': 'utf-8',
+}
+
+class RequestStats:
+    """요청별 소요 시간/응답 크기 집계 (스레드 안전)"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.retries_by_kind = {}
+        self.bytes = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.by_host = {}
+
+    def record(self, url, elapsed, size=0, error=False):
+        host = urlparse(url).netloc
+        with self.lock:
+            self.count += 1
+            self.errors += int(error)
+            self.bytes += size
+            self.total_time += elapsed
+            self.max_time = max(self.max_time, elapsed)
+            host_stats = self.by_host.setdefault(host, {'count': 0, 'time': 0.0})
+            host_stats['count'] += 1
+            host_stats['time'] += elapsed
+
+    def record_retry(self, kind):
+        with self.lock:
+            self.retries += 1
+            self.retries_by_kind[kind] = self.retries_by_kind.get(kind, 0) + 1
+
+    def summary(self):
+        with self.lock:
+            avg_time = self.total_time / self.count if self.count else 0.0
+            return {
+                'requests': self.count,
+                'errors': self.errors,
+                'retries': self.retries,
+                'retries_by_kind': dict(self.retries_by_kind),
+                'bytes': self.bytes,
+                'avg_ms': round(avg_time * 1000, 1),
+                'max_ms': round(self.max_time * 1000, 1),
+                'by_host': {host: {'count': s['count'], 'avg_ms': round(s['time'] / s['count'] * 1000, 1)}
+                            for host, s in self.by_host.items()},
+            }
+
+
+class HttpClient:
+    """keep-alive 연결 풀, 압축, 타임아웃, 재시도, 호스트별 circuit breaker를 갖춘 공용 HTTP 클라이언트"""
+    def __init__(self, headers=None, timeout=(5, 20), max_retries=3, backoff=1.0, pool_size=10,
+                 site_encodings=None, cache=None, timeout_retries=None, circuit_breaker=True, wait_stats=None):
+        self.timeout = timeout
+        # 타임아웃은 4xx/5xx와 별도로 재시도 횟수를 제한 (기본 1회)
+        self.policy = RetryPolicy(max_retries=max_retries, backoff=backoff,
+                                  timeout_retries=min(max_retries, 1) if timeout_retries is None else timeout_retries)
+        self.circuit_breaker = circuit_breaker
+        self.wait_stats = wait_stats  # 재시도 지연/circuit 대기 시간을 기록할 WaitStats (None이면 기록하지 않음)
+        self.site_encodings = dict(SITE_ENCODINGS, **(site_encodings or {}))
+        self.stats = RequestStats()
+        self.cache = cache  # 조건부 요청/파싱 결과 재사용에 사용하는 HttpCache (None이면 사용하지 않음)
+        self.archive = None  # get_text로 받은 원본 HTML을 기록하는 HtmlArchive (None이면 기록하지 않음)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': DEFAULT_USER_AGENT,
+            'Accept-Encoding': ACCEPT_ENCODING,
+            'Connection': 'keep-alive',
+        })
+        if headers:
+            self.session.headers.update(headers)
+
+    def request(self, method, url, **kwargs):
+        """재시도를 포함한 요청 (최종 실패 시 마지막 예외를 그대로 발생)
+
+        타임아웃/연결 실패/429/5xx는 종류별 횟수만큼 지수 백오프로 재시도하고 다른 4xx는 바로 실패한다.
+        호스트의 circuit이 열려 있으면 닫힐 때까지 기다리며, 너무 오래 열려 있으면 CircuitOpenError를 발생시킨다.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        breaker = get_breaker(url) if self.circuit_breaker else None
+        failures = {}
+        attempt = 0
+        while True:
+            if breaker:
+                breaker.before_request(self.wait_stats)
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+                elapsed = time.perf_counter() - started
+                self.stats.record(url, elapsed, len(response.content), error=response.status_code >= 400)
+                response.raise_for_status()
+                if breaker:
+                    breaker.record_success()
+                self.apply_site_encoding(response)
+                return response
+            except requests.RequestException as e:
+                if not isinstance(e, requests.HTTPError):
+                    self.stats.record(url, time.perf_counter() - started, error=True)
+                kind = classify_error(e)
+                if breaker:
+                    breaker.record(kind)
+                failures[kind] = failures.get(kind, 0) + 1
+                if not self.policy.should_retry(kind, failures[kind]):
+                    raise
+                delay = self.policy.delay(attempt, retry_after_seconds(e.response) if kind == 'server' else None)
+                attempt += 1
+                self.stats.record_retry(kind)
+                logging.warning(f"요청 실패({kind}), {delay:.1f}초 후 재시도 ({failures[kind]}회째) - URL: {url}: {e}")
+                if self.wait_stats:
+                    with self.wait_stats.waiting('retry'):
+                        time.sleep(delay)
+                else:
+                    time.sleep(delay)
+            except BaseException:
+                # 결과를 기록하지 못한 채 끝난 시험 요청이 circuit을 half_open 상태로 묶어 두지 않도록 해제
+                if breaker:
+                    breaker.release_probe()
+                raise
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def apply_site_encoding(self, response):
+        """Content-Type에 charset이 없으면 사이트별 인코딩을 지정 (charset 추측 방지)"""
+        content_type = response.headers.get('Content-Type', '')
+        if 'charset=' not in content_type.lower():
+            response.encoding = self.site_encodings.get(urlparse(response.url).netloc, 'utf-8')
+
+    def use_cache(self, cache):
+        """get_text/parse_cached에서 사용할 HttpCache 지정"""
+        self.cache = cache
+
+    def use_archive(self, archive):
+        """get_text로 받은 페이지를 기록할 HtmlArchive 지정"""
+        self.archive = archive
+
+    def get_text(self, url, raise_errors=False, **kwargs):
+        """페이지 본문 문자열 반환 (실패하면 None, raise_errors이면 예외를 그대로 발생)"""
+        try:
+            if self.cache:
+                text = self.get_text_conditional(url, **kwargs)
+            else:
+                text = self.get(url, **kwargs).text
+            if self.archive and text:
+                self.archive.add(url, text)
+            return text
+        except Exception as e:
+            logging.error(f"페이지 접근 중 오류 발생: {e}")
+            if raise_errors:
+                raise
+            return None
+
+    def get_text_conditional(self, url, headers=None, **kwargs):
+        """저장된 검증자로 조건부 요청을 보내고 304 응답이면 캐시된 본문 반환"""
+        entry = self.cache.get(url)
+        headers = dict(headers or {}, **self.cache.validator_headers(entry))
+        response = self.get(url, headers=headers, **kwargs)
+        if response.status_code == 304 and entry and entry['body'] is not None:
+            self.cache.record_not_modified()
+            return entry['body']
+        text = response.text
+        if response.status_code == 200:
+            self.cache.store(url, text, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return text
+
+    def parse_cached(self, url, text, parse_fn):
+        """본문이 마지막으로 파싱한 본문과 같으면 저장된 결과를 반환하고, 아니면 parse_fn(text)로 파싱 후 저장"""
+        if not self.cache:
+            return parse_fn(text)
+        parsed = self.cache.get_parsed(url, text)
+        if parsed is None:
+            parsed = parse_fn(text)
+            self.cache.put_parsed(url, text, parsed)
+        return parsed
+
+    def log_stats(self):
+        summary = self.stats.summary()
+        logging.info(f"HTTP 요청 통계 - 요청: {summary['requests']}건, 오류: {summary['errors']}건, "
+                     f"재시도: {summary['retries']}건{format_kinds(summary['retries_by_kind'])}, 평균: {summary['avg_ms']}ms, 최대: {summary['max_ms']}ms, "
+                     f"수신: {summary['bytes'] / 1024:.1f}KB")
+        for host, host_stats in summary['by_host'].items():
+            logging.info(f"  {host}: {host_stats['count']}건, 평균 {host_stats['avg_ms']}ms")
+        if self.circuit_breaker:
+            log_breakers()
+        if self.cache:
+            self.cache.log_stats()
+        if self.archive:
+            self.archive.log_stats()
+
+
+def format_kinds(counts):
+    return f"({', '.join(f'{kind} {count}' for kind, count in counts.items())})" if counts else ''
+
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+
+def get_client():
+    """프로세스 안에서 모든 크롤러가 공유하는 HttpClient 반환"""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
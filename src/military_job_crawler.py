@@ -1,128 +1,254 @@
 import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import time
 from datetime import datetime
 import os
 import re
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import Select
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import queue
+import threading
+import tempfile
+from collections import Counter
 import logging
 import argparse
+from urllib.parse import urljoin
+from lxml import etree
+from lxml import html as lxml_html
+
+from rate_limiter import HostRateLimiter
+from driver_utils import (get_round_trips, blocked_url_patterns, NetworkMeter, RESOURCE_TYPE_EXTENSIONS,
+                          DEFAULT_BLOCKED_TYPES, DEFAULT_BLOCKED_URLS)
+from state_store import PostingStateStore, row_fingerprint
+from checkpoint import CrawlCheckpoint
+from http_client import HttpClient
+from html_archive import HtmlArchive
+from row_writer import CsvRowWriter, JsonlSpool, finalize_rows
+from table_io import OUTPUT_FORMATS, require_parquet
+from crawl_pipeline import CrawlPipeline
+from wait_stats import WaitStats
+from driver_factory import get_driver_manager
+from resilience import RetryPolicy, DeadLetterStore, classify_error, get_breaker, configure_breakers
+
+def has_class(name):
+    """XPath에서 CSS 클래스 일치 여부를 검사하는 조건식"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# 목록/상세 페이지마다 사용하는 XPath는 모듈 로드 시 한 번만 컴파일
+LIST_TABLE_XPATH = etree.XPath(f"//*[{has_class('brd_list_n')}]")
+LIST_HEADER_XPATH = etree.XPath('.//thead//th')
+LIST_ROW_XPATH = etree.XPath('.//tbody/tr')
+LIST_CELL_XPATH = etree.XPath('.//th | .//td')
+LIST_LINK_XPATH = etree.XPath(f".//td[{has_class('title')}]//a")
+DETAIL_H3_XPATH = etree.XPath(f"//div[{has_class('step1')}]//h3")
+DETAIL_SECTION_TABLE_XPATH = etree.XPath('./following-sibling::table[1]')
+DETAIL_SECTION_ROW_XPATH = etree.XPath('./tbody/tr | ./tr')
+DETAIL_NOTE_TABLE_XPATH = etree.XPath(f"//*[{has_class('table_row')}]")
+DETAIL_NOTE_CELL_XPATH = etree.XPath('./tbody/tr/td | ./tr/td')
+
+# 검색 폼에서 페이지 번호/페이지당 건수로 쓰이는 필드 이름 후보 (전자정부 프레임워크 관례 포함)
+PAGE_INDEX_FIELDS = ('pageIndex', 'currentPageNo', 'currentPage', 'pageNo', 'curPage', 'cpage', 'page')
+PAGE_SIZE_FIELDS = ('pageUnit', 'recordCountPerPage', 'pageSize', 'listCount', 'rowCount', 'numOfRows')
+# 직접 요청에 실패한 목록 페이지를 다시 요청하는 횟수 (HttpClient의 요청 단위 재시도와 별도)
+LIST_PAGE_RETRIES = 2
+
+# 페이지 번호 필드가 있는 검색 폼의 action/method/현재 입력값 (선택한 복무형태 등 브라우저의 실제 값)
+SEARCH_FORM_SCRIPT = """
+var names = arguments[0];
+for (var f = 0; f < document.forms.length; f++) {
+    var form = document.forms[f];
+    var fields = [], pageField = null;
+    for (var i = 0; i < form.elements.length; i++) {
+        var el = form.elements[i];
+        if (!el.name || el.disabled || ['submit', 'button', 'file', 'reset'].indexOf(el.type) >= 0) continue;
+        if ((el.type === 'checkbox' || el.type === 'radio') && !el.checked) continue;
+        if (!pageField && names.indexOf(el.name) >= 0) pageField = el.name;
+        fields.push([el.name, el.value]);
+    }
+    if (pageField) return {action: form.action, method: (form.getAttribute('method') || 'get').toLowerCase(), fields: fields};
+}
+return null;
+"""
 
 class MilitaryJobCrawler:
-    def __init__(self):
+    def __init__(self, detail_workers=2, rate_limit=1.0, detail_mode='http', state_store=None, checkpoint=None,
+                 archive=None, parse_workers=1, queue_size=32, list_mode='direct', list_page_size=100,
+                 blocked_urls=None, driver_manager=None, dead_letters=None, detail_timeout=15, output_format='csv'):
         self.base_url = "https://work.mma.go.kr/caisBYIS/search/cygonggogeomsaek.do"
         self.driver = None
-        self.job_data = []
+        self.job_urls = []  # 기본 정보 행의 상세정보_URL (행 자체는 basic_writer로 바로 기록)
+        self.row_fingerprints = {}  # 증분 크롤링용 URL -> 목록 행 fingerprint
         self.total_count = 0
-        self.detail_info = []
         self.wait = None
-        self.detail_driver_pool = []  # WebDriver 풀
+        self.basic_writer = None  # 기본 정보 CSV writer (목록 페이지마다 추가)
+        self.output_format = output_format  # 최종 기본/상세 정보 파일 형식 ('csv' 또는 'parquet')
+        self.detail_spool = None  # 상세 정보 JSONL spool (상세 페이지마다 추가)
+        self.detail_workers = max(1, detail_workers)
+        # 목록 페이지 탐색과 동시에 진행하는 상세 정보 파이프라인 설정 (parse 워커는 브라우저 재시도도 수행)
+        self.parse_workers = max(1, parse_workers)
+        self.queue_size = max(1, queue_size)
+        self.detail_drivers = []  # 생성된 상세 정보용 WebDriver 전체 목록
+        self.detail_driver_pool = queue.Queue()  # 대여 가능한 WebDriver 풀
+        self.pool_lock = threading.Lock()
+        # 브라우저 시작/재사용/재시작을 담당하는 관리자 (기본은 프로세스 공용, 다른 크롤러와 브라우저 공유)
+        self.driver_manager = driver_manager or get_driver_manager()
+        # 상세 정보 수집 방식: 'http'(requests + lxml, 실패 시 브라우저) 또는 'browser'
+        self.detail_mode = detail_mode
+        # 검색 세션 쿠키를 이어받으므로 공용 클라이언트가 아닌 전용 HttpClient 사용
+        self.http = HttpClient(max_retries=1)
+        self.session = self.http.session
+        self.detail_stats = {'http': 0, 'browser': 0}
+        self.stats_lock = threading.Lock()
+        # 증분 크롤링용 공고 상태 저장소 (None이면 매번 전체 수집)
+        self.state_store = state_store
+        # 진행 상황 체크포인트 (None이면 저장하지 않음)
+        self.checkpoint = checkpoint
+        self.headers = None
+        self.processed_pages = set()
+        self.list_completed = False
+        self.failed_list_pages = []  # 재요청 후에도 수집하지 못한 목록 페이지 번호 (--resume으로 다시 요청)
+        # 목록 페이지 이동 방식: 'direct'(검색 폼에 페이지 번호를 넣어 HTTP로 바로 요청, 실패 시 click) 또는 'click'
+        self.list_mode = list_mode
+        # direct 방식에서 요청할 페이지당 건수 (폼에 해당 필드가 있을 때만 사용, None이면 사이트 기본값)
+        self.list_page_size = list_page_size
+        self.list_page_size_used = None  # 실제로 요청에 사용한 페이지당 건수 (체크포인트의 페이지 번호 기준)
+        self.completed_urls = set()  # 상세 정보 수집에 성공한 URL
+        # 브라우저에서 CDP로 차단할 URL 패턴 (None이면 기본 리소스 종류/외부 스크립트, 빈 목록이면 차단하지 않음)
+        self.blocked_urls = blocked_url_patterns() if blocked_urls is None else list(blocked_urls)
+        self.network_meter = NetworkMeter()  # 페이지별 브라우저 요청/전송량/차단 통계
+        # 요소 대기/요청 속도 제한/재시도 지연에 쓴 시간 (크롤링 종료 시 작업 시간과 비교하여 출력)
+        self.wait_stats = WaitStats()
+        self.http.wait_stats = self.wait_stats
+        # 브라우저 상세 정보 재시도 정책 (타임아웃은 1회만 재시도, 그 밖의 오류는 지수 백오프로 2회)
+        self.detail_retry = RetryPolicy(max_retries=2, timeout_retries=1, backoff=2.0)
+        self.detail_timeout = detail_timeout  # 상세 정보 표가 나타날 때까지 기다리는 최대 시간(초)
+        # 끝내 수집하지 못한 상세 URL을 기록하는 재시도 목록 (None이면 기록하지 않음)
+        self.dead_letters = dead_letters
+        # 모든 워커가 공유하는 호스트별 요청 속도 제한 (초당 요청 수)
+        self.rate_limiter = HostRateLimiter(rate=rate_limit, stats=self.wait_stats)
+        # 수집한 원본 HTML 아카이브 (None이면 기록하지 않음, reparse.py로 CSV 재생성에 사용)
+        self.archive = archive
+        self.last_page_source = None  # 마지막으로 파싱한 목록 페이지 HTML (아카이브 기록용)
+        self.last_page_url = None
         
         # 로깅 설정
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
     def create_driver(self):
-        """WebDriver 인스턴스 생성"""
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        options.page_load_strategy = 'eager'
-        options.binary_location = '/usr/bin/chromium'  # Chromium 바이너리 위치 지정
-        
-        # 성능 최적화를 위한 설정
-        prefs = {
-            'profile.default_content_setting_values': {
-                'images': 2,  # 이미지 로딩 비활성화
-                'plugins': 2,  # 플러그인 비활성화
-                'javascript': 1  # JavaScript는 필요하므로 활성화
-            }
-        }
-        options.add_experimental_option('prefs', prefs)
-        
-        # ChromeDriver 경로 직접 지정
-        service = Service('/usr/local/bin/chromedriver')
-        return webdriver.Chrome(service=service, options=options)
+        """공유 DriverManager에서 WebDriver 대여 (대기 중인 브라우저가 있으면 재사용)"""
+        return self.driver_manager.acquire(self.blocked_urls)
 
     def initialize_detail_drivers(self, count=2):
         """상세 정보 수집용 WebDriver 풀 초기화"""
-        for _ in range(count):
-            try:
-                driver = self.create_driver()
-                self.detail_driver_pool.append(driver)
-                time.sleep(1)  # 드라이버 생성 간 간격
-            except Exception as e:
-                logging.error(f"WebDriver 초기화 실패: {e}")
+        with self.pool_lock:
+            if len(self.detail_drivers) >= count:
+                return len(self.detail_drivers)
+            for _ in range(count - len(self.detail_drivers)):
+                try:
+                    driver = self.create_driver()
+                    self.detail_drivers.append(driver)
+                    self.detail_driver_pool.put(driver)
+                except Exception as e:
+                    logging.error(f"WebDriver 초기화 실패: {e}")
+            logging.info(f"상세 정보용 WebDriver {len(self.detail_drivers)}개 준비 완료")
+            return len(self.detail_drivers)
+
+    def get_available_driver(self, timeout=None):
+        """사용 가능한 WebDriver를 풀에서 대여 (다른 워커가 반납할 때까지 대기)"""
+        if not self.detail_drivers:
+            self.initialize_detail_drivers(self.detail_stage_workers()[1])
+        if not self.detail_drivers:
+            return None
+        try:
+            return self.detail_driver_pool.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def release_driver(self, driver):
+        """대여한 WebDriver를 풀에 반납 (페이지 이동/메모리 기준을 넘었으면 새 브라우저로 교체)"""
+        if driver is None:
+            return
+        try:
+            replacement = self.driver_manager.recycle_if_needed(driver, self.blocked_urls)
+        except Exception as e:
+            logging.error(f"WebDriver 재시작 실패: {e}")
+            replacement = None
+        if replacement is not driver:
+            with self.pool_lock:
+                index = self.detail_drivers.index(driver)
+                if replacement is None:
+                    del self.detail_drivers[index]
+                    return
+                self.detail_drivers[index] = replacement
+        self.detail_driver_pool.put(replacement)
 
-    def get_available_driver(self):
-        """사용 가능한 WebDriver 반환"""
-        if not self.detail_driver_pool:
-            self.initialize_detail_drivers()
-        return self.detail_driver_pool[0] if self.detail_driver_pool else None
+    @contextmanager
+    def checkout_driver(self):
+        """with 블록 동안 WebDriver를 대여하고 끝나면 반납"""
+        driver = self.get_available_driver()
+        try:
+            yield driver
+        finally:
+            self.release_driver(driver)
 
     def setup_driver(self):
-        """Selenium WebDriver 설정"""
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        options.binary_location = '/usr/bin/chromium'  # Chromium 바이너리 위치 지정
-        
-        # 성능 최적화를 위한 설정
-        options.page_load_strategy = 'eager'
-        prefs = {
-            'profile.default_content_setting_values': {
-                'images': 2,  # 이미지 로딩 비활성화
-                'plugins': 2,  # 플러그인 비활성화
-                'javascript': 1  # JavaScript는 필요하므로 활성화
-            }
-        }
-        options.add_experimental_option('prefs', prefs)
-        
-        # ChromeDriver 경로 직접 지정
-        service = Service('/usr/local/bin/chromedriver')
-        self.driver = webdriver.Chrome(service=service, options=options)
+        """목록 검색용 WebDriver 설정"""
+        self.driver = self.create_driver()
         self.wait = WebDriverWait(self.driver, 10)
 
-    def wait_and_find_element(self, by, value, timeout=10):
-        """요소를 찾을 때까지 대기하고 찾기"""
+    def wait_until(self, condition, timeout=10, driver=None, description=None):
+        """조건이 만족될 때까지 대기하고 결과 반환 (시간 초과 시 None, 대기 시간은 wait_stats에 기록)"""
         try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((by, value))
-            )
+            with self.wait_stats.waiting('element'):
+                return WebDriverWait(driver or self.driver, timeout).until(condition)
         except TimeoutException:
+            if description:
+                logging.warning(f"대기 시간 초과: {description}")
+            return None
+
+    def wait_and_find_element(self, by, value, timeout=10):
+        """요소를 찾을 때까지 대기하고 찾기"""
+        element = self.wait_until(EC.presence_of_element_located((by, value)), timeout)
+        if element is None:
             logging.warning(f"요소를 찾을 수 없습니다: {value}")
+        return element
+
+    def get_page_tree(self, wait_for=None, driver=None):
+        """현재 페이지 HTML을 한 번에 가져와 lxml 트리로 파싱 (요소별 WebDriver 왕복 방지)"""
+        driver = driver or self.driver
+        if wait_for and not self.wait_and_find_element(*wait_for):
             return None
+        page_source, current_url = driver.page_source, driver.current_url
+        self.network_meter.collect(driver, current_url)
+        if driver is self.driver:
+            self.last_page_source, self.last_page_url = page_source, current_url
+        return lxml_html.fromstring(page_source, base_url=current_url)
 
     def find_service_type_select(self):
         """복무형태 선택 요소 찾기"""
         try:
-            table = self.wait_and_find_element(By.CLASS_NAME, 'table_row')
-            if not table:
+            tree = self.get_page_tree((By.CLASS_NAME, 'table_row'))
+            if tree is None:
                 return None
 
-            rows = table.find_elements(By.TAG_NAME, 'tr')
-            for row in rows:
-                try:
-                    th = row.find_element(By.TAG_NAME, 'th')
-                    label = th.find_element(By.TAG_NAME, 'label')
-                    if '복무형태' in label.text:
-                        td = row.find_element(By.TAG_NAME, 'td')
-                        return td.find_element(By.TAG_NAME, 'select')
-                except NoSuchElementException:
-                    continue
+            for row in tree.xpath(f"(//*[{has_class('table_row')}])[1]//tr"):
+                ths = row.xpath('.//th')
+                labels = ths[0].xpath('.//label') if ths else []
+                if labels and '복무형태' in self.element_text(labels[0]):
+                    tds = row.xpath('.//td')
+                    selects = tds[0].xpath('.//select') if tds else []
+                    if not selects:
+                        continue
+                    # 찾은 select만 실제 WebElement로 한 번 조회
+                    if selects[0].get('id'):
+                        return self.driver.find_element(By.ID, selects[0].get('id'))
+                    if selects[0].get('name'):
+                        return self.driver.find_element(By.NAME, selects[0].get('name'))
             return None
         except Exception as e:
             logging.error(f"복무형태 선택 요소 찾는 중 오류: {e}")
@@ -131,8 +257,9 @@ class MilitaryJobCrawler:
     def search_research_positions(self):
         """전문연구요원 공고 검색 설정"""
         try:
+            # 복무형태 select가 있는 표(table_row)가 나타날 때까지는 find_service_type_select에서 대기
             self.driver.get(self.base_url)
-            time.sleep(2)
+            self.driver_manager.record_navigation(self.driver)
 
             service_type_select = self.find_service_type_select()
             if service_type_select:
@@ -145,7 +272,11 @@ class MilitaryJobCrawler:
             search_button = self.wait_and_find_element(By.CSS_SELECTOR, 'span.icon_search a')
             if search_button:
                 search_button.click()
-                time.sleep(2)
+                # 검색 결과로 페이지가 바뀌고 목록 표가 나타날 때까지 대기 (고정 sleep 대신)
+                self.wait_until(EC.staleness_of(search_button), description='검색 결과 페이지 이동')
+                if not self.wait_and_find_element(By.CLASS_NAME, 'brd_list_n'):
+                    return False
+                logging.info(f"검색 설정 WebDriver 왕복 횟수: {get_round_trips(self.driver)}")
                 return True
             return False
 
@@ -166,18 +297,22 @@ class MilitaryJobCrawler:
             logging.error(f"총 공고 수 가져오기 실패: {e}")
         return False
 
-    def get_job_list(self):
+    def get_job_list(self, tree=None):
         """채용공고 목록 가져오기"""
         try:
-            table = self.wait_and_find_element(By.CLASS_NAME, 'brd_list_n')
-            headers = [th.text.strip() for th in table.find_elements(By.CSS_SELECTOR, 'thead th')]
+            if tree is None:
+                tree = self.get_page_tree((By.CLASS_NAME, 'brd_list_n'))
+            table = LIST_TABLE_XPATH(tree)[0]
+            headers = [self.element_text(th) for th in LIST_HEADER_XPATH(table)]
             headers.append('상세정보_URL')
             
             rows = []
-            for tr in table.find_elements(By.CSS_SELECTOR, 'tbody tr'):
-                row_data = [cell.text.strip() for cell in tr.find_elements(By.CSS_SELECTOR, 'th, td')]
-                url_cell = tr.find_element(By.CSS_SELECTOR, 'td.title a')
-                row_data.append(url_cell.get_attribute('href'))
+            for tr in LIST_ROW_XPATH(table):
+                row_data = [self.element_text(cell) for cell in LIST_CELL_XPATH(tr)]
+                url_cell = LIST_LINK_XPATH(tr)
+                if not url_cell:
+                    raise Exception("상세정보 링크를 찾을 수 없습니다.")
+                row_data.append(urljoin(tree.base_url, url_cell[0].get('href', '')))
                 rows.append(row_data)
             
             return headers, rows
@@ -185,135 +320,360 @@ class MilitaryJobCrawler:
             logging.error(f"채용공고 목록 가져오기 실패: {e}")
             return None, None
 
-    def get_job_detail(self, url):
-        """채용공고 상세 정보 가져오기"""
-        max_retries = 5  # 재시도 횟수 증가
-        retry_delay = 5  # 대기 시간 증가
+    def get_job_detail(self, url, driver=None):
+        """채용공고 상세 정보 가져오기 (오류 종류별 재시도, 끝내 실패하면 재시도 목록에 기록)"""
+        driver = driver or self.driver
+        breaker = get_breaker(url)
+        failures = Counter()
+        attempt = 0
         
-        for attempt in range(max_retries):
+        while True:
             try:
-                logging.info(f"상세 정보 수집 시작 - URL: {url} (시도: {attempt + 1}/{max_retries})")
-                self.driver.get(url)
+                logging.info(f"상세 정보 수집 시작 - URL: {url} (시도: {attempt + 1})")
+                breaker.before_request(self.wait_stats)
+                get_round_trips(driver)
+                self.rate_limiter.wait(url)
+                driver.get(url)
+                self.driver_manager.record_navigation(driver)
                 
-                # 페이지 로딩 대기 시간 증가
-                WebDriverWait(self.driver, 30).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, 'div.step1'))
-                )
-                time.sleep(2)  # 추가 대기 시간
+                # parse_job_detail_html이 읽는 div.step1의 제목 다음 표가 나타날 때까지 대기 (고정 sleep 대신)
+                if self.wait_until(EC.presence_of_element_located((By.CSS_SELECTOR, 'div.step1 h3 ~ table')),
+                                   timeout=self.detail_timeout, driver=driver) is None:
+                    raise TimeoutException("상세 정보 표가 나타나지 않았습니다.")
                 
-                detail_data = {
-                    '상세정보_URL': url
-                }
-                
-                sections = ['병역지정업체정보', '근무조건', '우대사항 및 복리후생']
-                for section in sections:
-                    logging.debug(f"'{section}' 섹션 정보 수집 중...")
-                    h3_elements = self.driver.find_elements(By.CSS_SELECTOR, 'div.step1 h3')
-                    for h3 in h3_elements:
-                        if h3.text.strip() == section:
-                            table = h3.find_element(By.XPATH, './following-sibling::table[1]')
-                            rows = table.find_elements(By.CSS_SELECTOR, 'tbody tr')
-                            for row in rows:
-                                try:
-                                    th = row.find_element(By.TAG_NAME, 'th').text.strip()
-                                    td = row.find_element(By.TAG_NAME, 'td').text.strip()
-                                    detail_data[th] = td
-                                except NoSuchElementException:
-                                    continue
-
-                # 비고 정보 수집
-                tables = self.driver.find_elements(By.CLASS_NAME, 'table_row')
-                for table in tables:
-                    try:
-                        caption = table.find_element(By.TAG_NAME, 'caption')
-                        if '비고' in caption.get_attribute('textContent').strip():
-                            td_elements = table.find_elements(By.CSS_SELECTOR, 'tbody tr td')
-                            bigo_text = ' '.join([td.text.strip() for td in td_elements if td.text.strip()])
-                            if bigo_text:
-                                detail_data['비고'] = bigo_text
-                            break
-                    except NoSuchElementException:
-                        continue
+                # 페이지 HTML을 한 번만 가져와 로컬에서 파싱
+                page_source = driver.page_source
+                self.network_meter.collect(driver, url)
+                self.archive_page(url, page_source, 'detail')
+                detail_data = self.parse_job_detail_html(page_source, url)
                 
-                # 데이터 검증
+                # 데이터 검증 (충분한 데이터를 받은 경우에만 circuit을 닫음)
                 if len(detail_data) <= 1:  # URL만 있는 경우
-                    raise Exception("상세 정보가 충분히 수집되지 않았습니다.")
+                    raise ValueError("상세 정보가 충분히 수집되지 않았습니다.")
+                breaker.record_success()
                 
-                logging.info(f"상세 정보 수집 완료 - URL: {url}")
+                logging.info(f"상세 정보 수집 완료 - URL: {url} (WebDriver 왕복 {get_round_trips(driver)}회)")
                 return detail_data
                 
             except Exception as e:
-                logging.error(f"상세 정보 가져오기 실패 (URL: {url}, 시도: {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                    continue
-                return {'상세정보_URL': url}
+                kind = classify_error(e)
+                if isinstance(e, ValueError):
+                    # 데이터가 부족한 페이지는 성공/실패로 세지 않고 시험 요청 차례만 반납
+                    breaker.release_probe()
+                else:
+                    breaker.record(kind)
+                failures[kind] += 1
+                logging.error(f"상세 정보 가져오기 실패 (URL: {url}, 시도: {attempt + 1}, {kind}): {e}")
+                if not self.detail_retry.should_retry(kind, failures[kind]):
+                    self.record_failure(url, e)
+                    return {'상세정보_URL': url}
+                with self.wait_stats.waiting('retry'):
+                    time.sleep(self.detail_retry.delay(attempt))
+                attempt += 1
 
-    def process_job_details(self, urls):
-        """순차적으로 상세 정보 처리"""
-        # 중복 URL 제거하되 순서 유지
-        seen = set()
-        unique_urls = [url for url in urls if not (url in seen or seen.add(url))]
-        total_urls = len(unique_urls)
-        
-        logging.info(f"총 {total_urls}개의 상세 정보 수집 시작")
-        results = []
-        
-        for idx, url in enumerate(unique_urls, 1):
-            result = self.get_job_detail(url)
-            results.append(result)
-            logging.info(f"진행률: {idx}/{total_urls} ({(idx/total_urls*100):.1f}%)")
-            time.sleep(3)  # 요청 간 간격
-        
-        # URL을 키로 사용하여 결과를 매핑
-        url_to_detail = {result['상세정보_URL']: result for result in results}
+    def sync_session_from_driver(self):
+        """검색에 사용한 브라우저의 쿠키/User-Agent를 requests 세션으로 복사"""
+        if not self.driver:
+            return
+        try:
+            user_agent = self.driver.execute_script("return navigator.userAgent;")
+            self.session.headers.update({'User-Agent': user_agent, 'Referer': self.base_url})
+            for cookie in self.driver.get_cookies():
+                self.session.cookies.set(cookie['name'], cookie['value'],
+                                         domain=cookie.get('domain'), path=cookie.get('path', '/'))
+            logging.info(f"HTTP 세션 동기화 완료 (쿠키 {len(self.session.cookies)}개)")
+        except Exception as e:
+            logging.warning(f"HTTP 세션 동기화 실패: {e}")
+
+    @staticmethod
+    def element_text(element):
+        """lxml 요소의 텍스트를 브라우저의 .text와 비슷하게 정리"""
+        for br in element.iter('br'):
+            br.tail = '\n' + (br.tail or '')
+        lines = [' '.join(line.split()) for line in element.text_content().split('\n')]
+        return '\n'.join(line for line in lines if line)
+
+    def parse_job_detail_html(self, page_html, url):
+        """상세 페이지 HTML(div.step1)을 lxml로 파싱"""
+        detail_data = {
+            '상세정보_URL': url
+        }
+        tree = lxml_html.fromstring(page_html)
         
-        # 원래 URL 순서대로 결과 반환
-        final_results = [url_to_detail[url] for url in urls]
+        sections = ['병역지정업체정보', '근무조건', '우대사항 및 복리후생']
+        h3_elements = DETAIL_H3_XPATH(tree)
+        for section in sections:
+            for h3 in h3_elements:
+                if self.element_text(h3) == section:
+                    tables = DETAIL_SECTION_TABLE_XPATH(h3)
+                    if not tables:
+                        continue
+                    for row in DETAIL_SECTION_ROW_XPATH(tables[0]):
+                        th = row.find('.//th')
+                        td = row.find('.//td')
+                        if th is None or td is None:
+                            continue
+                        detail_data[self.element_text(th)] = self.element_text(td)
+
+        # 비고 정보 수집
+        for table in DETAIL_NOTE_TABLE_XPATH(tree):
+            caption = table.find('.//caption')
+            if caption is None:
+                continue
+            if '비고' in caption.text_content().strip():
+                td_texts = [self.element_text(td) for td in DETAIL_NOTE_CELL_XPATH(table)]
+                bigo_text = ' '.join([text for text in td_texts if text])
+                if bigo_text:
+                    detail_data['비고'] = bigo_text
+                break
+
+        return detail_data
+
+    def archive_page(self, url, content, kind, meta=None):
+        """원본 HTML을 아카이브에 기록 (기록 실패는 크롤링을 중단하지 않음)"""
+        if not self.archive or not content:
+            return
+        try:
+            self.archive.add(url, content, kind=kind, meta=meta)
+        except Exception as e:
+            logging.warning(f"HTML 아카이브 기록 실패 (URL: {url}): {e}")
+
+    def fetch_detail_content(self, url):
+        """파이프라인 fetch 단계: 브라우저 없이 HTTP 요청으로 상세 페이지 HTML 가져오기 (실패하면 예외 객체)"""
+        if self.detail_mode != 'http':
+            return None
+        try:
+            response = self.http.get(url)
+            self.archive_page(url, response.content, 'detail')
+            return response.content
+        except Exception as e:
+            logging.warning(f"HTTP 상세 정보 가져오기 실패 (URL: {url}): {e}")
+            return e
+
+    def parse_detail_content(self, url, content):
+        """파이프라인 parse 단계: 상세 페이지 파싱 (HTTP 결과의 필드가 부족하면 브라우저로 재시도)"""
+        if isinstance(content, Exception):
+            # 4xx(삭제된 공고 등)와 circuit open은 브라우저로 다시 요청해도 같으므로 바로 재시도 목록에 기록
+            if classify_error(content) in ('client', 'circuit_open'):
+                self.record_failure(url, content)
+                return {'상세정보_URL': url}
+            content = None
+        if content is not None:
+            # 인코딩은 lxml이 meta charset을 보고 판단하도록 bytes를 그대로 전달
+            detail_data = self.parse_job_detail_html(content, url)
+            if len(detail_data) > 1:
+                with self.stats_lock:
+                    self.detail_stats['http'] += 1
+                logging.info(f"상세 정보 수집 완료 (HTTP) - URL: {url}")
+                return detail_data
+            logging.info(f"HTTP 파싱 결과가 부족하여 브라우저로 재시도 - URL: {url}")
+
+        with self.stats_lock:
+            self.detail_stats['browser'] += 1
+        return self.fetch_detail_with_pool(url)
+
+    def fetch_detail_with_pool(self, url):
+        """풀에서 WebDriver를 대여하여 상세 정보 수집"""
+        with self.checkout_driver() as driver:
+            if driver is None:
+                logging.error(f"사용 가능한 WebDriver가 없습니다 - URL: {url}")
+                return {'상세정보_URL': url}
+            return self.get_job_detail(url, driver)
+
+    def detail_stage_workers(self):
+        """파이프라인 (fetch 워커 수, parse 워커 수)
+
+        브라우저 모드는 fetch 단계가 하는 일이 없고 parse 단계에서 WebDriver로 수집하므로
+        parse 워커를 detail_workers개(WebDriver 수와 같음) 사용한다. WebDriver 풀도 parse 워커 수만큼 만든다.
+        """
+        if self.detail_mode == 'browser':
+            return 1, self.detail_workers
+        return self.detail_workers, self.parse_workers
+
+    def start_detail_pipeline(self):
+        """상세 정보 파이프라인 시작 (목록 페이지 탐색 -> 상세 URL 큐 -> fetch -> parse -> writer)"""
+        fetch_workers, parse_workers = self.detail_stage_workers()
+        if self.detail_mode == 'browser':
+            # 브라우저 모드는 parse 워커마다 WebDriver 하나로 수집
+            self.initialize_detail_drivers(parse_workers)
+        self.submitted_urls = set()
+        self.detail_total = 0
+        self.detail_done = 0
+        # HTTP 모드의 속도 제한 대기는 fetch 단계의 asyncio 수집기가 요청 전에 처리
+        rate_limiter = self.rate_limiter if self.detail_mode == 'http' else None
+        return CrawlPipeline(self.fetch_detail_content, self.parse_detail_content, self.write_pipeline_result,
+                             fetch_workers=fetch_workers, parse_workers=parse_workers,
+                             queue_size=self.queue_size, name='병무청 파이프라인', rate_limiter=rate_limiter).start()
+
+    def submit_details(self, pipeline, urls, fingerprints):
+        """아직 수집하지 않은 상세 URL을 파이프라인에 넣기 (증분 크롤링이면 저장된 상세 정보 재사용)"""
+        for url in urls:
+            if url in self.completed_urls or url in self.submitted_urls:
+                continue
+            self.submitted_urls.add(url)
+            self.detail_total += 1
+            if self.state_store:
+                detail = self.state_store.get_cached_detail(url, fingerprints.get(url))
+                if detail:
+                    self.state_store.touch([url])
+                    pipeline.emit(url, ('cached', detail))
+                    continue
+            pipeline.submit(url)
+
+    def write_pipeline_result(self, item, result):
+        """파이프라인 writer 단계: 목록 행과 상세 정보를 파일에 기록 (writer 스레드 하나에서만 실행)"""
+        if isinstance(item, tuple):
+            # 목록 페이지: ('list', 페이지 번호, 헤더, 행)
+            _, page, headers, rows = item
+            if page in self.processed_pages:
+                # 체크포인트에서 복원한 페이지는 행을 다시 추가하지 않음
+                logging.info(f"목록 페이지 {page}는 이미 수집되었습니다.")
+                return
+            self.write_basic_rows(headers, rows)
+            if page:
+                self.processed_pages.add(page)
+            logging.info(f"기본 정보 수집 진행률: {len(self.job_urls)}/{self.total_count} "
+                         f"({(len(self.job_urls)/self.total_count*100):.1f}%)")
+            if self.checkpoint:
+                self.checkpoint.update(self.checkpoint_state, force=True)
+            return
+
+        cached = isinstance(result, tuple)
+        detail = result[1] if cached else result
+        self.record_detail(detail or {'상세정보_URL': item}, cached=cached)
+        self.detail_done += 1
+        logging.info(f"상세 정보 진행률: {self.detail_done}/{self.detail_total}")
+
+    def record_failure(self, url, error):
+        """재시도해도 수집하지 못한 URL을 재시도 목록에 기록 (retry_dead_letters.py로 따로 재수집)"""
+        if self.dead_letters:
+            self.dead_letters.add_error(url, error)
+
+    def record_detail(self, detail, cached=False):
+        """수집된 상세 정보를 spool에 기록하고 주기적으로 체크포인트 저장"""
+        url = detail['상세정보_URL']
+        self.detail_spool.write(detail)
+        if len(detail) > 1:
+            self.completed_urls.add(url)
+            if self.dead_letters:
+                self.dead_letters.remove(url)
+        if self.state_store and not cached:
+            self.state_store.upsert(url, self.row_fingerprints.get(url), detail)
+        if self.checkpoint:
+            self.checkpoint.update(self.checkpoint_state)
+
+    def write_basic_rows(self, headers, rows):
+        """목록 페이지의 행을 기본 정보 CSV에 바로 기록"""
+        if self.basic_writer is None:
+            self.basic_writer = CsvRowWriter(self.basic_part_path, headers)
+        self.basic_writer.write_rows(rows)
+        for row in rows:
+            self.job_urls.append(row[-1])
+            if self.state_store:
+                self.row_fingerprints[row[-1]] = row_fingerprint(headers, row)
+
+    def checkpoint_state(self):
+        """체크포인트에 저장할 진행 상황 (행과 상세 정보는 writer/spool 파일에 기록됨)"""
+        basic_offset = self.basic_writer.flush() if self.basic_writer else None
+        self.detail_spool.flush()
+        return {
+            'crawler': 'military',
+            'total_count': self.total_count,
+            'headers': self.headers,
+            'basic_part_path': self.basic_part_path,
+            'basic_offset': basic_offset,
+            'detail_spool_path': self.detail_spool.path,
+            'processed_pages': sorted(self.processed_pages),
+            'list_completed': self.list_completed,
+            'failed_list_pages': self.failed_list_pages,
+            'list_page_size': self.list_page_size_used,
+            'pending': [url for url in dict.fromkeys(self.job_urls) if url not in self.completed_urls],
+            'archive_run_id': self.archive.run_id if self.archive else None,
+        }
+
+    def restore_checkpoint(self):
+        """마지막 체크포인트에서 진행 상황 복원 (없으면 None)"""
+        state = self.checkpoint.load() if self.checkpoint else None
+        if not state or state.get('crawler') != 'military':
+            logging.info("복원할 체크포인트가 없어 처음부터 크롤링합니다.")
+            return None
+        self.headers = state.get('headers')
+        self.processed_pages = set(state.get('processed_pages', []))
+        self.list_completed = state.get('list_completed', False)
+        self.failed_list_pages = state.get('failed_list_pages', [])
+        if self.processed_pages:
+            # 이미 수집한 페이지 번호가 같은 범위를 가리키도록 이전 실행의 페이지당 건수를 그대로 사용
+            self.list_page_size = state.get('list_page_size')
+        if self.archive and state.get('archive_run_id'):
+            # 이어서 수집한 페이지도 같은 실행으로 아카이브에 기록
+            self.archive.run_id = state['archive_run_id']
+        return state
+
+    def open_writers(self, basic_filename, detail_filename, state=None):
+        """기본 정보 CSV와 상세 정보 spool 열기 (체크포인트가 있으면 이어서 기록)"""
+        if not basic_filename or not detail_filename:
+            work_dir = tempfile.mkdtemp(prefix='military_jobs_')
+            basic_filename = basic_filename or os.path.join(work_dir, 'basic.csv')
+            detail_filename = detail_filename or os.path.join(work_dir, 'detail.csv')
+        self.basic_part_path = f"{basic_filename}.part"
+        spool_path = f"{detail_filename}.spool.jsonl"
         
-        # 결과 검증
-        successful_count = sum(1 for result in final_results if len(result) > 1)
-        logging.info(f"상세 정보 수집 완료 (성공: {successful_count}/{len(final_results)})")
+        if state:
+            self.basic_part_path = state.get('basic_part_path') or self.basic_part_path
+            spool_path = state.get('detail_spool_path') or spool_path
+            if self.headers and state.get('basic_offset') is not None:
+                self.basic_writer = CsvRowWriter(self.basic_part_path, self.headers, resume_offset=state['basic_offset'])
+                for row in CsvRowWriter.read_rows(self.basic_part_path):
+                    self.job_urls.append(row[-1])
+                    if self.state_store:
+                        self.row_fingerprints[row[-1]] = row_fingerprint(self.headers, row)
         
-        return final_results
+        self.detail_spool = JsonlSpool(spool_path, resume=bool(state))
+        self.completed_urls = {record['상세정보_URL'] for record in self.detail_spool.iter_records() if len(record) > 1}
+        if state:
+            logging.info(f"체크포인트 복원: 목록 {len(self.processed_pages)}페이지({len(self.job_urls)}건), "
+                         f"상세 정보 {len(self.completed_urls)}건 완료, 남은 상세 정보 {len(state.get('pending', []))}건")
 
     def cleanup_drivers(self):
-        """WebDriver 정리"""
-        for driver in self.detail_driver_pool:
+        """상세 정보용 WebDriver를 DriverManager에 반납 (같은 프로세스의 다음 크롤러가 재사용)"""
+        for driver in self.detail_drivers:
             try:
-                driver.quit()
+                self.driver_manager.release(driver)
             except:
                 pass
-        self.detail_driver_pool.clear()
+        self.detail_drivers.clear()
+        self.detail_driver_pool = queue.Queue()
 
     def __del__(self):
         """소멸자에서 모든 WebDriver 정리"""
         self.cleanup_drivers()
 
-    def get_pagination_info(self):
+    def get_pagination_info(self, tree=None):
         """페이지네이션 정보 가져오기"""
         try:
-            pagination = self.wait_and_find_element(By.CLASS_NAME, 'page_move_n')
-            if not pagination:
+            if tree is None:
+                tree = self.get_page_tree((By.CLASS_NAME, 'page_move_n'))
+            paginations = tree.xpath(f"//*[{has_class('page_move_n')}]") if tree is not None else []
+            if not paginations:
                 logging.warning("페이지네이션 요소를 찾을 수 없습니다.")
                 return None, []
+            pagination = paginations[0]
 
             # 현재 페이지 찾기
             current_page = None
-            current_page_element = pagination.find_element(By.CSS_SELECTOR, 'a[href="#"] span')
+            current_page_element = pagination.xpath('.//a[@href="#"]//span')
             if current_page_element:
-                current_page = current_page_element.text.strip()
+                current_page = self.element_text(current_page_element[0])
                 logging.info(f"현재 페이지: {current_page}")
 
             # 다른 페이지 링크들 찾기
             other_pages = []
-            page_links = pagination.find_elements(By.TAG_NAME, 'a')
-            for link in page_links:
-                href = link.get_attribute('href')
-                if href != '#':
-                    span = link.find_element(By.TAG_NAME, 'span')
-                    page_num = span.text.strip()
-                    other_pages.append((page_num, link))
+            for link in pagination.xpath('.//a'):
+                href = link.get('href')
+                spans = link.xpath('.//span')
+                if href != '#' and spans:
+                    page_num = self.element_text(spans[0])
+                    other_pages.append((page_num, href))
                     logging.debug(f"다른 페이지 발견: {page_num}")
 
             return current_page, other_pages
@@ -322,66 +682,255 @@ class MilitaryJobCrawler:
             logging.error(f"페이지네이션 정보 가져오기 실패: {e}")
             return None, []
 
-    def crawl(self, basic_filename=None, detail_filename=None):
+    def click_page(self, page_num):
+        """페이지 번호 링크를 클릭하고 현재 페이지 표시가 해당 번호로 바뀔 때까지 대기"""
+        link = self.driver.find_element(
+            By.XPATH, f"//*[{has_class('page_move_n')}]//a[.//span[normalize-space(.)='{page_num}']]"
+        )
+        link.click()
+        self.driver_manager.record_navigation(self.driver)
+        current_page = (By.XPATH, f"//*[{has_class('page_move_n')}]//a[@href='#']//span[normalize-space(.)='{page_num}']")
+        return self.wait_until(EC.presence_of_element_located(current_page), description=f"목록 페이지 {page_num} 이동")
+
+    def discover_list_pages(self, pipeline):
+        """목록 페이지를 넘기며 행은 writer로, 상세 URL은 파이프라인으로 넘기기 (큐가 가득 차면 대기)"""
+        visited_pages = set(self.processed_pages)
+        discovered_count = len(self.job_urls)
+        while discovered_count < self.total_count:
+            tree = self.get_page_tree((By.CLASS_NAME, 'brd_list_n'))
+            if tree is None:
+                break
+            headers, rows = self.get_job_list(tree)
+            if not headers or not rows:
+                break
+            self.headers = headers
+            
+            current_page, other_pages = self.get_pagination_info(tree)
+            if current_page:
+                # 목록 페이지는 같은 URL이므로 페이지 번호를 붙여 기록
+                self.archive_page(f"{self.base_url}#page={current_page}", self.last_page_source, 'list',
+                                  meta={'base_url': self.last_page_url, 'page': current_page})
+            if current_page not in visited_pages:
+                discovered_count += len(rows)
+            # 행 기록이 상세 정보보다 먼저 writer에 도착하도록 목록 페이지를 먼저 전달
+            pipeline.emit(('list', current_page, headers, rows), None)
+            fingerprints = {row[-1]: row_fingerprint(headers, row) for row in rows} if self.state_store else {}
+            self.submit_details(pipeline, [row[-1] for row in rows], fingerprints)
+            
+            if not current_page or not other_pages:
+                break
+            visited_pages.add(current_page)
+            
+            next_page_found = False
+            for page_num, _ in other_pages:
+                if page_num not in visited_pages:
+                    next_page_found = self.click_page(page_num) is not None
+                    break
+            
+            logging.info(f"목록 페이지 {current_page} WebDriver 왕복 횟수: {get_round_trips(self.driver)}")
+            if not next_page_found:
+                if discovered_count < self.total_count:
+                    logging.warning(f"다음 페이지로 이동하지 못해 목록 수집을 중단합니다. "
+                                    f"({discovered_count}/{self.total_count}건)")
+                break
+
+    def get_search_form(self):
+        """검색 결과 페이지에서 페이지 번호 필드가 있는 폼 정보 읽기 (없으면 None)"""
+        try:
+            form = self.driver.execute_script(SEARCH_FORM_SCRIPT, list(PAGE_INDEX_FIELDS))
+        except Exception as e:
+            logging.warning(f"검색 폼 정보를 읽을 수 없습니다: {e}")
+            return None
+        if not form or not form.get('action'):
+            return None
+        names = [name for name, _ in form['fields']]
+        form['page_field'] = next(name for name in PAGE_INDEX_FIELDS if name in names)
+        form['size_field'] = next((name for name in PAGE_SIZE_FIELDS if name in names), None)
+        return form
+
+    def fetch_list_page(self, form, page_num, page_size=None):
+        """검색 폼에 페이지 번호(와 페이지당 건수)를 넣어 목록 페이지를 HTTP로 요청하고 (본문, URL, 헤더, 행) 반환"""
+        overrides = {form['page_field']: str(page_num)}
+        if page_size and form['size_field']:
+            overrides[form['size_field']] = str(page_size)
+        fields = [(name, overrides.pop(name) if name in overrides else value) for name, value in form['fields']]
+        self.rate_limiter.wait(form['action'])
+        if form['method'] == 'post':
+            response = self.http.request('POST', form['action'], data=fields)
+        else:
+            response = self.http.get(form['action'], params=fields)
+        tree = lxml_html.fromstring(response.content, base_url=response.url)
+        headers, rows = self.get_job_list(tree)
+        return response.content, response.url, headers, rows
+
+    def discover_list_pages_direct(self, pipeline):
+        """목록 페이지를 클릭 없이 페이지 번호로 바로 요청 (폼을 찾지 못하거나 결과가 다르면 False를 반환하여 click 방식 사용)"""
+        form = self.get_search_form()
+        if form is None:
+            logging.info("페이지 번호 필드가 있는 검색 폼을 찾지 못해 페이지 링크를 클릭하여 이동합니다.")
+            return False
+
+        # 브라우저가 보여준 첫 페이지와 같은 결과인지 확인 (다르면 세션/폼 값이 맞지 않는 것)
+        browser_tree = self.get_page_tree((By.CLASS_NAME, 'brd_list_n'))
+        _, browser_rows = self.get_job_list(browser_tree) if browser_tree is not None else (None, None)
+        if not browser_rows:
+            return False
+        page_size = self.list_page_size if form['size_field'] else None
+        try:
+            first_page = self.fetch_list_page(form, 1, page_size)
+            if page_size and (not first_page[3] or first_page[3][0][-1] != browser_rows[0][-1]):
+                # 페이지당 건수를 바꾸면 결과가 달라지는 경우 사이트 기본값으로 재시도
+                page_size = None
+                first_page = self.fetch_list_page(form, 1)
+        except Exception as e:
+            logging.warning(f"목록 페이지 직접 요청 실패, 페이지 링크를 클릭하여 이동합니다: {e}")
+            return False
+        content, page_url, headers, rows = first_page
+        if not rows or rows[0][-1] != browser_rows[0][-1]:
+            logging.warning("직접 요청한 목록이 브라우저 결과와 달라 페이지 링크를 클릭하여 이동합니다.")
+            return False
+
+        self.list_page_size_used = page_size
+        total_pages = (self.total_count + len(rows) - 1) // len(rows)
+        logging.info(f"목록 페이지 직접 요청: 페이지당 {len(rows)}건, 총 {total_pages}페이지 "
+                     f"({form['method'].upper()} {form['action']}, {form['page_field']}"
+                     f"{', ' + form['size_field'] + '=' + str(page_size) if page_size else ''})")
+
+        todo_pages = [page_num for page_num in range(2, total_pages + 1) if str(page_num) not in self.processed_pages]
+        failed_pages = []
+        # 목록 페이지는 순서를 유지하며 동시에 요청 (요청 간격은 상세 페이지와 공유하는 rate_limiter가 조절)
+        with ThreadPoolExecutor(max_workers=self.detail_workers) as executor:
+            futures = [executor.submit(self.fetch_list_page, form, page_num, page_size) for page_num in todo_pages]
+            results = [(1, first_page)] + list(zip(todo_pages, futures))
+            for page_num, result in results:
+                try:
+                    page = result if page_num == 1 else result.result()
+                except Exception as e:
+                    logging.error(f"목록 페이지 {page_num} 직접 요청 실패: {e}")
+                    failed_pages.append(page_num)
+                    continue
+                if not self.emit_list_page(pipeline, page_num, page, page_size, total_pages):
+                    failed_pages.append(page_num)
+
+        # 실패하거나 비어 있던 페이지는 잠시 후 순서대로 다시 요청
+        for attempt in range(LIST_PAGE_RETRIES):
+            if not failed_pages:
+                break
+            delay = self.detail_retry.delay(attempt)
+            logging.info(f"목록 페이지 {failed_pages} {delay:.1f}초 후 재요청 ({attempt + 1}/{LIST_PAGE_RETRIES})")
+            with self.wait_stats.waiting('retry'):
+                time.sleep(delay)
+            still_failed = []
+            for page_num in failed_pages:
+                try:
+                    page = self.fetch_list_page(form, page_num, page_size)
+                except Exception as e:
+                    logging.error(f"목록 페이지 {page_num} 재요청 실패: {e}")
+                    still_failed.append(page_num)
+                    continue
+                if not self.emit_list_page(pipeline, page_num, page, page_size, total_pages):
+                    still_failed.append(page_num)
+            failed_pages = still_failed
+
+        self.failed_list_pages = failed_pages
+        if failed_pages:
+            logging.error(f"목록 페이지 {failed_pages}를 수집하지 못했습니다. (체크포인트에 기록, --resume으로 다시 요청)")
+        return True
+
+    def emit_list_page(self, pipeline, page_num, page, page_size, total_pages):
+        """직접 요청한 목록 페이지의 행을 writer로, 상세 URL을 파이프라인으로 넘기기 (공고가 없으면 False)"""
+        content, page_url, headers, rows = page
+        if not headers or not rows:
+            if page_num == total_pages:
+                # 수집 중 공고가 마감되어 마지막 페이지가 비는 경우는 누락으로 보지 않음
+                logging.warning(f"마지막 목록 페이지 {page_num}에 공고가 없습니다.")
+                return True
+            logging.warning(f"목록 페이지 {page_num}에 공고가 없습니다.")
+            return False
+        self.headers = headers
+        self.archive_page(f"{self.base_url}#page={page_num}", content, 'list',
+                          meta={'base_url': page_url, 'page': str(page_num), 'page_size': page_size})
+        pipeline.emit(('list', str(page_num), headers, rows), None)
+        fingerprints = {row[-1]: row_fingerprint(headers, row) for row in rows} if self.state_store else {}
+        self.submit_details(pipeline, [row[-1] for row in rows], fingerprints)
+        return True
+
+    def crawl(self, basic_filename=None, detail_filename=None, resume=False):
         """크롤링 실행"""
         logging.info("크롤링 시작...")
+        self.wait_stats.reset()
         
         try:
+            state = self.restore_checkpoint() if resume else None
+            self.open_writers(basic_filename, detail_filename, state)
+            
             self.setup_driver()
             
+            # 목록을 이미 모두 수집했더라도 상세 정보용 세션을 위해 검색은 다시 수행
             if not self.search_research_positions():
                 return
             
             if not self.get_total_count():
                 return
             
-            processed_pages = set()
-            processed_count = 0
+            # 목록 페이지를 넘기는 동안 상세 정보를 함께 수집 (검색 세션을 HTTP 요청에 이어서 사용)
+            self.sync_session_from_driver()
+            pipeline = self.start_detail_pipeline()
+            try:
+                # 체크포인트에서 복원한 목록 행 중 상세 정보가 남은 URL부터 수집
+                self.submit_details(pipeline, list(dict.fromkeys(self.job_urls)), self.row_fingerprints)
+                if not self.list_completed:
+                    self.failed_list_pages = []
+                    if self.list_mode != 'direct' or not self.discover_list_pages_direct(pipeline):
+                        self.discover_list_pages(pipeline)
+                    self.list_completed = not self.failed_list_pages
+            finally:
+                pipeline.close()
             
-            while len(self.job_data) < self.total_count:
-                headers, rows = self.get_job_list()
-                if not headers or not rows:
-                    break
-                
-                self.job_data.extend(rows)
-                processed_count += len(rows)
-                logging.info(f"기본 정보 수집 진행률: {processed_count}/{self.total_count} ({(processed_count/self.total_count*100):.1f}%)")
-                
-                current_page, other_pages = self.get_pagination_info()
-                if not current_page or not other_pages:
-                    break
-                
-                processed_pages.add(current_page)
-                
-                next_page_found = False
-                for page_num, link in other_pages:
-                    if page_num not in processed_pages:
-                        link.click()
-                        time.sleep(2)
-                        next_page_found = True
-                        break
-                
-                if not next_page_found:
-                    break
+            if not self.list_completed:
+                # 빠진 목록 페이지가 있으면 결과 파일을 만들지 않고 체크포인트를 남겨 --resume에서 해당 페이지만 다시 요청
+                if self.checkpoint:
+                    self.checkpoint.update(self.checkpoint_state, force=True)
+                logging.error(f"목록 페이지 {self.failed_list_pages}가 빠져 결과를 저장하지 않았습니다. "
+                              f"--resume으로 다시 실행하세요.")
+                return
             
-            # 상세 정보 수집 (순차적 처리)
-            urls = [row[-1] for row in self.job_data]
-            logging.info(f"총 {len(urls)}개의 상세 정보 수집 시작")
-            self.detail_info = self.process_job_details(urls)
+            logging.info(f"상세 정보 수집 방식 - HTTP: {self.detail_stats['http']}건, 브라우저: {self.detail_stats['browser']}건")
+            self.http.log_stats()
+            successful_count = sum(1 for url in set(self.job_urls) if url in self.completed_urls)
+            logging.info(f"상세 정보 수집 완료 (성공: {successful_count}/{len(set(self.job_urls))})")
+            if self.state_store:
+                self.state_store.log_stats()
+            if self.checkpoint:
+                self.checkpoint.update(self.checkpoint_state, force=True)
+            headers = self.headers
             
             # 데이터 저장
             if basic_filename and detail_filename:
                 self.save_to_csv(headers, basic_filename, detail_filename)
             
+            # 정상 종료 시 체크포인트 삭제
+            if self.checkpoint:
+                self.checkpoint.clear()
+            
         except Exception as e:
             logging.error(f"크롤링 중 오류 발생: {e}")
         finally:
+            self.wait_stats.log_summary('병무청 크롤링')
+            self.network_meter.log_summary()
+            self.cleanup_drivers()
             if self.driver:
-                self.driver.quit()
+                self.driver_manager.release(self.driver)
+                self.driver = None
+            self.driver_manager.log_stats()
+            if self.basic_writer:
+                self.basic_writer.close()
+            if self.detail_spool:
+                self.detail_spool.close()
 
     def save_to_csv(self, headers, basic_filename, detail_filename):
-        """수집된 데이터 CSV 파일로 저장"""
-        if not self.job_data:
+        """기록된 기본 정보 CSV와 상세 정보 spool을 최종 CSV 파일로 저장"""
+        if not self.job_urls:
             logging.warning("저장할 데이터가 없습니다.")
             return
 
@@ -390,35 +939,31 @@ class MilitaryJobCrawler:
             os.makedirs(output_dir, exist_ok=True)
             
             # URL 중복 체크
-            urls = [row[-1] for row in self.job_data]
-            duplicate_urls = [url for url in urls if urls.count(url) > 1]
+            url_counts = Counter(self.job_urls)
+            duplicate_urls = [url for url, count in url_counts.items() if count > 1]
             if duplicate_urls:
-                logging.warning(f"기본 정보에서 중복된 URL이 {len(set(duplicate_urls))}개 발견되었습니다.")
+                logging.warning(f"기본 정보에서 중복된 URL이 {len(duplicate_urls)}개 발견되었습니다.")
             
-            # 기본 정보 저장
-            df_basic = pd.DataFrame(self.job_data, columns=headers)
-            df_basic.to_csv(basic_filename, index=False, encoding='utf-8-sig')
-            logging.info(f"기본 정보 {len(df_basic)}개가 {basic_filename}에 저장되었습니다.")
-
-            # 상세 정보 저장
-            if self.detail_info:
-                df_detail = pd.DataFrame(self.detail_info)
-                
-                # URL을 기준으로 데이터 정렬
-                df_basic_urls = df_basic['상세정보_URL'].tolist()
-                df_detail['_sort_index'] = df_detail['상세정보_URL'].map(lambda x: df_basic_urls.index(x))
-                df_detail = df_detail.sort_values('_sort_index').drop('_sort_index', axis=1)
+            # 기본 정보 저장 (수집 중 기록한 파일을 최종 위치로 이동하거나 parquet으로 변환)
+            self.basic_writer.flush()
+            self.basic_writer.close()
+            finalize_rows(self.basic_part_path, basic_filename, self.output_format)
+            logging.info(f"기본 정보 {self.basic_writer.row_count}개가 {basic_filename}에 저장되었습니다.")
+
+            # 상세 정보 저장 (기본 정보의 URL 순서대로 spool 인덱스에서 조회)
+            if len(self.detail_spool):
+                detail_count = self.detail_spool.export(detail_filename, keys=self.job_urls, fmt=self.output_format)
                 
                 # 데이터 검증
-                if len(df_basic) != len(df_detail):
-                    logging.warning(f"기본 정보({len(df_basic)}개)와 상세 정보({len(df_detail)}개)의 데이터 수가 일치하지 않습니다.")
+                if len(self.job_urls) != detail_count:
+                    logging.warning(f"기본 정보({len(self.job_urls)}개)와 상세 정보({detail_count}개)의 데이터 수가 일치하지 않습니다.")
                 
-                mismatched_urls = set(df_basic['상세정보_URL']) - set(df_detail['상세정보_URL'])
+                mismatched_urls = set(url_counts) - set(self.detail_spool.keys())
                 if mismatched_urls:
                     logging.warning(f"일치하지 않는 URL이 {len(mismatched_urls)}개 있습니다.")
                 
-                df_detail.to_csv(detail_filename, index=False, encoding='utf-8-sig')
-                logging.info(f"상세 정보 {len(df_detail)}개가 {detail_filename}에 저장되었습니다.")
+                self.detail_spool.remove()
+                logging.info(f"상세 정보 {detail_count}개가 {detail_filename}에 저장되었습니다.")
 
         except Exception as e:
             logging.error(f"데이터 저장 중 오류 발생: {e}")
@@ -427,8 +972,55 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Military Job Crawler')
     parser.add_argument('--basic-output', required=True, help='Output filename for basic job information')
     parser.add_argument('--detail-output', required=True, help='Output filename for detailed job information')
+    parser.add_argument('--detail-workers', type=int, default=2, help='Number of detail fetch workers (WebDrivers in browser mode)')
+    parser.add_argument('--parse-workers', type=int, default=1, help='Number of detail parse workers and WebDrivers for HTTP-mode browser fallback')
+    parser.add_argument('--queue-size', type=int, default=32, help='Maximum items waiting between pipeline stages')
+    parser.add_argument('--rate-limit', type=float, default=1.0, help='Maximum requests per second to the MMA host (shared by all workers)')
+    parser.add_argument('--detail-mode', choices=['http', 'browser'], default='http',
+                        help='Fetch detail pages over plain HTTP (browser fallback) or always with the browser')
+    parser.add_argument('--list-mode', choices=['direct', 'click'], default='direct',
+                        help='Request list pages by page index over HTTP (falls back to clicking) or click through the pager')
+    parser.add_argument('--list-page-size', type=int, default=100, help='Rows per list page requested in direct mode (if the form supports it)')
+    parser.add_argument('--block-types', nargs='*', choices=sorted(RESOURCE_TYPE_EXTENSIONS), default=list(DEFAULT_BLOCKED_TYPES),
+                        help='Resource types the browser should not load')
+    parser.add_argument('--block-urls', nargs='*', default=list(DEFAULT_BLOCKED_URLS),
+                        help='Extra URL wildcard patterns the browser should not load (analytics, ads, ...)')
+    parser.add_argument('--no-network-blocking', action='store_true', help='Load every browser request (baseline for the network stats)')
+    parser.add_argument('--driver-max-navigations', type=int, default=200, help='Restart a browser after this many page loads (0 to disable)')
+    parser.add_argument('--driver-max-rss-mb', type=int, default=1024, help='Restart a browser whose process tree exceeds this RSS in MB (0 to disable)')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv', help='Output file format for basic/detail information')
+    parser.add_argument('--detail-timeout', type=float, default=15, help='Seconds to wait for a detail page table in the browser')
+    parser.add_argument('--dead-letter-db', default='crawled_data/dead_letters.sqlite', help='SQLite list of detail URLs that failed after retries (empty to disable)')
+    parser.add_argument('--breaker-threshold', type=int, default=5, help='Consecutive timeouts/5xx that pause requests to a host')
+    parser.add_argument('--breaker-reset', type=float, default=30, help='Seconds to pause a failing host before a probe request')
+    parser.add_argument('--incremental', action='store_true', help='Only fetch details for new or changed postings')
+    parser.add_argument('--state-db', default='crawled_data/crawl_state.sqlite', help='SQLite posting state store used by --incremental')
+    parser.add_argument('--checkpoint', default='crawled_data/checkpoints/military_job_crawler.json', help='Checkpoint file for crawl progress')
+    parser.add_argument('--checkpoint-interval', type=int, default=10, help='Save a checkpoint every N detail pages')
+    parser.add_argument('--resume', action='store_true', help='Resume from the last checkpoint and skip completed work')
+    parser.add_argument('--archive-dir', default='crawled_data/html_archive/military', help='Append-only raw HTML archive used by reparse.py (empty to disable)')
     
     args = parser.parse_args()
+    if args.format == 'parquet':
+        require_parquet()
     
-    crawler = MilitaryJobCrawler()
-    crawler.crawl(basic_filename=args.basic_output, detail_filename=args.detail_output) 
\ No newline at end of file
+    state_store = PostingStateStore(args.state_db, source='military') if args.incremental else None
+    checkpoint = CrawlCheckpoint(args.checkpoint, interval=args.checkpoint_interval)
+    archive = HtmlArchive(args.archive_dir) if args.archive_dir else None
+    dead_letters = DeadLetterStore(args.dead_letter_db, source='military') if args.dead_letter_db else None
+    configure_breakers(failure_threshold=args.breaker_threshold, reset_timeout=args.breaker_reset)
+    driver_manager = get_driver_manager(max_navigations=args.driver_max_navigations, max_rss_mb=args.driver_max_rss_mb)
+    crawler = MilitaryJobCrawler(detail_workers=args.detail_workers, rate_limit=args.rate_limit,
+                                 detail_mode=args.detail_mode, state_store=state_store, checkpoint=checkpoint,
+                                 archive=archive, parse_workers=args.parse_workers, queue_size=args.queue_size,
+                                 list_mode=args.list_mode, list_page_size=args.list_page_size,
+                                 blocked_urls=[] if args.no_network_blocking else blocked_url_patterns(args.block_types, args.block_urls),
+                                 driver_manager=driver_manager, dead_letters=dead_letters, detail_timeout=args.detail_timeout,
+                                 output_format=args.format)
+    crawler.crawl(basic_filename=args.basic_output, detail_filename=args.detail_output, resume=args.resume)
+    if archive:
+        archive.log_stats()
+        archive.close()
+    if dead_letters:
+        dead_letters.log_stats()
+        dead_letters.close() 
\ No newline at end of file
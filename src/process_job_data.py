@@ -1,35 +1,42 @@
 import pandas as pd
+import numpy as np
 import ast
+import json
 import re
 from datetime import datetime
 import os
 import argparse
 
+from entity_resolution import assign_cluster_ids
+from table_io import OUTPUT_FORMATS, read_columns, read_table, require_parquet, write_dataframe
+
 # 컬럼 존재 여부 체크 함수
 def check_required_columns(df, required_columns, df_name="DataFrame"):
     missing = [col for col in required_columns if col not in df.columns]
     if missing:
         raise KeyError(f"{df_name}에 다음 컬럼이 없습니다: {missing}")
 
-# 파일 유효성 검사 함수 추가
-def validate_csv_file(file_path, file_type=""):
-    """CSV 파일이 유효한지 검사"""
+# 입력 파일 검사 + 필요한 컬럼만 읽기
+def load_input(file_path, required_columns, file_type="", optional_columns=()):
+    """입력 파일(CSV/parquet)의 스키마를 메타데이터(헤더)로 확인한 뒤 필요한 컬럼만 읽기
+
+    파일 전체를 시험 삼아 파싱하지 않고 parquet 메타데이터 또는 CSV 헤더 행만 확인하며,
+    required_columns가 없으면 KeyError, optional_columns는 있는 것만 함께 읽는다.
+    """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"{file_type} 파일을 찾을 수 없습니다: {file_path}")
-    
-    try:
-        # 파일이 비어있는지 확인
-        if os.path.getsize(file_path) == 0:
-            raise ValueError(f"{file_type} 파일이 비어있습니다: {file_path}")
-        
-        # CSV 읽기 시도
-        test_df = pd.read_csv(file_path, nrows=1)
-        if test_df.empty or len(test_df.columns) == 0:
-            raise ValueError(f"{file_type} 파일에 유효한 데이터가 없습니다: {file_path}")
-            
-        return True
-    except pd.errors.EmptyDataError:
-        raise ValueError(f"{file_type} 파일을 읽을 수 없습니다: {file_path}")
+    if os.path.getsize(file_path) == 0:
+        raise ValueError(f"{file_type} 파일이 비어있습니다: {file_path}")
+
+    columns = read_columns(file_path)
+    if not columns:
+        raise ValueError(f"{file_type} 파일에 유효한 데이터가 없습니다: {file_path}")
+    missing = [col for col in required_columns if col not in columns]
+    if missing:
+        raise KeyError(f"{file_type} 파일에 다음 컬럼이 없습니다: {missing}")
+
+    usecols = [col for col in dict.fromkeys([*required_columns, *optional_columns]) if col in columns]
+    return read_table(file_path, usecols)
 
 # 안전한 literal_eval
 def safe_literal_eval(val):
@@ -54,45 +61,133 @@ def safe_literal_eval(val):
         print(f"[WARNING] literal_eval 실패: {val[:50]}... - {e}")
         return []
 
-# 날짜 형식 통일 함수 추가
-def normalize_date_format(date_str):
-    """날짜 문자열을 표준 형식으로 변환"""
-    if pd.isna(date_str) or not isinstance(date_str, str) or not date_str.strip():
-        return None
-    
-    date_str = str(date_str).strip()
-    
+# 리스트 컬럼: 크롤러는 JSON 배열 문자열로 저장 (이전 CSV는 Python repr)
+KEYWORD_COLUMNS = ['담당업무', '자격사항', '우대사항']
+
+def load_list_cell(value):
+    """JSON 배열 문자열을 리스트로 변환 (JSON이 아니면 이전 형식으로 보고 safe_literal_eval 사용)"""
     try:
-        # YYYY.MM.DD 형식을 YYYY-MM-DD로 변환
-        if '.' in date_str and len(date_str) == 10:
-            # 2025.06.09 -> 2025-06-09
-            return date_str.replace('.', '-')
-        
-        # 이미 YYYY-MM-DD 형식인 경우
-        if '-' in date_str and len(date_str) == 10:
-            return date_str
-            
-        # 기타 형식 시도
-        # pandas to_datetime으로 파싱 시도
-        parsed_date = pd.to_datetime(date_str, errors='coerce')
-        if pd.notna(parsed_date):
-            return parsed_date.strftime('%Y-%m-%d')
-            
-        return None
-        
-    except Exception as e:
-        print(f"[WARNING] 날짜 형식 변환 실패: {date_str} - {e}")
-        return None
+        result = json.loads(value)
+    except (ValueError, TypeError):
+        return safe_literal_eval(value)
+    if isinstance(result, list):
+        return result
+    return [result] if isinstance(result, str) else []
+
+def combine_list_columns(df, columns):
+    """여러 리스트 컬럼의 항목을 행마다 컬럼 순서대로 이어 붙인 리스트 Series 반환
+
+    행 단위 apply 대신 stack -> explode로 항목을 한 줄로 펼친 뒤 행 경계에서 자르고, 같은 문자열은 한 번만 파싱한다.
+    """
+    columns = [col for col in columns if col in df.columns]
+    empty = pd.Series([[] for _ in range(len(df))], index=df.index, dtype=object)
+    if not columns or df.empty:
+        return empty
+    # (행, 컬럼) 순서로 쌓으면 행 안에서 컬럼 순서가 유지됨 (NaN은 제외)
+    cells = df[columns].stack().dropna()
+    cells = cells[cells.astype(str).str.strip() != '']
+    # parquet 입력은 이미 리스트(배열)이므로 문자열 셀만 파싱
+    is_text = cells.map(lambda value: isinstance(value, str))
+    unique_cells = cells[is_text].unique()
+    parsed = dict(zip(unique_cells, (load_list_cell(value) for value in unique_cells)))
+    items = cells.map(lambda value: parsed[value] if isinstance(value, str) else list(value)).explode().dropna()
+    if items.empty:
+        return empty
+    # stack 결과는 행별로 연속되어 있으므로 행이 바뀌는 위치에서 잘라 리스트로 만듦 (groupby.agg(list)보다 빠름)
+    rows = items.index.get_level_values(0)
+    starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+    chunks = np.split(items.to_numpy(), starts[1:])
+    combined = pd.Series([chunk.tolist() for chunk in chunks], index=rows[starts], dtype=object)
+    return combined.reindex(df.index).fillna(empty)
+
+def serialize_list_columns(df):
+    """리스트/dict 값이 있는 컬럼을 JSON 문자열로 변환 (CSV 저장용)"""
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        is_nested = df[col].map(lambda value: isinstance(value, (list, dict)))
+        if is_nested.any():
+            df.loc[is_nested, col] = df.loc[is_nested, col].map(lambda value: json.dumps(value, ensure_ascii=False))
+    return df
+
+# parquet 출력 스키마: 반복되는 값은 category, 날짜는 datetime, keywords_list는 문자열 리스트
+CATEGORY_COLUMNS = ['qualification_agent', 'qualification_education', 'qualification_career', 'source_type', 'status']
+DATETIME_COLUMNS = ['registration_date', 'deadline', 'update_date']
+LIST_COLUMNS = ['keywords_list']
+
+def to_string_list(value):
+    """리스트 컬럼 값을 문자열 리스트로 변환 (군무원 '비고'처럼 문자열이면 한 항목짜리 리스트)"""
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [str(item) for item in value]
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    return []
+
+def apply_output_schema(df):
+    """parquet 저장 전에 컬럼 타입 지정 (나머지 텍스트 컬럼은 string)"""
+    for col in df.columns:
+        if col in CATEGORY_COLUMNS:
+            df[col] = df[col].astype('string').astype('category')
+        elif col in DATETIME_COLUMNS:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+        elif col in LIST_COLUMNS:
+            df[col] = df[col].map(to_string_list)
+        elif df[col].dtype == object:
+            df[col] = df[col].astype('string')
+    return df
+
+# 날짜 정규화: 구분자(. / -)를 통일한 뒤 명시적 형식 하나로 컬럼 전체를 한 번에 변환
+DATE_FORMAT = '%Y-%m-%d'
+DATE_PATTERN = r'(\d{4})\s*[.\-/]\s*(\d{1,2})\s*[.\-/]\s*(\d{1,2})'
+COMPACT_DATE_PATTERN = r'^(\d{4})(\d{2})(\d{2})$'
+
+def parse_dates(values):
+    """날짜 문자열 Series(YYYY.MM.DD, YYYY-MM-DD, YYYY/MM/DD, YYYYMMDD)를 datetime64로 변환
+
+    반환값: (datetime64 Series, 값이 있었지만 변환하지 못한 개수)
+    """
+    text = values.astype('string').str.strip()
+    present = text.notna() & (text != '')
+    # 요일/시간 등 뒤에 붙은 문자열은 무시하고 첫 번째 날짜만 사용
+    parts = text.str.extract(DATE_PATTERN)
+    compact = text.str.extract(COMPACT_DATE_PATTERN)
+    parts = parts.fillna(compact)
+    normalized = parts[0] + '-' + parts[1].str.zfill(2) + '-' + parts[2].str.zfill(2)
+    parsed = pd.to_datetime(normalized, format=DATE_FORMAT, errors='coerce')
+    failed = present & parsed.isna()
+    if failed.any():
+        print(f"[WARNING] 날짜 변환 실패 {int(failed.sum())}건, 예:", text[failed].unique()[:5].tolist())
+    return parsed, int(failed.sum())
+
+def split_date_range(df, column='등록일/마감일', targets=('등록일', '마감일')):
+    """rndjob의 '등록일/마감일' 컬럼을 등록일/마감일 두 컬럼으로 분리 (이미 있으면 그대로 사용)"""
+    if column not in df.columns or all(target in df.columns for target in targets):
+        return df
+    dates = df[column].astype('string').str.extract(r'^\s*(\S+)\s+(\S+)')
+    df[targets[0]] = dates[0].fillna(df[column].astype('string').str.strip())
+    df[targets[1]] = dates[1]
+    return df
+
+def normalize_dates(df, columns):
+    """날짜 컬럼들을 datetime64로 변환하고 컬럼별 변환 실패 개수 반환"""
+    failures = {}
+    for col in columns:
+        if col not in df.columns:
+            continue
+        df[col], failures[col] = parse_dates(df[col])
+        print(f"[INFO] {col} 날짜 변환: {df[col].notna().sum()}건 성공, {failures[col]}건 실패, "
+              f"빈 값 {df[col].isna().sum() - failures[col]}건")
+    return failures
 
 def process_military_jobs(basic_file, detail_file):
     try:
-        # 파일 유효성 검사
-        validate_csv_file(basic_file, "군무원 기본")
-        validate_csv_file(detail_file, "군무원 상세")
+        # 필수 컬럼 (스키마 확인 후 이 컬럼만 읽음)
+        basic_required = ['상세정보_URL', '업체명', '채용제목', '작성일', '마감일']
+        detail_required = ['상세정보_URL', '요원형태', '최종학력', '자격요원', '주소', '담당업무', '비고']
         
         print(f"[INFO] 군무원 파일 읽기 시작...")
-        basic_df = pd.read_csv(basic_file)
-        detail_df = pd.read_csv(detail_file)
+        basic_df = load_input(basic_file, basic_required, "군무원 기본")
+        detail_df = load_input(detail_file, detail_required, "군무원 상세")
         
         print(f"[INFO] 군무원 기본 데이터: {len(basic_df)} rows, 상세 데이터: {len(detail_df)} rows")
         
@@ -105,9 +200,6 @@ def process_military_jobs(basic_file, detail_file):
             return pd.DataFrame()
         
         # 필수 컬럼 체크
-        basic_required = ['상세정보_URL', '업체명', '채용제목', '작성일', '마감일']
-        detail_required = ['상세정보_URL', '요원형태', '최종학력', '자격요원', '주소', '담당업무', '비고']
-        
         check_required_columns(basic_df, basic_required, 'military basic_df')
         check_required_columns(detail_df, detail_required, 'military detail_df')
         
@@ -135,9 +227,9 @@ def process_military_jobs(basic_file, detail_file):
         # 매핑 규칙에 따라 컬럼 할당
         final_df['company_name'] = merged_df.get('업체명', '')
         final_df['post_name'] = merged_df.get('채용제목', '')
-        # 날짜 형식 통일 적용
-        final_df['registration_date'] = merged_df['작성일'].apply(normalize_date_format) if '작성일' in merged_df.columns else ''
-        final_df['deadline'] = merged_df['마감일'].apply(normalize_date_format) if '마감일' in merged_df.columns else ''
+        # 날짜는 main()에서 전체 데이터를 한 번에 변환
+        final_df['registration_date'] = merged_df.get('작성일', '')
+        final_df['deadline'] = merged_df.get('마감일', '')
         final_df['qualification_agent'] = merged_df.get('요원형태', '')
         final_df['qualification_education'] = merged_df.get('최종학력', '')
         final_df['qualification_career'] = merged_df.get('자격요원', '')
@@ -147,8 +239,8 @@ def process_military_jobs(basic_file, detail_file):
         final_df['source_info'] = merged_df.get('상세정보_URL', '')
         final_df['source_type'] = 'military'
         
-        print("[DEBUG] Military registration_date 변환 전:", final_df['registration_date'].head(5).tolist())
-        print("[DEBUG] Military deadline 변환 전:", final_df['deadline'].head(5).tolist())
+        print("[DEBUG] Military registration_date 원본:", final_df['registration_date'].head(5).tolist())
+        print("[DEBUG] Military deadline 원본:", final_df['deadline'].head(5).tolist())
                 
         return final_df
         
@@ -160,16 +252,20 @@ def process_military_jobs(basic_file, detail_file):
 
 def process_rnd_jobs(basic_file, detail_file):
     try:
-        # 파일 유효성 검사
-        validate_csv_file(basic_file, "RND 기본")
-        validate_csv_file(detail_file, "RND 상세")
+        # 필수 컬럼 (스키마 확인 후 이 컬럼만 읽음)
+        basic_required = ['상세정보_URL', '기업명', '공고명', '등록일', '마감일']
+        detail_required = ['상세정보_URL', '고용형태', '학력', '경력', '회사_상세_주소', '모집_분야_및_인원', '담당업무', '자격사항', '우대사항']
         
         print(f"[INFO] RND 파일 읽기 시작...")
-        basic_df = pd.read_csv(basic_file)
-        detail_df = pd.read_csv(detail_file)
+        # 이전 형식의 CSV는 등록일/마감일이 한 컬럼에 있으므로 날짜 컬럼은 분리 후에 확인
+        basic_df = load_input(basic_file, basic_required[:3], "RND 기본", optional_columns=['등록일', '마감일', '등록일/마감일'])
+        detail_df = load_input(detail_file, detail_required, "RND 상세")
         
         print(f"[INFO] RND 기본 데이터: {len(basic_df)} rows, 상세 데이터: {len(detail_df)} rows")
         
+        # 등록일/마감일이 한 컬럼에 있는 이전 형식의 CSV는 두 컬럼으로 분리
+        basic_df = split_date_range(basic_df)
+        
         # 데이터가 비어있는지 확인
         if basic_df.empty:
             print("[WARNING] RND 기본 데이터가 비어있습니다.")
@@ -179,9 +275,6 @@ def process_rnd_jobs(basic_file, detail_file):
             return pd.DataFrame()
         
         # 필수 컬럼 체크
-        basic_required = ['상세정보_URL', '기업명', '공고명', '등록일', '마감일']
-        detail_required = ['상세정보_URL', '고용형태', '학력', '경력', '회사_상세_주소', '모집_분야_및_인원', '담당업무', '자격사항', '우대사항']
-        
         check_required_columns(basic_df, basic_required, 'rnd basic_df')
         check_required_columns(detail_df, detail_required, 'rnd detail_df')
         
@@ -212,29 +305,21 @@ def process_rnd_jobs(basic_file, detail_file):
         final_df = pd.DataFrame()
         final_df['company_name'] = merged_df.get('기업명', '')
         final_df['post_name'] = merged_df.get('공고명', '')
-        # 날짜 형식 통일 적용
-        final_df['registration_date'] = merged_df['등록일'].apply(normalize_date_format) if '등록일' in merged_df.columns else ''
-        final_df['deadline'] = merged_df['마감일'].apply(normalize_date_format) if '마감일' in merged_df.columns else ''
+        # 날짜는 main()에서 전체 데이터를 한 번에 변환
+        final_df['registration_date'] = merged_df.get('등록일', '')
+        final_df['deadline'] = merged_df.get('마감일', '')
         final_df['qualification_agent'] = merged_df.get('고용형태', '')
         final_df['qualification_education'] = merged_df.get('학력', '')
         final_df['qualification_career'] = merged_df.get('경력', '')
         final_df['region'] = merged_df.get('회사_상세_주소', '')
         final_df['Field'] = merged_df.get('모집_분야_및_인원', '')
         # keywords_list: detail의 3개 컬럼 합치기
-        def combine_keywords(row):
-            keywords = []
-            for col in ['담당업무', '자격사항', '우대사항']:
-                if col in row and pd.notna(row[col]):
-                    items = safe_literal_eval(row[col])
-                    if items:
-                        keywords.extend(items)
-            return keywords
-        final_df['keywords_list'] = merged_df.apply(combine_keywords, axis=1)
+        final_df['keywords_list'] = combine_list_columns(merged_df, KEYWORD_COLUMNS)
         final_df['source_info'] = merged_df.get('상세정보_URL', '')
         final_df['source_type'] = 'rndjob'
         
-        print("[DEBUG] RND registration_date 변환 전:", final_df['registration_date'].head(5).tolist())
-        print("[DEBUG] RND deadline 변환 전:", final_df['deadline'].head(5).tolist())
+        print("[DEBUG] RND registration_date 원본:", final_df['registration_date'].head(5).tolist())
+        print("[DEBUG] RND deadline 원본:", final_df['deadline'].head(5).tolist())
         
         return final_df
         
@@ -244,11 +329,59 @@ def process_rnd_jobs(basic_file, detail_file):
         traceback.print_exc()
         return pd.DataFrame()
 
-def update_job_data(new_df):
+# 증분 업데이트: source_info별 내용 해시를 이전 스냅샷과 비교
+KEY_COLUMN = 'source_info'
+HASH_COLUMN = 'content_hash'
+# cluster_id는 다른 공고에 따라 바뀔 수 있으므로 내용 해시에서 제외
+TRACKING_COLUMNS = [KEY_COLUMN, HASH_COLUMN, 'cluster_id', 'update_date', 'status']
+DELTA_STATUSES = ['new', 'updated', 'closed']
+
+def canonical_text(values):
+    """해시 계산용으로 컬럼 값을 저장 형식과 같은 문자열로 변환 (날짜는 YYYY-MM-DD, 리스트는 JSON 배열)"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.dt.strftime(DATE_FORMAT).fillna('')
+    if values.dtype == object:
+        values = values.map(lambda value: json.dumps([str(item) for item in value], ensure_ascii=False)
+                            if isinstance(value, (list, tuple, np.ndarray)) else value)
+    return values.astype('string').fillna('')
+
+def content_hashes(df):
+    """추적 컬럼을 제외한 내용 컬럼으로 행별 64비트 해시(16자리 hex) 계산"""
+    columns = sorted(col for col in df.columns if col not in TRACKING_COLUMNS)
+    canonical = pd.DataFrame({col: canonical_text(df[col]) for col in columns}, index=df.index)
+    hashes = pd.util.hash_pandas_object(canonical, index=False)
+    return hashes.map('{:016x}'.format)
+
+def load_previous(file_path):
+    """이전 처리 결과(스냅샷) 읽기 (없거나 읽을 수 없으면 None)"""
+    if not file_path or not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        return None
+    try:
+        columns = read_columns(file_path)
+        if KEY_COLUMN not in columns:
+            print(f"[WARNING] 이전 스냅샷에 '{KEY_COLUMN}' 컬럼이 없어 비교하지 않습니다: {file_path}")
+            return None
+        previous_df = read_table(file_path, dtype={KEY_COLUMN: str, HASH_COLUMN: str})
+    except Exception as e:
+        print(f"[WARNING] 이전 스냅샷 읽기 실패 ({file_path}): {e}")
+        return None
+    # parquet의 category 컬럼에는 새 상태 값을 넣을 수 없으므로 일반 컬럼으로 변환
+    for col in previous_df.columns:
+        if isinstance(previous_df[col].dtype, pd.CategoricalDtype):
+            previous_df[col] = previous_df[col].astype(object)
+    print(f"[INFO] 이전 스냅샷: {len(previous_df)} rows ({file_path})")
+    return previous_df
+
+def update_job_data(new_df, previous_df=None):
+    """이전 스냅샷과 source_info 기준으로 비교하여 new/updated/unchanged/closed 상태 지정
+
+    행마다 내용 해시를 계산해 source_info로 이전 해시와 맞춰 보므로(해시 조인) 행 수에 비례하는 시간에 끝난다.
+    이번에 수집되지 않은 이전 공고는 closed로 남기며, 반환값은 (전체 스냅샷, 변경분) 이다.
+    """
     try:
         if new_df.empty:
             print("[WARNING] 업데이트할 새 데이터가 없습니다.")
-            return pd.DataFrame()
+            return pd.DataFrame(), pd.DataFrame()
         
         # 필수 컬럼 확인
         for col in ['company_name', 'post_name', 'source_info']:
@@ -256,19 +389,78 @@ def update_job_data(new_df):
                 print(f"[WARNING] '{col}' 컬럼이 new_df에 없습니다. 빈 컬럼 추가.")
                 new_df[col] = ''
         
+        duplicated = new_df[KEY_COLUMN].duplicated(keep='last')
+        if duplicated.any():
+            print(f"[WARNING] 같은 source_info가 중복된 행 {int(duplicated.sum())}건은 마지막 행만 사용합니다.")
+            new_df = new_df[~duplicated].reset_index(drop=True)
+        
         current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        new_df[HASH_COLUMN] = content_hashes(new_df)
         
-        # 모든 데이터를 신규로 처리
-        new_df['update_date'] = current_time
-        new_df['status'] = 'new'
+        if previous_df is None or previous_df.empty:
+            # 비교할 이전 데이터가 없으면 모두 신규
+            new_df['update_date'] = current_time
+            new_df['status'] = 'new'
+            return new_df, new_df
         
-        return new_df
+        previous_df = previous_df.drop_duplicates(KEY_COLUMN, keep='last').reset_index(drop=True)
+        if HASH_COLUMN in previous_df.columns and previous_df[HASH_COLUMN].notna().all():
+            previous_hashes = previous_df[HASH_COLUMN]
+        else:
+            # 해시 컬럼이 없는 이전 형식의 스냅샷은 같은 방식으로 다시 계산
+            previous_hashes = content_hashes(previous_df)
+        previous_keys = previous_df[KEY_COLUMN]
+        previous_status = previous_df.get('status', pd.Series('new', index=previous_df.index))
+        
+        old_hash = new_df[KEY_COLUMN].map(pd.Series(previous_hashes.values, index=previous_keys.values))
+        old_status = new_df[KEY_COLUMN].map(pd.Series(previous_status.values, index=previous_keys.values))
+        old_update = new_df[KEY_COLUMN].map(pd.Series(previous_df.get('update_date', pd.Series(pd.NA, index=previous_df.index)).values,
+                                                      index=previous_keys.values))
+        
+        # 닫혔던 공고가 다시 올라오면 updated
+        status = np.select([old_hash.isna(), (old_hash == new_df[HASH_COLUMN]) & (old_status != 'closed')],
+                           ['new', 'unchanged'], default='updated')
+        new_df['update_date'] = current_time
+        new_df['status'] = status
+        unchanged = new_df['status'] == 'unchanged'
+        new_df.loc[unchanged, 'update_date'] = old_update[unchanged].fillna(current_time).astype(str)
+        
+        # 이번에 수집되지 않은 공고는 closed (이미 closed였던 공고는 날짜를 유지하고 변경분에서 제외)
+        missing = previous_df[~previous_keys.isin(new_df[KEY_COLUMN])].copy()
+        missing[HASH_COLUMN] = previous_hashes[missing.index]
+        newly_closed = missing.get('status', pd.Series('new', index=missing.index)) != 'closed'
+        missing['status'] = 'closed'
+        missing.loc[newly_closed, 'update_date'] = current_time
+        # 이전 CSV의 날짜 문자열은 이번 데이터와 같이 datetime으로 맞춤
+        for col in ['registration_date', 'deadline']:
+            if col in missing.columns and not pd.api.types.is_datetime64_any_dtype(missing[col]):
+                missing[col] = pd.to_datetime(missing[col], format=DATE_FORMAT, errors='coerce')
+        missing = missing.reindex(columns=new_df.columns)
+        
+        snapshot = pd.concat([new_df, missing], ignore_index=True)
+        delta = pd.concat([new_df[new_df['status'].isin(DELTA_STATUSES)], missing[newly_closed]], ignore_index=True)
+        print(f"[INFO] 변경분: {len(delta)} rows (이전 스냅샷 {len(previous_df)} rows와 비교)")
+        return snapshot, delta
             
     except Exception as e:
         print(f"[ERROR] update_job_data 예외: {e}")
         import traceback
         traceback.print_exc()
-        return new_df
+        new_df['update_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        new_df['status'] = 'new'
+        return new_df, new_df
+
+def write_output(df, file_path, output_format):
+    """처리 결과를 CSV 또는 parquet으로 저장"""
+    if output_format == 'parquet':
+        write_dataframe(apply_output_schema(df.copy()), file_path, list_columns=LIST_COLUMNS)
+    else:
+        # keywords_list 등 리스트 컬럼은 JSON 배열로 저장
+        serialize_list_columns(df.copy()).to_csv(file_path, index=False, encoding='utf-8-sig')
+
+def default_delta_path(output_path):
+    root, ext = os.path.splitext(output_path)
+    return f"{root}_delta{ext}"
 
 def main():
     parser = argparse.ArgumentParser(description='Process job data from crawled files')
@@ -276,9 +468,18 @@ def main():
     parser.add_argument('--military-detail', required=True, help='Path to military jobs detail CSV file')
     parser.add_argument('--rnd-basic', required=True, help='Path to RND jobs basic CSV file')
     parser.add_argument('--rnd-detail', required=True, help='Path to RND jobs detail CSV file')
-    parser.add_argument('--output', required=True, help='Path to output processed CSV file')
+    parser.add_argument('--output', required=True, help='Path to output processed CSV or parquet file')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv',
+                        help='Output format; parquet keeps dates, categories and keyword lists typed (requires pyarrow)')
+    parser.add_argument('--dedup-threshold', type=float, default=0.5,
+                        help='Minimum post_name bigram similarity for postings of the same company on different sites to share a cluster_id')
+    parser.add_argument('--previous', help='Previous processed snapshot to diff against (default: the existing --output file)')
+    parser.add_argument('--delta-output', help='Path for rows that are new, updated or closed since the previous snapshot '
+                                               '(default: <output>_delta with the same extension)')
     
     args = parser.parse_args()
+    if args.format == 'parquet':
+        require_parquet()
     
     all_dataframes = []
     
@@ -309,29 +510,33 @@ def main():
     combined_df = pd.concat(all_dataframes, ignore_index=True)
     print(f"[INFO] 전체 데이터 합계: {len(combined_df)} rows")
     
-    # 날짜 형식 변환 - 이미 normalize_date_format으로 처리되어 표준 형식이므로 직접 변환
-    for date_col in ['registration_date', 'deadline']:
-        if date_col in combined_df.columns:
-            print(f"[DEBUG] {date_col} 변환 전 샘플:", combined_df[date_col].head().tolist())
-            print(f"[DEBUG] {date_col} 변환 전 데이터 타입:", combined_df[date_col].dtype)
-            
-            # None 값을 NaT로 변환하고, 유효한 날짜 문자열만 datetime으로 변환
-            combined_df[date_col] = pd.to_datetime(combined_df[date_col], errors='coerce')
-            print(f"[DEBUG] {date_col} 변환 후 샘플 (처음 5개):", combined_df[date_col].head().tolist())
-            print(f"[DEBUG] {date_col} null 개수:", combined_df[date_col].isnull().sum())
+    # 날짜 형식 변환 (두 소스의 형식을 한 번에 datetime64로 변환)
+    date_failures = normalize_dates(combined_df, ['registration_date', 'deadline'])
+    if any(date_failures.values()):
+        print(f"[WARNING] 날짜 변환 실패 합계: {sum(date_failures.values())}건 {date_failures}")
+    
+    # 소스 간 중복 공고 연결 (회사명 정규화 + LSH 후보 탐색, 같은 공고는 같은 cluster_id)
+    try:
+        combined_df['cluster_id'] = assign_cluster_ids(combined_df, args.dedup_threshold)
+    except Exception as e:
+        print(f"[ERROR] 중복 탐지 실패: {e}")
     
-    # 업데이트 처리
+    # 업데이트 처리 (이전 스냅샷은 결과 파일을 덮어쓰기 전에 읽음)
+    previous_df = load_previous(args.previous or args.output)
     try:
-        final_df = update_job_data(combined_df)
+        final_df, delta_df = update_job_data(combined_df, previous_df)
     except Exception as e:
         print(f"[ERROR] update_job_data 처리 실패: {e}")
-        final_df = combined_df
+        final_df, delta_df = combined_df, combined_df
     
     # 파일 저장
     try:
         if not final_df.empty:
-            final_df.to_csv(args.output, index=False, encoding='utf-8-sig')
+            write_output(final_df, args.output, args.format)
             print(f"[INFO] 데이터 저장 완료: '{args.output}'")
+            delta_output = args.delta_output or default_delta_path(args.output)
+            write_output(delta_df, delta_output, args.format)
+            print(f"[INFO] 변경분 저장 완료: '{delta_output}' ({len(delta_df)} rows)")
             
             # 상태 통계 출력
             if 'status' in final_df.columns:
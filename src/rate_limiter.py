@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """토큰 버킷 방식의 요청 속도 제한 (스레드 안전)"""
+    def __init__(self, rate=1.0, burst=1):
+        self.rate = float(rate)  # 초당 허용 요청 수
+        self.burst = max(1, int(burst))  # 한 번에 몰아서 보낼 수 있는 최대 요청 수
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """토큰 하나를 예약하고 대기해야 하는 시간(초)을 반환"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            # 토큰이 음수이면 부족한 만큼 미래 슬롯을 예약한 것
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """토큰을 얻을 때까지 대기하고 실제 대기 시간을 반환"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class HostRateLimiter:
+    """호스트별 토큰 버킷 관리 (여러 워커가 하나의 예산을 공유)"""
+    def __init__(self, rate=1.0, burst=1, stats=None):
+        self.rate = rate
+        self.burst = burst
+        self.stats = stats  # 대기 시간을 기록할 WaitStats (None이면 기록하지 않음)
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def get_bucket(self, url):
+        """URL의 호스트에 해당하는 토큰 버킷 반환"""
+        host = urlparse(url).netloc or url
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self.buckets[host] = bucket
+            return bucket
+
+    def wait(self, url):
+        """해당 호스트로 요청을 보내도 될 때까지 대기"""
+        if not self.rate or self.rate <= 0:
+            return 0.0
+        delay = self.get_bucket(url).acquire()
+        if self.stats:
+            self.stats.add('rate_limit', delay)
+        return delay
+
+    async def wait_async(self, url):
+        """asyncio 코루틴에서 사용하는 wait (이벤트 루프를 막지 않음)"""
+        if not self.rate or self.rate <= 0:
+            return 0.0
+        delay = self.get_bucket(url).reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.stats:
+            self.stats.add('rate_limit', delay)
+        return delay
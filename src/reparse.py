@@ -0,0 +1,206 @@
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from lxml import html as lxml_html
+
+from html_archive import ArchiveReader, url_key
+from html_parser import available_backends
+from row_writer import CsvRowWriter, JsonlSpool, finalize_rows
+from table_io import OUTPUT_FORMATS, require_parquet
+
+RNDJOB_LIST_URL = "https://www.rndjob.or.kr/info/sp_rsch.asp"
+
+# 워커 프로세스마다 한 번만 만드는 아카이브 reader와 크롤러 (파서 재사용)
+worker = {}
+
+
+def init_worker(source, archive_dir, run_id, parser_backend=None):
+    """워커 프로세스 초기화 (크롤러는 파싱에만 사용하며 네트워크 요청을 보내지 않음)"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    reader = ArchiveReader(archive_dir)
+    pages = reader.latest(run_id)
+    if source == 'rndjob':
+        from rndjob_job_crawler import RndJobCrawler
+        crawler = RndJobCrawler(parser_backend=parser_backend)
+        crawler.use_archive_pages(reader, pages)
+    else:
+        from military_job_crawler import MilitaryJobCrawler
+        crawler = MilitaryJobCrawler()
+    worker.update(reader=reader, pages=pages, crawler=crawler)
+
+
+def read_page(url):
+    entry = worker['pages'].get(url_key(url))
+    if entry is None:
+        return None, None
+    return worker['reader'].read(entry)
+
+
+def parse_rndjob_list(url):
+    """rndjob 목록 페이지의 행 파싱 (헤더는 워커마다 처음 한 번만 읽음)"""
+    _, html = read_page(url)
+    if html is None:
+        logging.warning(f"아카이브에 목록 페이지가 없습니다: {url}")
+        return []
+    crawler = worker['crawler']
+    return crawler.get_board_rows(crawler.parse_html(html))
+
+
+def parse_rndjob_detail(url):
+    _, html = read_page(url)
+    if html is None:
+        return None
+    crawler = worker['crawler']
+    detail_info = crawler.parse_job_detail(crawler.parse_html(html), url)
+    detail_info['상세정보_URL'] = url
+    return detail_info
+
+
+def parse_military_list(entry):
+    """병무청 목록 페이지의 (헤더, 행) 파싱"""
+    header, html = worker['reader'].read(entry)
+    tree = lxml_html.fromstring(html, base_url=header.get('base_url') or header['url'])
+    return worker['crawler'].get_job_list(tree)
+
+
+def parse_military_detail(url):
+    _, content = read_page(url)
+    if content is None:
+        return None
+    return worker['crawler'].parse_job_detail_html(content, url)
+
+
+class Reparser:
+    """아카이브에 저장된 원본 HTML로 기본/상세 정보 CSV를 다시 생성 (파싱은 CPU 코어 수만큼 병렬)"""
+    def __init__(self, source, archive_dir=None, run_id=None, workers=None, parser_backend=None, output_format='csv'):
+        self.source = source
+        self.output_format = output_format
+        self.parser_backend = parser_backend
+        self.archive_dir = archive_dir or f"crawled_data/html_archive/{source}"
+        self.reader = ArchiveReader(self.archive_dir)
+        runs = self.reader.runs()
+        if not runs:
+            raise ValueError(f"아카이브에 기록된 페이지가 없습니다: {self.archive_dir}")
+        self.run_id = run_id if run_id is not None else runs[-1]
+        if self.run_id not in runs:
+            raise ValueError(f"아카이브에 실행 {self.run_id}가 없습니다. (기록된 실행: {runs})")
+        self.workers = workers or os.cpu_count() or 1
+        # 부모 프로세스에서도 목록 페이지 구성을 확인하기 위해 URL별 마지막 레코드를 사용
+        self.pages = self.reader.latest(self.run_id)
+
+    def run(self, basic_filename, detail_filename):
+        started = time.perf_counter()
+        logging.info(f"reparse 시작: {self.source}, 실행 {self.run_id} ({time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.run_id))}), "
+                     f"워커 {self.workers}개")
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                 initargs=(self.source, self.archive_dir, self.run_id, self.parser_backend)) as executor:
+            if self.source == 'rndjob':
+                headers, rows, columns, basic_rows = self.parse_rndjob_lists(executor)
+                detail_fn = parse_rndjob_detail
+            else:
+                headers, rows, columns, basic_rows = self.parse_military_lists(executor)
+                detail_fn = parse_military_detail
+            if not headers:
+                logging.error("아카이브에서 목록 페이지를 찾을 수 없습니다.")
+                return
+
+            basic_writer = CsvRowWriter(f"{basic_filename}.part", columns)
+            basic_writer.write_rows(basic_rows)
+            basic_writer.close()
+            finalize_rows(basic_writer.path, basic_filename, self.output_format)
+            logging.info(f"기본 정보 {basic_writer.row_count}개가 {basic_filename}에 저장되었습니다.")
+
+            urls = [row[-1] for row in rows if row[-1]]
+            unique_urls = list(dict.fromkeys(urls))
+            spool = JsonlSpool(f"{detail_filename}.spool.jsonl")
+            missing = 0
+            chunksize = max(1, len(unique_urls) // (self.workers * 4))
+            for url, detail in zip(unique_urls, executor.map(detail_fn, unique_urls, chunksize=chunksize)):
+                if detail is None:
+                    missing += 1
+                    continue
+                spool.write(detail)
+            if missing:
+                logging.warning(f"아카이브에 없는 상세 페이지 {missing}건은 제외되었습니다.")
+
+        # 병무청은 기본 정보 URL 순서대로, rndjob은 수집 순서대로 내보냄 (크롤러의 save_to_csv와 동일)
+        detail_count = spool.export(detail_filename, keys=urls if self.source == 'military' else None,
+                                    fmt=self.output_format)
+        spool.remove()
+        logging.info(f"상세 정보 {detail_count}개가 {detail_filename}에 저장되었습니다.")
+        logging.info(f"reparse 완료: {time.perf_counter() - started:.1f}초")
+
+    def parse_rndjob_lists(self, executor):
+        """첫 페이지의 페이지네이션으로 목록 페이지를 구성하고 병렬로 파싱"""
+        entry = self.pages.get(url_key(RNDJOB_LIST_URL))
+        if entry is None:
+            return None, [], [], []
+        _, html = self.reader.read(entry)
+        from rndjob_job_crawler import RndJobCrawler
+        crawler = RndJobCrawler(parser_backend=self.parser_backend)
+        doc = crawler.parse_html(html)
+        headers = crawler.get_board_headers(doc)
+        page_urls = [f"{RNDJOB_LIST_URL}?page={page_num}" for page_num in crawler.get_pagination_info(doc)]
+
+        rows, basic_rows = [], []
+        for page_rows in executor.map(parse_rndjob_list, page_urls):
+            rows.extend(page_rows)
+            basic_rows.extend(crawler.to_basic_record(headers, row) for row in page_rows)
+        return headers, rows, crawler.get_basic_columns(headers), basic_rows
+
+    def parse_military_lists(self, executor):
+        """이번 실행에서 기록한 목록 페이지를 수집 순서대로 (페이지 번호 중복 없이) 병렬로 파싱"""
+        list_entries = []
+        seen_pages = set()
+        for entry in self.reader.entries():
+            if entry.run_id != self.run_id or entry.kind != 'list':
+                continue
+            header, _ = self.reader.read(entry)
+            if header.get('page') in seen_pages:
+                continue
+            seen_pages.add(header.get('page'))
+            list_entries.append(entry)
+
+        headers, rows = None, []
+        for page_headers, page_rows in executor.map(parse_military_list, list_entries):
+            if not page_headers or not page_rows:
+                continue
+            headers = headers or page_headers
+            rows.extend(page_rows)
+        return headers, rows, headers, rows
+
+    def close(self):
+        self.reader.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Rebuild crawler CSVs from the raw HTML archive')
+    parser.add_argument('source', choices=['rndjob', 'military'], help='Which crawler archive to reparse')
+    parser.add_argument('--basic-output', help='Output filename for basic job information')
+    parser.add_argument('--detail-output', help='Output filename for detailed job information')
+    parser.add_argument('--archive-dir', help='Archive directory (default: crawled_data/html_archive/<source>)')
+    parser.add_argument('--run', type=float, help='Run id to rebuild (default: the latest run)')
+    parser.add_argument('--workers', type=int, help='Number of parser processes (default: CPU count)')
+    parser.add_argument('--parser', choices=available_backends(), default='lxml', help='HTML parser backend for rndjob pages')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv', help='Output file format for the rebuilt files')
+    parser.add_argument('--list-runs', action='store_true', help='List archived run ids and exit')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.format == 'parquet':
+        require_parquet()
+
+    reparser = Reparser(args.source, archive_dir=args.archive_dir, run_id=args.run, workers=args.workers,
+                        parser_backend=args.parser, output_format=args.format)
+    if args.list_runs:
+        for run_id in reparser.reader.runs():
+            print(f"{run_id}\t{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(run_id))}")
+    elif not args.basic_output or not args.detail_output:
+        parser.error('--basic-output and --detail-output are required')
+    else:
+        reparser.run(args.basic_output, args.detail_output)
+    reparser.close()
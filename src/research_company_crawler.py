@@ -1,14 +1,25 @@
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
-import time
 from datetime import datetime
 import os
 import re
 import logging
+import argparse
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from http_client import get_client
+from table_io import OUTPUT_FORMATS, require_parquet, records_to_table, write_parquet
+from rate_limiter import HostRateLimiter
+from wait_stats import WaitStats
+from company_info import get_company_info_url, fetch_company_info
+from company_cache import CompanyCache
+from http_cache import HttpCache
+from html_parser import get_backend, available_backends
 
 class ResearchCompanyCrawler:
-    def __init__(self):
+    def __init__(self, company_cache=None, workers=4, rate_limit=2.0, parser_backend=None):
         self.base_url = "https://www.rndjob.or.kr/info/sp_rsch_comp.asp"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -17,37 +28,51 @@ class ResearchCompanyCrawler:
         self.total_count = 0
         self.current_page_list = 1
         self.columns = []
+        self.http = get_client()  # keep-alive 연결을 재사용하는 공용 HTTP 클라이언트
+        # 회사 ID(jsno)별 회사 상세 정보 캐시 (rndjob_job_crawler.py와 공유)
+        self.company_cache = company_cache
+        # 상세 정보 워커 풀과 목록 페이지 선반입 풀을 분리 (상세 요청이 미리 넣은 목록 요청 뒤에 밀리지 않도록)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        self.list_executor = ThreadPoolExecutor(max_workers=1)
+        self.list_prefetch = 2  # 처리 중인 페이지 외에 미리 받아 둘 목록 페이지 수 (메모리에 보관하는 HTML 수 제한)
+        # 호스트별 요청 속도 제한 (sleep 대신 사용)
+        self.wait_stats = WaitStats()  # 요청 속도 제한으로 대기한 시간 (크롤링 종료 시 작업 시간과 비교하여 출력)
+        self.rate_limiter = HostRateLimiter(rate=rate_limit, stats=self.wait_stats)
+        # HTML 파서 백엔드 (lxml 기본), 선택자는 처음 사용할 때 한 번만 컴파일
+        self.parser = get_backend(parser_backend)
         
         # 로깅 설정
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+    def fetch_page_text(self, url):
+        """요청 속도 제한을 지켜 페이지 HTML 가져오기"""
+        self.rate_limiter.wait(url)
+        return self.http.get_text(url, headers=self.headers)
+
     def get_page_content(self, url):
         """페이지 내용 가져오기"""
-        try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            return BeautifulSoup(response.text, 'html.parser')
-        except Exception as e:
-            print(f"페이지 접근 중 오류 발생: {e}")
-            return None
-
-    def get_total_count(self, soup):
+        html = self.fetch_page_text(url)
+        return self.parser.parse(html) if html else None
+
+    def get_total_count(self, doc):
         """전체 기업 수 가져오기"""
-        mark_box = soup.find('div', class_='mark_box')
-        if mark_box:
-            sel_box = mark_box.find('div', class_='sel_box')
-            if sel_box:
-                count_text = sel_box.find('span').text.strip()
+        p = self.parser
+        mark_box = p.select_first(doc, 'div.mark_box')
+        if mark_box is not None:
+            sel_box = p.select_first(mark_box, 'div.sel_box')
+            if sel_box is not None:
+                count_text = p.text(p.select_first(sel_box, 'span')).strip()
                 return int(re.sub(r'[^0-9]', '', count_text))
         return 0
 
-    def get_table_columns(self, soup):
+    def get_table_columns(self, doc):
         """테이블 컬럼명 가져오기"""
-        board_list = soup.find('table', class_='board_list')
-        if board_list:
-            thead = board_list.find('thead')
-            if thead:
-                columns = [th.text.strip() for th in thead.find_all('th')]
+        p = self.parser
+        board_list = p.select_first(doc, 'table.board_list')
+        if board_list is not None:
+            thead = p.select_first(board_list, 'thead')
+            if thead is not None:
+                columns = [p.text(th).strip() for th in p.select(thead, 'th')]
                 # 상세정보 URL 컬럼 추가
                 columns.append('상세정보_URL')
                 return columns
@@ -58,96 +83,95 @@ class ResearchCompanyCrawler:
         detail_info = {}
         
         # 상세 정보 URL 생성
-        detail_url = f"https://www.rndjob.or.kr/info/company_info.asp?jsno={company_id}"
-        detail_info['상세정보_URL'] = detail_url
+        detail_info['상세정보_URL'] = get_company_info_url(company_id)
         
-        # 상세 페이지 접근
-        detail_soup = self.get_page_content(detail_url)
-        if detail_soup:
-            # 상세 정보 수집
-            info_dls = detail_soup.find_all('dl', class_='info_dl')
-            for dl in info_dls:
-                for dt, dd in zip(dl.find_all('dt'), dl.find_all('dd')):
-                    key = f"상세_{dt.text.strip()}"
-                    value = dd.text.strip()
-                    detail_info[key] = value
-            
+        # 상세 페이지 접근 및 상세 정보 수집
+        company_info = fetch_company_info(company_id, prefix='상세_', client=self.http, headers=self.headers,
+                                          cache=self.company_cache, rate_limiter=self.rate_limiter, parser=self.parser)
+        if company_info is not None:
+            detail_info.update(company_info)
             logging.info(f"회사 ID {company_id}의 상세 정보 수집 완료")
-        else:
-            logging.error(f"회사 ID {company_id}의 상세 정보 수집 실패")
         
         return detail_info
 
-    def get_company_rows(self, soup):
+    def get_company_rows(self, doc):
         """기업 정보 행 가져오기"""
+        p = self.parser
         rows = []
-        board_list = soup.find('table', class_='board_list')
-        if board_list:
-            tbody = board_list.find('tbody')
-            if tbody:
-                for tr in tbody.find_all('tr'):
+        company_ids = []
+        board_list = p.select_first(doc, 'table.board_list')
+        if board_list is not None:
+            tbody = p.select_first(board_list, 'tbody')
+            if tbody is not None:
+                for tr in p.select(tbody, 'tr'):
                     row_data = {}
                     
                     # 기본 정보 수집
-                    for idx, td in enumerate(tr.find_all('td')):
+                    for idx, td in enumerate(p.select(tr, 'td')):
                         column_name = self.columns[idx] if idx < len(self.columns) else f'Column_{idx}'
                         
                         # span 안에 또 다른 span이 있는 경우
-                        nested_spans = td.find_all('span', recursive=False)
+                        nested_spans = p.select(td, '> span')
                         if nested_spans:
                             cell_data = []
                             for span in nested_spans:
-                                inner_spans = span.find_all('span')
+                                inner_spans = p.select(span, 'span')
                                 if inner_spans:
-                                    cell_data.extend([s.text.strip() for s in inner_spans])
+                                    cell_data.extend([p.text(s).strip() for s in inner_spans])
                                 else:
-                                    cell_data.append(span.text.strip())
+                                    cell_data.append(p.text(span).strip())
                             row_data[column_name] = ' '.join(cell_data)
                         else:
                             # 일반적인 span 처리
-                            span = td.find('span')
-                            row_data[column_name] = span.text.strip() if span else td.text.strip()
-                    
-                    # 상세 정보 링크 찾기 및 회사 ID 추출
-                    apply_td = tr.find('td', class_='apply')
-                    if apply_td:
-                        a_tag = apply_td.find('a')
-                        if a_tag and 'href' in a_tag.attrs:
-                            href = a_tag['href']
-                            # JavaScript 함수에서 회사 ID 추출
-                            match = re.search(r"info_pop_open\('([^']+)'\)", href)
-                            if match:
-                                company_id = match.group(1)
-                                # 상세 정보 수집
-                                detail_info = self.get_company_detail_info(company_id)
-                                # 기본 정보와 상세 정보 병합
-                                row_data.update(detail_info)
-                                
-                                logging.info(f"회사 ID {company_id}의 정보 수집 완료")
+                            span = p.select_first(td, 'span')
+                            row_data[column_name] = p.text(span).strip() if span is not None else p.text(td).strip()
                     
                     rows.append(row_data)
-                    time.sleep(1)  # 서버 부하 방지
+                    company_ids.append(self.get_company_id(tr))
+        
+        # 상세 정보는 워커 풀에서 동시에 수집하고 행 순서대로 병합 (요청 간격은 rate_limiter가 조절)
+        detail_infos = self.executor.map(
+            lambda company_id: self.get_company_detail_info(company_id) if company_id else {}, company_ids)
+        for row_data, company_id, detail_info in zip(rows, company_ids, detail_infos):
+            # 기본 정보와 상세 정보 병합
+            row_data.update(detail_info)
+            if company_id:
+                logging.info(f"회사 ID {company_id}의 정보 수집 완료")
         
         return rows
 
-    def get_pagination_info(self, soup):
+    def get_company_id(self, tr):
+        """상세 정보 링크의 JavaScript 함수에서 회사 ID 추출"""
+        p = self.parser
+        apply_td = p.select_first(tr, 'td.apply')
+        if apply_td is not None:
+            a_tag = p.select_first(apply_td, 'a')
+            if a_tag is not None and p.attr(a_tag, 'href') is not None:
+                match = re.search(r"info_pop_open\('([^']+)'\)", p.attr(a_tag, 'href'))
+                if match:
+                    return match.group(1)
+        return None
+
+    def get_pagination_info(self, doc):
         """페이지네이션 정보 가져오기"""
-        pagination = soup.find('div', class_='pagination')
-        if not pagination:
+        p = self.parser
+        pagination = p.select_first(doc, 'div.pagination')
+        if pagination is None:
             return [], False
 
         pages = []
         has_next = False
 
         # 현재 페이지와 일반 페이지 번호 수집
-        for a_tag in pagination.find_all('a'):
-            if 'page-arrow r1' in a_tag.get('class', []):
+        for a_tag in p.select(pagination, 'a'):
+            classes = p.classes(a_tag)
+            if 'page-arrow r1' in classes:
                 has_next = True  # 다음 페이지 목록 버튼이 있는지 확인
-            elif 'active' in a_tag.get('class', []):
-                current_page = int(a_tag.text.strip())
+            elif 'active' in classes:
+                current_page = int(p.text(a_tag).strip())
                 pages.append(current_page)
-            elif not a_tag.get('class'):
-                pages.append(int(a_tag.text.strip()))
+            elif not classes:
+                pages.append(int(p.text(a_tag).strip()))
 
         return sorted(pages), has_next
 
@@ -156,18 +180,47 @@ class ResearchCompanyCrawler:
         total_pages = (self.total_count + 49) // 50  # 한 페이지당 50개 항목
         return range(1, total_pages + 1)
 
+    def get_page_url(self, page_num):
+        return f"{self.base_url}?page={page_num}&page_size=50&ODBY=C&BIZC=&BIZF="
+
+    def iter_page_docs(self, first_doc, all_pages):
+        """목록 페이지를 순서대로 (페이지 번호, 문서)로 반환
+
+        첫 페이지는 이미 파싱한 문서를 그대로 사용하고, 나머지는 list_prefetch개까지만 미리 요청하여
+        현재 페이지의 상세 정보를 수집하는 동안 다음 페이지를 받아 둔다.
+        """
+        if not all_pages:
+            return
+        remaining = iter(all_pages[1:])
+        pending = deque()
+
+        def prefetch():
+            while len(pending) < self.list_prefetch:
+                page_num = next(remaining, None)
+                if page_num is None:
+                    return
+                pending.append((page_num, self.list_executor.submit(self.fetch_page_text, self.get_page_url(page_num))))
+
+        prefetch()
+        yield all_pages[0], first_doc
+        while pending:
+            page_num, future = pending.popleft()
+            prefetch()
+            page_html = future.result()
+            yield page_num, self.parser.parse(page_html) if page_html else None
+
     def crawl(self):
         """크롤링 실행"""
         logging.info("크롤링 시작...")
+        self.wait_stats.reset()
         
         # 첫 페이지에서 전체 기업 수와 컬럼명 가져오기
-        first_url = f"{self.base_url}?page=1&page_size=50&ODBY=C&BIZC=&BIZF="
-        soup = self.get_page_content(first_url)
-        if not soup:
+        doc = self.get_page_content(self.get_page_url(1))
+        if doc is None:
             return
 
-        self.total_count = self.get_total_count(soup)
-        self.columns = self.get_table_columns(soup)
+        self.total_count = self.get_total_count(doc)
+        self.columns = self.get_table_columns(doc)
         
         logging.info(f"전체 기업 수: {self.total_count}")
         logging.info(f"기본 컬럼: {self.columns}")
@@ -175,30 +228,30 @@ class ResearchCompanyCrawler:
         # 전체 페이지 번호 계산
         all_pages = self.get_all_pages()
         
-        for page_num in all_pages:
-            if len(self.company_data) >= self.total_count:
-                break
-                
-            logging.info(f"페이지 {page_num} 크롤링 중... (현재 {len(self.company_data)}/{self.total_count})")
-            page_url = f"{self.base_url}?page={page_num}&page_size=50&ODBY=C&BIZC=&BIZF="
-            page_soup = self.get_page_content(page_url)
-            
-            if page_soup:
-                rows = self.get_company_rows(page_soup)
-                self.company_data.extend(rows)
-
-            # 10페이지마다 추가 딜레이
-            if page_num % 10 == 0:
-                logging.info(f"=== 페이지 {page_num}까지 완료. 잠시 대기... ===")
-                time.sleep(3)
+        try:
+            for page_num, page_doc in self.iter_page_docs(doc, all_pages):
+                if len(self.company_data) >= self.total_count:
+                    break
+                    
+                logging.info(f"페이지 {page_num} 크롤링 중... (현재 {len(self.company_data)}/{self.total_count})")
+                if page_doc is not None:
+                    rows = self.get_company_rows(page_doc)
+                    self.company_data.extend(rows)
+        finally:
+            self.list_executor.shutdown(wait=True, cancel_futures=True)
+            self.executor.shutdown(wait=True, cancel_futures=True)
 
         # 전체 기업 수에 맞게 데이터 자르기
         self.company_data = self.company_data[:self.total_count]
         
         logging.info(f"크롤링 완료! 총 {len(self.company_data)}개의 기업 정보를 수집했습니다.")
+        self.wait_stats.log_summary('연구소 기업 크롤링')
+        self.http.log_stats()
+        if self.company_cache:
+            self.company_cache.log_stats()
 
-    def save_to_csv(self):
-        """수집된 데이터 CSV 파일로 저장"""
+    def save_to_csv(self, output_format='csv'):
+        """수집된 데이터 CSV(또는 parquet) 파일로 저장"""
         if not self.company_data:
             logging.warning("저장할 데이터가 없습니다.")
             return
@@ -207,15 +260,32 @@ class ResearchCompanyCrawler:
         output_dir = 'crawled_data'
         os.makedirs(output_dir, exist_ok=True)
         
-        filename = f"{output_dir}/research_companies.csv"
+        filename = f"{output_dir}/research_companies.{output_format}"
 
-        # DataFrame 생성 및 저장
-        df = pd.DataFrame(self.company_data)
-        df.to_csv(filename, index=False, encoding='utf-8-sig')
+        # DataFrame 생성 및 저장 (parquet은 리스트 컬럼을 list<string>으로 유지)
+        if output_format == 'parquet':
+            write_parquet(records_to_table(self.company_data), filename)
+        else:
+            df = pd.DataFrame(self.company_data)
+            df.to_csv(filename, index=False, encoding='utf-8-sig')
         logging.info(f"크롤링 결과가 {filename}에 저장되었습니다.")
         logging.info(f"총 {len(self.company_data)}개 기업 정보 저장 완료")
 
 if __name__ == "__main__":
-    crawler = ResearchCompanyCrawler()
+    parser = argparse.ArgumentParser(description='Research Company Crawler')
+    parser.add_argument('--workers', type=int, default=4, help='Number of workers fetching company detail pages (list pages are prefetched separately)')
+    parser.add_argument('--rate-limit', type=float, default=2.0, help='Maximum requests per second to rndjob.or.kr')
+    parser.add_argument('--parser', choices=available_backends(), default='lxml', help='HTML parser backend')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv', help='Output file format (crawled_data/research_companies.<format>)')
+    parser.add_argument('--http-cache', default='crawled_data/http_cache.sqlite', help='SQLite HTTP cache for conditional GETs and parse reuse (empty to disable)')
+    args = parser.parse_args()
+    if args.format == 'parquet':
+        require_parquet()
+    
+    if args.http_cache:
+        get_client().use_cache(HttpCache(args.http_cache))
+    
+    crawler = ResearchCompanyCrawler(company_cache=CompanyCache(), workers=args.workers, rate_limit=args.rate_limit,
+                                     parser_backend=args.parser)
     crawler.crawl()
-    crawler.save_to_csv() 
\ No newline at end of file
+    crawler.save_to_csv(args.format) 
\ No newline at end of file
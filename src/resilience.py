@@ -0,0 +1,302 @@
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+
+# 오류 종류: 'timeout'(응답 없음), 'connection'(연결 실패), 'server'(429/5xx), 'client'(그 밖의 4xx),
+# 'circuit_open'(호스트 차단 중), 'other'(파싱 결과 부족 등)
+HOST_FAILURE_KINDS = ('timeout', 'connection', 'server')
+
+
+class CircuitOpenError(Exception):
+    """호스트의 circuit이 열려 있어 요청을 보내지 않음"""
+
+
+def classify_error(error):
+    """예외를 재시도 정책에서 사용하는 오류 종류로 분류"""
+    if isinstance(error, CircuitOpenError):
+        return 'circuit_open'
+    if isinstance(error, (requests.Timeout, TimeoutError)) or type(error).__name__ == 'TimeoutException':
+        return 'timeout'
+    # 응답 본문을 받는 도중 연결이 끊긴 경우도 연결 실패로 봄
+    if isinstance(error, (requests.ConnectionError, requests.exceptions.ChunkedEncodingError)):
+        return 'connection'
+    if isinstance(error, requests.HTTPError):
+        status = getattr(error.response, 'status_code', None)
+        if status == 429 or (status is not None and status >= 500):
+            return 'server'
+        return 'client'
+    # 브라우저의 네트워크 오류 (net::ERR_CONNECTION_REFUSED 등)
+    if type(error).__name__ == 'WebDriverException' and 'net::ERR' in str(error):
+        return 'connection'
+    return 'other'
+
+
+def error_status(error):
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None)
+
+
+def retry_after_seconds(response):
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 초 단위로 변환 (없으면 None)"""
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """오류 종류별 재시도 횟수와 지수 백오프 + 지터 지연
+
+    타임아웃은 한 번에 타임아웃 시간만큼 걸리므로 4xx/5xx와 별도로 더 적게 재시도하고,
+    429/5xx는 Retry-After가 있으면 그 시간만큼 기다린다. 404 같은 4xx는 다시 요청해도
+    결과가 같으므로 재시도하지 않는다.
+    """
+    def __init__(self, max_retries=3, timeout_retries=1, backoff=1.0, max_delay=30.0):
+        self.max_retries = max_retries
+        self.timeout_retries = timeout_retries
+        self.backoff = backoff
+        self.max_delay = max_delay
+
+    def should_retry(self, kind, failures):
+        """같은 종류의 오류가 failures번째로 발생했을 때 다시 시도할지 여부"""
+        if kind in ('client', 'circuit_open'):
+            return False
+        if kind == 'timeout':
+            return failures <= self.timeout_retries
+        return failures <= self.max_retries
+
+    def delay(self, attempt, retry_after=None):
+        """attempt번째 재시도 전 대기 시간 (동시에 실패한 워커들이 같은 시각에 재시도하지 않도록 지터 적용)"""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return min(self.max_delay, self.backoff * (2 ** attempt)) * random.uniform(0.5, 1.5)
+
+
+class CircuitBreaker:
+    """호스트 하나의 연속 실패를 세어 사이트가 내려갔으면 요청을 멈추는 circuit breaker (스레드 안전)
+
+    closed: 정상. 타임아웃/연결 실패/5xx가 failure_threshold번 연속되면 open으로 바뀐다.
+    open: reset_timeout 동안 모든 요청이 기다리고(크롤링 일시 중지), 지나면 half_open이 된다.
+    half_open: 요청 하나만 보내 보고 성공하면 closed, 실패하면 다시 open.
+    성공 없이 max_open_time 이상 열려 있으면 시험 요청 외의 요청은 기다리지 않고 CircuitOpenError를
+    발생시켜 남은 URL이 재시도 목록(DeadLetterStore)으로 빠르게 넘어가게 한다.
+    """
+    def __init__(self, host, failure_threshold=5, reset_timeout=30.0, max_open_time=300.0):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_open_time = max_open_time
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = None
+        self.first_opened_at = None  # 마지막 성공 이후 처음 열린 시각
+        self.probing = False
+        self.trips = 0
+        self.condition = threading.Condition()
+
+    def before_request(self, stats=None):
+        """요청 전에 호출: circuit이 열려 있으면 닫히거나 시험 요청 차례가 될 때까지 대기"""
+        with self.condition:
+            waited_from = None
+            while True:
+                if self.state == 'closed':
+                    break
+                now = time.monotonic()
+                if self.state == 'open' and now >= self.opened_at + self.reset_timeout:
+                    self.state = 'half_open'
+                if self.state == 'half_open' and not self.probing:
+                    self.probing = True
+                    logging.info(f"{self.host} circuit half-open: 시험 요청 전송")
+                    break
+                if now - self.first_opened_at >= self.max_open_time:
+                    raise CircuitOpenError(f"{self.host} 응답 없음 ({now - self.first_opened_at:.0f}초 동안 circuit open)")
+                if waited_from is None:
+                    waited_from = now
+                    logging.warning(f"{self.host} circuit open: 요청 일시 중지")
+                timeout = self.opened_at + self.reset_timeout - now if self.state == 'open' else self.reset_timeout
+                self.condition.wait(max(0.1, timeout))
+        if waited_from is not None and stats is not None:
+            stats.add('circuit', time.monotonic() - waited_from)
+
+    def record_success(self):
+        with self.condition:
+            if self.state != 'closed':
+                logging.info(f"{self.host} circuit closed: 요청 재개")
+            self.state = 'closed'
+            self.failures = 0
+            self.probing = False
+            self.first_opened_at = None
+            self.condition.notify_all()
+
+    def record_failure(self):
+        with self.condition:
+            self.failures += 1
+            if self.state == 'half_open' or (self.state == 'closed' and self.failures >= self.failure_threshold):
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+                if self.first_opened_at is None:
+                    self.first_opened_at = self.opened_at
+                self.probing = False
+                self.trips += 1
+                logging.warning(f"{self.host} circuit open: 연속 실패 {self.failures}회, {self.reset_timeout:.0f}초 후 재시도")
+                self.condition.notify_all()
+
+    def release_probe(self):
+        """시험 요청이 결과 기록 없이 끝났을 때(예상하지 못한 예외) 다음 요청이 다시 시험할 수 있게 함"""
+        with self.condition:
+            if self.probing:
+                self.probing = False
+                self.condition.notify_all()
+
+    def record(self, kind):
+        """요청 결과 기록 (호스트 장애로 볼 수 있는 오류만 실패로 셈, 4xx는 호스트가 응답한 것이므로 성공)"""
+        if kind in HOST_FAILURE_KINDS:
+            self.record_failure()
+        elif kind != 'circuit_open':
+            self.record_success()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+BREAKER_SETTINGS = {'failure_threshold': 5, 'reset_timeout': 30.0, 'max_open_time': 300.0}
+
+
+def get_breaker(url):
+    """프로세스 안에서 HTTP 클라이언트와 브라우저가 공유하는 호스트별 CircuitBreaker 반환"""
+    host = urlparse(url).netloc
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(host, **BREAKER_SETTINGS)
+        return breaker
+
+
+def configure_breakers(failure_threshold=None, reset_timeout=None, max_open_time=None):
+    """이후에 만들어지는 호스트별 CircuitBreaker의 설정 변경"""
+    for key, value in (('failure_threshold', failure_threshold), ('reset_timeout', reset_timeout),
+                       ('max_open_time', max_open_time)):
+        if value is not None:
+            BREAKER_SETTINGS[key] = value
+
+
+def log_breakers():
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    for breaker in breakers:
+        if breaker.trips:
+            logging.info(f"  {breaker.host} circuit open {breaker.trips}회 (현재: {breaker.state})")
+
+
+class DeadLetterStore:
+    """재시도해도 수집하지 못한 URL을 오류 종류와 함께 저장하는 SQLite 목록 (retry_dead_letters.py로 따로 재수집)"""
+    def __init__(self, db_path='crawled_data/dead_letters.sqlite', source=''):
+        self.db_path = db_path
+        self.source = source
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        # 파이프라인 워커 스레드에서도 사용하므로 연결 하나를 lock으로 보호
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS dead_letters (
+                    source TEXT,
+                    url TEXT,
+                    kind TEXT,
+                    status INTEGER,
+                    error TEXT,
+                    context_json TEXT,
+                    attempts INTEGER,
+                    first_failed TEXT,
+                    last_failed TEXT,
+                    PRIMARY KEY (source, url)
+                )
+            """)
+        self.stats = {'added': 0, 'resolved': 0}
+        # 성공할 때마다 DELETE를 보내지 않도록 기록된 URL을 메모리에 보관
+        with self.lock:
+            self.urls = {row[0] for row in self.conn.execute("SELECT url FROM dead_letters WHERE source = ?", (source,))}
+
+    def add(self, url, kind, error=None, status=None, context=None):
+        """수집에 실패한 URL 기록 (이미 있으면 실패 횟수 증가)"""
+        now = datetime.now().isoformat(timespec='seconds')
+        context_json = json.dumps(context, ensure_ascii=False) if context else None
+        with self.lock, self.conn:
+            self.conn.execute("""
+                INSERT INTO dead_letters (source, url, kind, status, error, context_json, attempts, first_failed, last_failed)
+                VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?)
+                ON CONFLICT(source, url) DO UPDATE SET
+                    kind = excluded.kind,
+                    status = excluded.status,
+                    error = excluded.error,
+                    context_json = COALESCE(excluded.context_json, dead_letters.context_json),
+                    attempts = dead_letters.attempts + 1,
+                    last_failed = excluded.last_failed
+            """, (self.source, url, kind, status, str(error)[:500] if error else None, context_json, now, now))
+            self.urls.add(url)
+            self.stats['added'] += 1
+
+    def add_error(self, url, error, context=None):
+        self.add(url, classify_error(error), error, error_status(error), context)
+
+    def remove(self, url):
+        """수집에 성공한 URL 삭제"""
+        if url not in self.urls:
+            return False
+        with self.lock, self.conn:
+            self.urls.discard(url)
+            deleted = self.conn.execute("DELETE FROM dead_letters WHERE source = ? AND url = ?",
+                                        (self.source, url)).rowcount
+            self.stats['resolved'] += deleted
+        return bool(deleted)
+
+    def entries(self, kinds=None, limit=None):
+        """저장된 실패 URL 목록 (오래된 순)"""
+        query = ("SELECT url, kind, status, error, context_json, attempts, first_failed, last_failed "
+                 "FROM dead_letters WHERE source = ?")
+        params = [self.source]
+        if kinds:
+            query += f" AND kind IN ({', '.join('?' * len(kinds))})"
+            params.extend(kinds)
+        query += " ORDER BY first_failed"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [{'url': row[0], 'kind': row[1], 'status': row[2], 'error': row[3],
+                 'context': json.loads(row[4]) if row[4] else None, 'attempts': row[5],
+                 'first_failed': row[6], 'last_failed': row[7]} for row in rows]
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM dead_letters WHERE source = ?", (self.source,)).fetchone()[0]
+
+    def log_stats(self):
+        with self.lock:
+            by_kind = self.conn.execute("SELECT kind, COUNT(*) FROM dead_letters WHERE source = ? GROUP BY kind",
+                                        (self.source,)).fetchall()
+        detail = ', '.join(f"{kind} {count}건" for kind, count in by_kind) or '없음'
+        logging.info(f"재시도 대기 URL ({self.source}) - 이번 실행 추가: {self.stats['added']}건, "
+                     f"해결: {self.stats['resolved']}건, 남은 URL: {detail}")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
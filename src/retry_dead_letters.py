@@ -0,0 +1,116 @@
+import argparse
+import logging
+import os
+
+from resilience import DeadLetterStore
+from row_writer import CsvRowWriter, ensure_parent_dir
+from table_io import read_records, is_parquet, records_to_table, write_parquet
+
+DETAIL_KEY = '상세정보_URL'
+
+
+def merge_details(detail_filename, details):
+    """상세 정보 파일(CSV/parquet)에서 같은 URL의 행을 교체하고 없던 URL은 끝에 추가 (임시 파일에 쓴 뒤 교체)"""
+    rows = read_records(detail_filename) if os.path.exists(detail_filename) else []
+    columns = list(dict.fromkeys(key for row in rows[:1] for key in row))
+    index = {row.get(DETAIL_KEY): i for i, row in enumerate(rows)}
+    for detail in details:
+        columns.extend(key for key in detail if key not in columns)
+        if detail[DETAIL_KEY] in index:
+            rows[index[detail[DETAIL_KEY]]] = detail
+        else:
+            index[detail[DETAIL_KEY]] = len(rows)
+            rows.append(detail)
+
+    if os.path.exists(detail_filename) and is_parquet(detail_filename):
+        write_parquet(records_to_table(rows, columns), detail_filename)
+        return len(rows)
+    ensure_parent_dir(detail_filename)
+    part_path = f"{detail_filename}.part"
+    writer = CsvRowWriter(part_path, columns)
+    writer.write_rows([row.get(column) for column in columns] for row in rows)
+    writer.close()
+    os.replace(part_path, detail_filename)
+    return len(rows)
+
+
+class DeadLetterRetrier:
+    """재시도 목록의 상세 URL만 다시 수집하여 기존 상세 정보 CSV에 반영 (성공한 URL은 목록에서 삭제)"""
+    def __init__(self, source, dead_letters, kinds=None, limit=None):
+        self.source = source
+        self.dead_letters = dead_letters
+        self.kinds = kinds
+        self.limit = limit
+
+    def run(self, detail_filename):
+        entries = self.dead_letters.entries(kinds=self.kinds, limit=self.limit)
+        if not entries:
+            logging.info(f"재시도할 URL이 없습니다. ({self.source})")
+            return
+        logging.info(f"재시도 시작: {self.source} {len(entries)}건")
+        fetch = self.retry_rndjob if self.source == 'rndjob' else self.retry_military
+        details = fetch([entry['url'] for entry in entries])
+        if details:
+            row_count = merge_details(detail_filename, details)
+            logging.info(f"상세 정보 {len(details)}건을 {detail_filename}에 반영했습니다. (전체 {row_count}건)")
+        logging.info(f"재시도 완료: 성공 {len(details)}/{len(entries)}건")
+
+    def retry_rndjob(self, urls):
+        from rndjob_job_crawler import RndJobCrawler
+        crawler = RndJobCrawler(dead_letters=self.dead_letters)
+        details = []
+        for url in urls:
+            html = crawler.fetch_detail(('detail', None, url, None))
+            detail = crawler.parse_detail(('detail', None, url, None), html)
+            if detail and len(detail) > 1:
+                self.dead_letters.remove(url)
+                details.append(detail)
+        crawler.http.log_stats()
+        return details
+
+    def retry_military(self, urls):
+        """검색 세션이 필요하므로 브라우저로 검색한 뒤 상세 페이지를 다시 수집"""
+        from military_job_crawler import MilitaryJobCrawler
+        crawler = MilitaryJobCrawler(dead_letters=self.dead_letters)
+        details = []
+        try:
+            crawler.setup_driver()
+            if not crawler.search_research_positions():
+                return details
+            crawler.sync_session_from_driver()
+            for url in urls:
+                detail = crawler.parse_detail_content(url, crawler.fetch_detail_content(url))
+                if detail and len(detail) > 1:
+                    self.dead_letters.remove(url)
+                    details.append(detail)
+        except Exception as e:
+            logging.error(f"병무청 재시도 중 오류 발생: {e}")
+        finally:
+            crawler.cleanup_drivers()
+            if crawler.driver:
+                crawler.driver_manager.release(crawler.driver)
+                crawler.driver = None
+        return details
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Retry detail URLs that failed during a crawl and merge them into the detail CSV')
+    parser.add_argument('source', choices=['rndjob', 'military'], help='Which crawler to retry')
+    parser.add_argument('--detail-output', required=True, help='Detail CSV or parquet file to update with the recovered rows')
+    parser.add_argument('--dead-letter-db', default='crawled_data/dead_letters.sqlite', help='SQLite list of failed detail URLs')
+    parser.add_argument('--kinds', nargs='+', choices=['timeout', 'connection', 'server', 'client', 'circuit_open', 'other'],
+                        help='Only retry failures of these kinds (default: all)')
+    parser.add_argument('--limit', type=int, help='Maximum number of URLs to retry')
+    parser.add_argument('--list', action='store_true', help='List failed URLs and exit')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    dead_letters = DeadLetterStore(args.dead_letter_db, source=args.source)
+    if args.list:
+        for entry in dead_letters.entries(kinds=args.kinds, limit=args.limit):
+            print(f"{entry['last_failed']}\t{entry['kind']}\t{entry['status'] or ''}\t{entry['attempts']}\t{entry['url']}")
+    else:
+        DeadLetterRetrier(args.source, dead_letters, kinds=args.kinds, limit=args.limit).run(args.detail_output)
+        dead_letters.log_stats()
+    dead_letters.close()
@@ -1,224 +1,182 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-import time
 from datetime import datetime
 import os
+import tempfile
 import logging
 import argparse
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+
+from state_store import PostingStateStore, row_fingerprint
+from checkpoint import CrawlCheckpoint
+from row_writer import CsvRowWriter, JsonlSpool, finalize_rows
+from table_io import OUTPUT_FORMATS, require_parquet
+from crawl_pipeline import CrawlPipeline
+from rate_limiter import HostRateLimiter
+from wait_stats import WaitStats
+from http_client import get_client
+from company_info import extract_company_id, fetch_company_info, get_company_info_url, parse_company_info, add_prefix
+from company_cache import CompanyCache
+from http_cache import HttpCache
+from html_archive import HtmlArchive, url_key
+from html_parser import get_backend, available_backends
+from resilience import DeadLetterStore, configure_breakers
 
 class RndJobCrawler:
-    def __init__(self):
+    def __init__(self, state_store=None, checkpoint=None, concurrency=4, rate_limit=2.0, company_cache=None,
+                 archive=None, parser_backend=None, parse_workers=2, queue_size=32, dead_letters=None,
+                 output_format='csv'):
         self.base_url = "https://www.rndjob.or.kr/info/sp_rsch.asp"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        self.basic_data = []  # 게시판 기본 정보
-        self.detail_data = []  # 상세 페이지 정보
-        self.driver = None
+        self.basic_writer = None  # 게시판 기본 정보 CSV writer (페이지마다 추가)
+        self.detail_spool = None  # 상세 페이지 정보 JSONL spool (상세 페이지마다 추가)
+        self.http = get_client()  # keep-alive 연결을 재사용하는 공용 HTTP 클라이언트
+        # 증분 크롤링용 공고 상태 저장소 (None이면 매번 전체 수집)
+        self.state_store = state_store
+        # 진행 상황 체크포인트 (None이면 저장하지 않음)
+        self.checkpoint = checkpoint
+        # 회사 ID(jsno)별 회사 상세 정보 캐시 (None이면 공고마다 회사 정보 페이지 수집)
+        self.company_cache = company_cache
+        # 수집한 원본 HTML 아카이브 (None이면 기록하지 않음, reparse.py로 CSV 재생성에 사용)
+        self.archive = archive
+        if archive:
+            self.http.use_archive(archive)
+        # reparse 시 회사 정보 페이지를 네트워크 대신 읽어올 아카이브 (ArchiveReader, URL 키 -> 레코드)
+        self.archive_reader = None
+        self.archive_pages = None
+        # HTML 파서 백엔드 (lxml 기본, selectolax 또는 기존 bs4 선택 가능), 선택자는 처음 사용할 때 한 번만 컴파일
+        self.parser = get_backend(parser_backend)
+        self.board_headers = None  # 첫 페이지에서 읽은 게시판 헤더
+        self.company_col_index = None
+        self.pages_done = []  # 기본/상세 정보를 모두 수집한 페이지 번호
+        self.pending_urls = {}  # 파이프라인에 들어갔지만 아직 기록되지 않은 상세 정보 URL (넣은 순서를 유지하는 dict)
+        # 목록/상세/회사 정보 요청이 함께 쓰는 호스트별 초당 요청 수 제한 (대기 시간은 wait_stats에 기록)
+        self.wait_stats = WaitStats()
+        self.rate_limiter = HostRateLimiter(rate=rate_limit, stats=self.wait_stats)
+        # 최종 기본/상세 정보 파일 형식 ('csv' 또는 'parquet', 수집 중에는 CSV/JSONL로 기록)
+        self.output_format = output_format
+        # 재시도해도 가져오지 못한 상세 URL을 기록하는 재시도 목록 (None이면 기록하지 않음)
+        self.dead_letters = dead_letters
+        # 상세 페이지 파이프라인 설정 (fetch 워커 = 동시 요청 수, parse 워커는 회사 정보 요청도 수행)
+        self.concurrency = max(1, concurrency)
+        self.parse_workers = max(1, parse_workers)
+        self.queue_size = max(1, queue_size)
+        # writer 스레드에서만 사용하는 페이지별 진행 상황 (페이지 번호 -> 남은 상세 URL, 목록 행)
+        self.page_pending = {}
+        self.page_rows = {}
+        self.page_order = []
         
         # 로깅 설정
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-    def init_driver(self):
-        """Selenium WebDriver 초기화"""
-        try:
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')  # 브라우저 창 숨기기
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument(f'--user-agent={self.headers["User-Agent"]}')
-            chrome_options.page_load_strategy = 'eager'
-            
-            # Chrome 바이너리 위치 지정 (macOS)
-            import os
-            if os.path.exists('/Applications/Google Chrome.app/Contents/MacOS/Google Chrome'):
-                chrome_options.binary_location = '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome'
-            elif os.path.exists('/usr/bin/chromium'):
-                chrome_options.binary_location = '/usr/bin/chromium'
-            
-            # 성능 최적화를 위한 설정
-            prefs = {
-                'profile.default_content_setting_values': {
-                    'images': 2,  # 이미지 로딩 비활성화
-                    'plugins': 2,  # 플러그인 비활성화
-                    'javascript': 1  # JavaScript는 필요하므로 활성화
-                }
-            }
-            chrome_options.add_experimental_option('prefs', prefs)
-            
-            # ChromeDriver 경로 설정
-            service = None
-            chromedriver_paths = [
-                '/opt/homebrew/bin/chromedriver',  # macOS Homebrew
-                '/usr/local/bin/chromedriver',     # 일반적인 설치 위치
-                '/usr/bin/chromedriver'            # Linux 기본 위치
-            ]
-            
-            for path in chromedriver_paths:
-                if os.path.exists(path):
-                    service = Service(path)
-                    logging.info(f"ChromeDriver 발견: {path}")
-                    break
-            
-            if service:
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            else:
-                # PATH에서 자동으로 찾기 시도
-                logging.info("ChromeDriver 경로를 자동으로 찾는 중...")
-                self.driver = webdriver.Chrome(options=chrome_options)
-            
-            self.driver.implicitly_wait(10)
-            logging.info("WebDriver 초기화 완료")
-            return True
-        except Exception as e:
-            logging.error(f"WebDriver 초기화 실패: {e}")
-            logging.info("WebDriver 없이 크롤링을 계속합니다. (회사 상세정보 제외)")
-            return False
-
-    def close_driver(self):
-        """WebDriver 종료"""
-        if self.driver:
-            self.driver.quit()
-            logging.info("WebDriver 종료 완료")
-
-    def get_company_detail_info_with_selenium(self, detail_url):
-        """selenium을 사용하여 회사 상세정보 크롤링"""
-        company_detail_info = {}
-        
-        try:
-            self.driver.get(detail_url)
-            
-            # info_btn 클래스 찾기
-            info_btn = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.CLASS_NAME, "info_btn"))
-            )
-            
-            # 버튼 클릭
-            info_btn.click()
-            
-            # 팝업 창이 열릴 때까지 기다리기
-            WebDriverWait(self.driver, 10).until(
-                lambda driver: len(driver.window_handles) > 1
-            )
-            
-            # 새로운 창으로 전환
-            original_window = self.driver.current_window_handle
-            for window_handle in self.driver.window_handles:
-                if window_handle != original_window:
-                    self.driver.switch_to.window(window_handle)
-                    break
-            
-            # 페이지 로딩 대기
-            time.sleep(2)
-            
-            # 회사 상세정보 크롤링 (research_company_crawler.py와 동일한 방식)
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            info_dls = soup.find_all('dl', class_='info_dl')
-            
-            for dl in info_dls:
-                dts = dl.find_all('dt')
-                dds = dl.find_all('dd')
-                for dt, dd in zip(dts, dds):
-                    key = f"회사_상세_{dt.text.strip()}"
-                    value = dd.text.strip()
-                    company_detail_info[key] = value
-            
-            # 원래 창으로 돌아가기
-            self.driver.close()  # 팝업 창 닫기
-            self.driver.switch_to.window(original_window)
-            
-            logging.info(f"회사 상세정보 크롤링 완료: {len(company_detail_info)}개 필드")
-            
-        except TimeoutException:
-            logging.warning(f"회사 상세정보 버튼을 찾을 수 없습니다: {detail_url}")
-        except NoSuchElementException:
-            logging.warning(f"회사 상세정보 요소를 찾을 수 없습니다: {detail_url}")
-        except Exception as e:
-            logging.error(f"회사 상세정보 크롤링 중 오류 발생: {e}")
-            # 오류 발생 시 원래 창으로 돌아가기 시도
-            try:
-                if len(self.driver.window_handles) > 1:
-                    self.driver.close()
-                    self.driver.switch_to.window(self.driver.window_handles[0])
-            except:
-                pass
-        
-        return company_detail_info
+    def get_company_detail_info(self, doc, detail_url):
+        """상세 페이지의 회사 ID(jsno)로 회사 정보 페이지를 HTTP로 가져와 파싱"""
+        return self.get_company_info_by_id(extract_company_id(doc, self.parser), detail_url)
+
+    def get_company_info_by_id(self, company_id, detail_url):
+        """회사 ID로 회사 정보 가져오기 (회사 정보 캐시의 유효 기간은 CompanyCache가 적용)"""
+        if not company_id:
+            logging.warning(f"회사 ID를 찾을 수 없습니다: {detail_url}")
+            return {}
+        if self.archive_reader:
+            return self.get_archived_company_detail_info(company_id)
+        company_detail_info = fetch_company_info(company_id, prefix='회사_상세_', client=self.http, headers=self.headers,
+                                                 cache=self.company_cache, rate_limiter=self.rate_limiter,
+                                                 parser=self.parser)
+        return company_detail_info or {}
+
+    def use_archive_pages(self, reader, pages):
+        """reparse: 회사 정보 페이지를 네트워크 대신 아카이브에서 읽도록 설정"""
+        self.archive_reader = reader
+        self.archive_pages = pages
+
+    def get_archived_company_detail_info(self, company_id):
+        """아카이브에 저장된 회사 정보 페이지 파싱 (없으면 빈 dict)"""
+        entry = self.archive_pages.get(url_key(get_company_info_url(company_id)))
+        if entry is None:
+            logging.warning(f"아카이브에 회사 ID {company_id}의 정보 페이지가 없습니다.")
+            return {}
+        _, html = self.archive_reader.read(entry)
+        return add_prefix(parse_company_info(self.parser.parse(html), self.parser), '회사_상세_')
+
+    def fetch_page_text(self, url, raise_errors=False):
+        """요청 속도 제한을 지켜 페이지 HTML 가져오기 (파싱은 호출한 쪽에서 수행)"""
+        self.rate_limiter.wait(url)
+        return self.http.get_text(url, raise_errors=raise_errors, headers=self.headers)
+
+    def parse_html(self, html):
+        """설정된 파서 백엔드로 HTML 파싱"""
+        return self.parser.parse(html)
 
     def get_page_content(self, url):
-        try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            return BeautifulSoup(response.text, 'html.parser')
-        except Exception as e:
-            logging.error(f"페이지 접근 중 오류 발생: {e}")
-            return None
+        html = self.fetch_page_text(url)
+        return self.parse_html(html) if html else None
 
-    def get_pagination_info(self, soup):
-        pagination = soup.find('div', class_='pagination')
-        if not pagination:
+    def get_pagination_info(self, doc):
+        p = self.parser
+        pagination = p.select_first(doc, 'div.pagination')
+        if pagination is None:
             return []
         
         pages = []
-        for a_tag in pagination.find_all('a'):
-            if a_tag.get('class') and 'active' in a_tag.get('class'):
-                pages.append(a_tag.text.strip())
-            elif not a_tag.get('class'):
-                pages.append(a_tag.text.strip())
-        return [p for p in pages if p.isdigit()]
-
-    def get_board_headers(self, soup):
+        for a_tag in p.select(pagination, 'a'):
+            classes = p.classes(a_tag)
+            if classes and 'active' in classes:
+                pages.append(p.text(a_tag).strip())
+            elif not classes:
+                pages.append(p.text(a_tag).strip())
+        return [page for page in pages if page.isdigit()]
+
+    def get_board_headers(self, doc):
         """게시판의 컬럼명을 가져옵니다."""
+        p = self.parser
         headers = []
-        board_table = soup.find('table', class_='board_list')
-        if board_table:
-            header_row = board_table.find('thead').find('tr')
-            headers = [th.text.strip() for th in header_row.find_all('th')]
+        board_table = p.select_first(doc, 'table.board_list')
+        if board_table is not None:
+            header_row = p.select_first(p.select_first(board_table, 'thead'), 'tr')
+            headers = [p.text(th).strip() for th in p.select(header_row, 'th')]
             headers.append('상세정보_URL')  # URL 컬럼 추가
+            self.board_headers = headers
         return headers
 
-    def get_board_rows(self, soup):
-        """게시판의 각 행 데이터를 가져옵니다."""
-        rows = []
-        board_table = soup.find('table', class_='board_list')
-        if board_table:
-            # 헤더에서 기업명 컬럼의 인덱스 찾기
-            headers = self.get_board_headers(soup)
-            company_col_index = -1
+    def get_company_col_index(self, doc):
+        """기업명 컬럼의 인덱스 (헤더는 모든 페이지가 같으므로 처음 한 번만 계산)"""
+        if self.company_col_index is None:
+            headers = self.board_headers or self.get_board_headers(doc)
+            self.company_col_index = -1
             for i, header in enumerate(headers):
                 if '기업명' in header or '회사명' in header or '업체명' in header:
-                    company_col_index = i
+                    self.company_col_index = i
                     break
+        return self.company_col_index
+
+    def get_board_rows(self, doc):
+        """게시판의 각 행 데이터를 가져옵니다."""
+        p = self.parser
+        rows = []
+        board_table = p.select_first(doc, 'table.board_list')
+        if board_table is not None:
+            # 헤더에서 기업명 컬럼의 인덱스 찾기
+            company_col_index = self.get_company_col_index(doc)
             
-            for tr in board_table.find('tbody').find_all('tr'):
+            for tr in p.select(p.select_first(board_table, 'tbody'), 'tr'):
                 row_data = []
                 # 일반 td 셀들의 텍스트 수집
-                tds = tr.find_all('td')
+                tds = p.select(tr, 'td')
                 for idx, td in enumerate(tds):
                     # 기업명 컬럼인 경우 class="comp_name"인 p 태그의 텍스트 우선 추출
                     if idx == company_col_index:
-                        comp_name_p = td.find('p', class_='comp_name')
-                        if comp_name_p:
-                            row_data.append(comp_name_p.text.strip())
+                        comp_name_p = p.select_first(td, 'p.comp_name')
+                        if comp_name_p is not None:
+                            row_data.append(p.text(comp_name_p).strip())
                         else:
                             # comp_name 클래스가 없으면 기존 로직 사용
-                            row_data.append(td.text.strip())
+                            row_data.append(p.text(td).strip())
                     # class="num"인 td의 경우 div 태그 내부의 텍스트도 수집
-                    elif td.get('class') and 'num' in td.get('class'):
-                        div_tag = td.find('div')
-                        if div_tag:
+                    elif 'num' in p.classes(td):
+                        div_tag = p.select_first(td, 'div')
+                        if div_tag is not None:
                             # div 내부의 모든 텍스트를 수집
-                            text_content = ' '.join([text.strip() for text in div_tag.stripped_strings])
+                            text_content = ' '.join(p.strings(div_tag))
                             # 날짜 형식 변환 (YYYY.MM.DDYYYY.MM.DD -> YYYY-MM-DD/YYYY-MM-DD)
                             if len(text_content) == 20 and text_content.count('.') == 4:
                                 date1 = text_content[:10].replace('.', '-')
@@ -226,25 +184,26 @@ class RndJobCrawler:
                                 text_content = f"{date1}/{date2}"
                             row_data.append(text_content)
                         else:
-                            row_data.append(td.text.strip())
+                            row_data.append(p.text(td).strip())
                     else:
                         # p 태그가 있으면 p 태그의 텍스트를, 없으면 td의 텍스트를 사용
-                        p_tag = td.find('p')
+                        p_tag = p.select_first(td, 'p')
                         # span 태그들이 있으면 span 태그들의 텍스트를, 없으면 td의 텍스트를 사용
-                        span_tags = td.find_all('span')
+                        span_tags = p.select(td, 'span')
                         if span_tags:
-                            row_data.append(' '.join([span.text.strip() for span in span_tags]))
-                        elif p_tag:
-                            row_data.append(p_tag.text.strip())
+                            row_data.append(' '.join([p.text(span).strip() for span in span_tags]))
+                        elif p_tag is not None:
+                            row_data.append(p.text(p_tag).strip())
                         else:
-                            row_data.append(td.text.strip())
+                            row_data.append(p.text(td).strip())
                 
                 # URL 추가
-                tit_td = tr.find('td', class_='tit')
-                if tit_td:
-                    dotdot_span = tit_td.find('span', class_='dotdot')
-                    if dotdot_span and dotdot_span.find('a'):
-                        url = dotdot_span.find('a').get('href', '')
+                tit_td = p.select_first(tr, 'td.tit')
+                if tit_td is not None:
+                    dotdot_span = p.select_first(tit_td, 'span.dotdot')
+                    link = p.select_first(dotdot_span, 'a') if dotdot_span is not None else None
+                    if link is not None:
+                        url = p.attr(link, 'href', '')
                         full_url = f"https://www.rndjob.or.kr{url}"
                         row_data.append(full_url)
                     else:
@@ -255,150 +214,331 @@ class RndJobCrawler:
                 rows.append(row_data)
         return rows
 
-    def parse_job_detail(self, soup, detail_url=None):
-        """상세 페이지의 정보를 파싱합니다."""
+    def parse_job_detail(self, doc, detail_url=None):
+        """상세 페이지의 정보를 파싱합니다. (detail_url이 있으면 회사 정보 페이지도 가져와 포함)"""
+        job_info = self.parse_company_box(doc)
+        
+        # 회사 상세정보 (info_btn 팝업과 같은 company_info.asp 페이지를 HTTP로 수집)
+        if detail_url:
+            job_info.update(self.get_company_detail_info(doc, detail_url))
+        
+        job_info.update(self.parse_posting_info(doc))
+        return job_info
+
+    def parse_detail_sections(self, doc):
+        """네트워크 요청 없이 상세 페이지 HTML만 파싱한 결과 (파싱 캐시에 저장하는 형태)"""
+        return {
+            'company_id': extract_company_id(doc, self.parser),
+            'company_box': self.parse_company_box(doc),
+            'posting': self.parse_posting_info(doc),
+        }
+
+    def parse_company_box(self, doc):
+        """상세 페이지 오른쪽의 회사 로고/이름/종류/기본 정보"""
+        p = self.parser
         job_info = {}
         
         # 회사 로고 및 기본 정보
-        r_box = soup.find('div', class_='r_box')
-        if r_box:
+        r_box = p.select_first(doc, 'div.r_box')
+        if r_box is not None:
             # 회사 로고
-            logo_box = r_box.find('div', class_='logo_box')
-            if logo_box and logo_box.find('img'):
-                job_info['회사_로고_URL'] = logo_box.find('img').get('src', '')
+            logo_box = p.select_first(r_box, 'div.logo_box')
+            logo_img = p.select_first(logo_box, 'img') if logo_box is not None else None
+            if logo_img is not None:
+                job_info['회사_로고_URL'] = p.attr(logo_img, 'src', '')
             
             # 회사 정보 박스
-            company_box = r_box.find('div', class_='company_box')
-            if company_box:
+            company_box = p.select_first(r_box, 'div.company_box')
+            if company_box is not None:
                 # 회사 이름
-                name_p = company_box.find('p', class_='name')
-                if name_p:
-                    job_info['회사명'] = name_p.text.strip()
+                name_p = p.select_first(company_box, 'p.name')
+                if name_p is not None:
+                    job_info['회사명'] = p.text(name_p).strip()
                 
                 # 회사 종류
-                category_ul = company_box.find('ul', class_='category')
-                if category_ul:
-                    job_info['회사_종류'] = [li.text.strip() for li in category_ul.find_all('li')]
+                category_ul = p.select_first(company_box, 'ul.category')
+                if category_ul is not None:
+                    job_info['회사_종류'] = [p.text(li).strip() for li in p.select(category_ul, 'li')]
                 
                 # 회사 상세 정보
-                company_info_list = company_box.find('dl', class_='info_list')
-                if company_info_list:
-                    for dt in company_info_list.find_all('dt'):
-                        key = f"회사_{dt.text.strip()}"
-                        dd = dt.find_next_sibling('dd')
-                        value = dd.text.strip() if dd else ""
+                company_info_list = p.select_first(company_box, 'dl.info_list')
+                if company_info_list is not None:
+                    for dt in p.select(company_info_list, 'dt'):
+                        key = f"회사_{p.text(dt).strip()}"
+                        dd = p.next_sibling(dt, 'dd')
+                        value = p.text(dd).strip() if dd is not None else ""
                         job_info[key] = value
-        
-        # Selenium을 사용하여 회사 상세정보 크롤링 (info_btn 클릭)
-        if detail_url and self.driver:
-            company_detail_info = self.get_company_detail_info_with_selenium(detail_url)
-            job_info.update(company_detail_info)
+        return job_info
+
+    def parse_posting_info(self, doc):
+        """채용공고 기본 정보, 모집 분야, 상세 내용"""
+        p = self.parser
+        job_info = {}
         
         # 채용공고 기본 정보
-        info_lists = soup.find_all('dl', class_='info_list')
+        info_lists = p.select(doc, 'dl.info_list')
         for info_list in info_lists:
-            titles = info_list.find_all('dt')
-            values = info_list.find_all('dd')
+            titles = p.select(info_list, 'dt')
+            values = p.select(info_list, 'dd')
             for title, value in zip(titles, values):
-                key = title.text.strip()
-                val = value.find('span').text.strip() if value.find('span') else value.text.strip()
+                key = p.text(title).strip()
+                span = p.select_first(value, 'span')
+                val = p.text(span).strip() if span is not None else p.text(value).strip()
                 job_info[key] = val
 
         # 모집 분야 및 인원 정보
-        info_list2 = soup.find('ul', class_='info_list2')
-        if info_list2:
+        info_list2 = p.select_first(doc, 'ul.info_list2')
+        if info_list2 is not None:
             recruitment_info = []
-            for li in info_list2.find_all('li'):
-                recruitment_info.append(li.text.strip())
+            for li in p.select(info_list2, 'li'):
+                recruitment_info.append(p.text(li).strip())
             job_info['모집_분야_및_인원'] = recruitment_info
 
         # 채용공고 상세 내용
-        sub_each_divs = soup.find_all('div', class_='sub_each')
+        sub_each_divs = p.select(doc, 'div.sub_each')
         for div in sub_each_divs:
-            title = div.find('p', class_='sub_tit')
-            if not title:
+            title = p.select_first(div, 'p.sub_tit')
+            if title is None:
                 continue
                 
-            title_text = title.text.strip()
-            content = div.find('div', class_='vin_dtl')
+            title_text = p.text(title).strip()
+            content = p.select_first(div, 'div.vin_dtl')
             
-            if content:
+            if content is not None:
                 # 일반 리스트 항목
-                ul_content = content.find('ul')
-                if ul_content:
-                    items = [li.text.strip() for li in ul_content.find_all('li')]
+                ul_content = p.select_first(content, 'ul')
+                if ul_content is not None:
+                    items = [p.text(li).strip() for li in p.select(ul_content, 'li')]
                     job_info[title_text] = items
                 
                 # 복리후생 정보
-                dl_content = content.find('dl', class_='img_dl')
-                if dl_content:
+                dl_content = p.select_first(content, 'dl.img_dl')
+                if dl_content is not None:
                     welfare_items = {}
-                    for dt, dd in zip(dl_content.find_all('dt'), dl_content.find_all('dd')):
-                        welfare_title = dt.text.strip()
-                        welfare_values = [p.text.strip() for p in dd.find_all('p')]
+                    for dt, dd in zip(p.select(dl_content, 'dt'), p.select(dl_content, 'dd')):
+                        welfare_title = p.text(dt).strip()
+                        welfare_values = [p.text(p_tag).strip() for p_tag in p.select(dd, 'p')]
                         welfare_items[welfare_title] = welfare_values
                     job_info[title_text] = welfare_items
 
         return job_info
 
-    def crawl(self, basic_filename=None, detail_filename=None):
+    def get_basic_columns(self, headers):
+        """CSV에 기록할 기본 정보 컬럼 ('등록일/마감일'이 있으면 그 앞에 등록일, 마감일 컬럼 삽입)"""
+        columns = list(headers)
+        if '등록일/마감일' in headers:
+            insert_idx = headers.index('등록일/마감일')
+            columns[insert_idx:insert_idx] = ['등록일', '마감일']
+        return columns
+
+    def to_basic_record(self, headers, row):
+        """게시판 행을 get_basic_columns 순서의 CSV 행으로 변환"""
+        if '등록일/마감일' not in headers:
+            return row
+        insert_idx = headers.index('등록일/마감일')
+        value = row[insert_idx] if insert_idx < len(row) else None
+        dates = value.split(' ', 1) if isinstance(value, str) else []
+        dates = (dates + [None, None])[:2]
+        return row[:insert_idx] + dates + row[insert_idx:]
+
+    def open_writers(self, headers, basic_filename, detail_filename, state=None):
+        """기본 정보 CSV와 상세 정보 spool 열기 (체크포인트가 있으면 이어서 기록)"""
+        if not basic_filename or not detail_filename:
+            work_dir = tempfile.mkdtemp(prefix='rndjob_')
+            basic_filename = basic_filename or os.path.join(work_dir, 'basic.csv')
+            detail_filename = detail_filename or os.path.join(work_dir, 'detail.csv')
+        basic_part_path = f"{basic_filename}.part"
+        spool_path = f"{detail_filename}.spool.jsonl"
+        resume_offset = None
+        if state:
+            basic_part_path = state.get('basic_part_path') or basic_part_path
+            spool_path = state.get('detail_spool_path') or spool_path
+            resume_offset = state.get('basic_offset')
+        
+        self.basic_writer = CsvRowWriter(basic_part_path, self.get_basic_columns(headers), resume_offset=resume_offset)
+        self.detail_spool = JsonlSpool(spool_path, resume=bool(state))
+
+    def checkpoint_state(self):
+        """체크포인트에 저장할 진행 상황 (행과 상세 정보는 writer/spool 파일에 기록됨)"""
+        self.detail_spool.flush()
+        return {
+            'crawler': 'rndjob',
+            'pages_done': self.pages_done,
+            'basic_part_path': self.basic_writer.path,
+            'basic_offset': self.basic_writer.flush(),
+            'detail_spool_path': self.detail_spool.path,
+            'pending': list(self.pending_urls),
+            'archive_run_id': self.archive.run_id if self.archive else None,
+        }
+
+    def restore_checkpoint(self):
+        """마지막 체크포인트에서 진행 상황 복원 (없으면 None)"""
+        state = self.checkpoint.load() if self.checkpoint else None
+        if not state or state.get('crawler') != 'rndjob':
+            logging.info("복원할 체크포인트가 없어 처음부터 크롤링합니다.")
+            return None
+        self.pages_done = state.get('pages_done', [])
+        if self.archive and state.get('archive_run_id'):
+            # 이어서 수집한 페이지도 같은 실행으로 아카이브에 기록
+            self.archive.run_id = state['archive_run_id']
+        logging.info(f"체크포인트 복원: {len(self.pages_done)}페이지 완료, 남은 상세 정보 {len(state.get('pending', []))}건")
+        return state
+
+    def crawl(self, basic_filename=None, detail_filename=None, resume=False):
         """크롤링을 실행합니다."""
         logging.info("크롤링 시작...")
+        self.wait_stats.reset()
         
-        # WebDriver 초기화
-        if not self.init_driver():
-            logging.error("WebDriver 초기화에 실패했습니다. 회사 상세정보 크롤링을 건너뜁니다.")
+        state = self.restore_checkpoint() if resume else None
         
         try:
-            soup = self.get_page_content(self.base_url)
-            if not soup:
+            doc = self.get_page_content(self.base_url)
+            if doc is None:
                 return
 
             # 컬럼명 가져오기
-            headers = self.get_board_headers(soup)
+            headers = self.get_board_headers(doc)
             if not headers:
                 logging.error("게시판 헤더를 찾을 수 없습니다.")
                 return
+            
+            self.open_writers(headers, basic_filename, detail_filename, state)
+            done_detail_urls = set(self.detail_spool.keys())
 
-            pages = self.get_pagination_info(soup)
+            pages = self.get_pagination_info(doc)
             total_pages = len(pages)
             logging.info(f"총 {total_pages}개의 페이지를 크롤링합니다.")
 
-            for page_num in pages:
-                logging.info(f"페이지 {page_num} 크롤링 중...")
-                page_url = f"{self.base_url}?page={page_num}"
-                page_soup = self.get_page_content(page_url)
-                
-                if not page_soup:
-                    continue
+            todo_pages = [page_num for page_num in pages if page_num not in self.pages_done]
+            if len(todo_pages) < total_pages:
+                logging.info(f"{total_pages - len(todo_pages)}개의 페이지는 이미 수집되었습니다.")
 
-                # 기본 정보 수집
-                rows = self.get_board_rows(page_soup)
-                self.basic_data.extend(rows)
-                
-                # 상세 정보 수집
-                for row in rows:
-                    detail_url = row[-1]  # URL은 마지막 컬럼
-                    if detail_url:
-                        detail_soup = self.get_page_content(detail_url)
-                        if detail_soup:
-                            detail_info = self.parse_job_detail(detail_soup, detail_url)
-                            detail_info['상세정보_URL'] = detail_url  # URL을 키로 사용하여 나중에 매칭
-                            self.detail_data.append(detail_info)
-                            time.sleep(1)  # 서버 부하 방지
-
-                time.sleep(2)  # 페이지 간 딜레이
+            # 목록 페이지 탐색(현재 스레드) -> 상세 URL 큐 -> fetch 워커 -> parse 워커 -> writer 스레드
+            pipeline = CrawlPipeline(self.fetch_detail, self.parse_detail, self.write_result,
+                                     fetch_workers=self.concurrency, parse_workers=self.parse_workers,
+                                     queue_size=self.queue_size, name='rndjob 파이프라인',
+                                     rate_limiter=self.rate_limiter, url_fn=lambda item: item[2]).start()
+            try:
+                self.discover_pages(pipeline, headers, todo_pages, done_detail_urls)
+            finally:
+                pipeline.close()
+
+            if self.state_store:
+                self.state_store.log_stats()
+            if self.company_cache:
+                self.company_cache.log_stats()
 
             if basic_filename and detail_filename:
                 self.save_to_csv(headers, basic_filename, detail_filename)
+
+            # 정상 종료 시 체크포인트 삭제
+            if self.checkpoint:
+                self.checkpoint.clear()
         
         finally:
-            # WebDriver 종료
-            self.close_driver()
+            self.wait_stats.log_summary('rndjob 크롤링')
+            self.http.log_stats()
+            if self.basic_writer:
+                self.basic_writer.close()
+            if self.detail_spool:
+                self.detail_spool.close()
+
+    def discover_pages(self, pipeline, headers, todo_pages, done_detail_urls):
+        """목록 페이지를 순서대로 가져와 상세 URL을 파이프라인에 넣기 (큐가 가득 차면 대기)"""
+        submitted = set()
+        for page_num in todo_pages:
+            logging.info(f"페이지 {page_num} 크롤링 중...")
+            page_html = self.fetch_page_text(f"{self.base_url}?page={page_num}")
+            if not page_html:
+                continue
+            rows = self.get_board_rows(self.parse_html(page_html))
+
+            # 목록 행이 바뀌지 않은 공고는 저장된 상세 정보 재사용, 나머지만 상세 페이지 수집
+            cached, fetch = [], []
+            for row in rows:
+                detail_url = row[-1]  # URL은 마지막 컬럼
+                if not detail_url or detail_url in done_detail_urls or detail_url in submitted:
+                    continue
+                submitted.add(detail_url)
+                fingerprint = row_fingerprint(headers, row) if self.state_store else None
+                cached_detail = self.state_store.get_cached_detail(detail_url, fingerprint) if self.state_store else None
+                if cached_detail:
+                    self.state_store.touch([detail_url])
+                    cached.append((detail_url, cached_detail))
+                else:
+                    fetch.append((detail_url, fingerprint))
+
+            # 페이지 표시를 먼저 보내야 writer가 이 페이지의 상세 정보보다 먼저 받음
+            pipeline.emit(('page', page_num), (headers, rows, [url for url, _ in cached + fetch]))
+            for detail_url, cached_detail in cached:
+                pipeline.emit(('detail', page_num, detail_url, None), cached_detail)
+            for detail_url, fingerprint in fetch:
+                pipeline.submit(('detail', page_num, detail_url, fingerprint))
+
+    def fetch_detail(self, item):
+        """파이프라인 fetch 단계: 상세 페이지 HTML 가져오기 (재시도 후에도 실패하면 재시도 목록에 기록)
+
+        속도 제한 대기는 파이프라인의 asyncio 수집기가 요청 전에 처리한다.
+        """
+        try:
+            return self.http.get_text(item[2], raise_errors=True, headers=self.headers)
+        except Exception as e:
+            if self.dead_letters:
+                self.dead_letters.add_error(item[2], e)
+            return None
+
+    def parse_detail(self, item, detail_html):
+        """파이프라인 parse 단계: 상세 페이지와 회사 정보 파싱 (본문이 지난번과 같으면 저장된 결과 재사용)"""
+        if not detail_html:
+            return None
+        detail_url = item[2]
+        # 캐시에는 HTML 파싱 결과만 저장하고, 회사 정보는 매번 회사 정보 캐시(유효 기간 적용)를 거쳐 가져옴
+        sections = self.http.parse_cached(
+            detail_url, detail_html,
+            lambda html: self.parse_detail_sections(self.parse_html(html)))
+        detail_info = dict(sections['company_box'])
+        detail_info.update(self.get_company_info_by_id(sections['company_id'], detail_url))
+        detail_info.update(sections['posting'])
+        detail_info['상세정보_URL'] = detail_url  # URL을 키로 사용하여 나중에 매칭
+        return detail_info
+
+    def write_result(self, item, result):
+        """파이프라인 writer 단계: 상세 정보를 spool에 기록하고 끝난 페이지의 목록 행을 페이지 순서대로 기록"""
+        if item[0] == 'page':
+            page_num = item[1]
+            headers, rows, detail_urls = result
+            self.page_order.append(page_num)
+            self.page_rows[page_num] = (headers, rows)
+            self.page_pending[page_num] = set(detail_urls)
+            self.pending_urls.update(dict.fromkeys(detail_urls))
+        else:
+            _, page_num, detail_url, fingerprint = item
+            if result is not None:
+                self.detail_spool.write(result)
+                if self.dead_letters:
+                    self.dead_letters.remove(detail_url)
+                if self.state_store and fingerprint is not None:
+                    self.state_store.upsert(detail_url, fingerprint, result)
+            self.page_pending[page_num].discard(detail_url)
+            self.pending_urls.pop(detail_url, None)
+            if self.checkpoint:
+                self.checkpoint.update(self.checkpoint_state)
+        self.flush_completed_pages()
+
+    def flush_completed_pages(self):
+        """상세 정보가 모두 기록된 페이지의 목록 행을 페이지 순서대로 basic_writer에 기록"""
+        while self.page_order and not self.page_pending[self.page_order[0]]:
+            page_num = self.page_order.pop(0)
+            del self.page_pending[page_num]
+            headers, rows = self.page_rows.pop(page_num)
+            self.basic_writer.write_rows(self.to_basic_record(headers, row) for row in rows)
+            self.pages_done.append(page_num)
+            if self.checkpoint:
+                self.checkpoint.update(self.checkpoint_state, force=True)
 
     def save_to_csv(self, headers, basic_filename, detail_filename):
-        """수집된 데이터를 CSV 파일로 저장합니다."""
-        if not self.basic_data or not self.detail_data:
+        """기록된 기본 정보 CSV와 상세 정보 spool을 최종 CSV 파일로 저장합니다."""
+        if not self.basic_writer.row_count or not len(self.detail_spool):
             logging.warning("저장할 데이터가 없습니다.")
             return
 
@@ -407,28 +547,17 @@ class RndJobCrawler:
             output_dir = os.path.dirname(basic_filename)
             os.makedirs(output_dir, exist_ok=True)
 
-            # 기본 정보 저장
-            df_basic = pd.DataFrame(self.basic_data, columns=headers)
-
-            # '등록일/마감일' 컬럼이 있으면 분리하여 추가
-            if '등록일/마감일' in df_basic.columns:
-                # '등록일/마감일' 값을 분리하여 새로운 컬럼 생성
-                df_basic[['등록일', '마감일']] = df_basic['등록일/마감일'].str.split(' ', n=1, expand=True)
-                # 컬럼 순서 조정: 등록일, 마감일을 기존 위치에 삽입
-                insert_idx = headers.index('등록일/마감일')
-                new_columns = list(df_basic.columns)
-                # 등록일, 마감일을 기존 위치에 삽입
-                for col in ['마감일', '등록일']:
-                    new_columns.remove(col)
-                new_columns[insert_idx:insert_idx] = ['등록일', '마감일']
-                df_basic = df_basic[new_columns]
-
-            df_basic.to_csv(basic_filename, index=False, encoding='utf-8-sig')
+            # 기본 정보 저장 (등록일/마감일 분리는 행을 기록할 때 처리됨)
+            self.basic_writer.flush()
+            self.basic_writer.close()
+            # 상세 정보는 파이프라인이 완료 순서대로 기록하므로 기본 정보의 URL 순서로 내보냄
+            detail_urls = dict.fromkeys(row[-1] for row in CsvRowWriter.read_rows(self.basic_writer.path) if row[-1])
+            finalize_rows(self.basic_writer.path, basic_filename, self.output_format)
             logging.info(f"기본 정보가 {basic_filename}에 저장되었습니다.")
 
             # 상세 정보 저장
-            df_detail = pd.DataFrame(self.detail_data)
-            df_detail.to_csv(detail_filename, index=False, encoding='utf-8-sig')
+            self.detail_spool.export(detail_filename, keys=list(detail_urls), fmt=self.output_format)
+            self.detail_spool.remove()
             logging.info(f"상세 정보가 {detail_filename}에 저장되었습니다.")
 
         except Exception as e:
@@ -438,11 +567,49 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='R&D Job Crawler')
     parser.add_argument('--basic-output', required=True, help='Output filename for basic job information')
     parser.add_argument('--detail-output', required=True, help='Output filename for detailed job information')
+    parser.add_argument('--incremental', action='store_true', help='Only fetch details for new or changed postings')
+    parser.add_argument('--state-db', default='crawled_data/crawl_state.sqlite', help='SQLite posting state store used by --incremental')
+    parser.add_argument('--checkpoint', default='crawled_data/checkpoints/rndjob_job_crawler.json', help='Checkpoint file for crawl progress')
+    parser.add_argument('--checkpoint-interval', type=int, default=10, help='Save a checkpoint every N detail pages')
+    parser.add_argument('--resume', action='store_true', help='Resume from the last checkpoint and skip completed work')
+    parser.add_argument('--concurrency', type=int, default=4, help='Maximum number of concurrent requests to rndjob.or.kr')
+    parser.add_argument('--rate-limit', type=float, default=2.0, help='Maximum requests per second to rndjob.or.kr')
+    parser.add_argument('--parse-workers', type=int, default=2, help='Number of detail parse workers (they also fetch company info)')
+    parser.add_argument('--queue-size', type=int, default=32, help='Maximum items waiting between pipeline stages')
+    parser.add_argument('--company-cache', default='crawled_data/company_cache.sqlite', help='SQLite company detail cache shared with research_company_crawler.py')
+    parser.add_argument('--company-cache-ttl', type=float, default=7, help='Days before a cached company detail is fetched again (0 disables reuse)')
+    parser.add_argument('--http-cache', default='crawled_data/http_cache.sqlite', help='SQLite HTTP cache for conditional GETs and parse reuse (empty to disable)')
+    parser.add_argument('--parser', choices=available_backends(), default='lxml', help='HTML parser backend')
+    parser.add_argument('--archive-dir', default='crawled_data/html_archive/rndjob', help='Append-only raw HTML archive used by reparse.py (empty to disable)')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv', help='Output file format for basic/detail information')
+    parser.add_argument('--dead-letter-db', default='crawled_data/dead_letters.sqlite', help='SQLite list of detail URLs that failed after retries (empty to disable)')
+    parser.add_argument('--breaker-threshold', type=int, default=5, help='Consecutive timeouts/5xx that pause requests to a host')
+    parser.add_argument('--breaker-reset', type=float, default=30, help='Seconds to pause a failing host before a probe request')
     
     args = parser.parse_args()
+    if args.format == 'parquet':
+        require_parquet()
     
-    crawler = RndJobCrawler()
+    state_store = PostingStateStore(args.state_db, source='rndjob') if args.incremental else None
+    checkpoint = CrawlCheckpoint(args.checkpoint, interval=args.checkpoint_interval)
+    if args.http_cache:
+        get_client().use_cache(HttpCache(args.http_cache))
+    archive = HtmlArchive(args.archive_dir) if args.archive_dir else None
+    company_cache = CompanyCache(args.company_cache, ttl=args.company_cache_ttl * 24 * 3600)
+    dead_letters = DeadLetterStore(args.dead_letter_db, source='rndjob') if args.dead_letter_db else None
+    configure_breakers(failure_threshold=args.breaker_threshold, reset_timeout=args.breaker_reset)
+    crawler = RndJobCrawler(state_store=state_store, checkpoint=checkpoint,
+                            concurrency=args.concurrency, rate_limit=args.rate_limit,
+                            company_cache=company_cache, archive=archive, parser_backend=args.parser,
+                            parse_workers=args.parse_workers, queue_size=args.queue_size, dead_letters=dead_letters,
+                            output_format=args.format)
     crawler.crawl(
         basic_filename=args.basic_output,
-        detail_filename=args.detail_output
-    ) 
\ No newline at end of file
+        detail_filename=args.detail_output,
+        resume=args.resume
+    ) 
+    if archive:
+        archive.close()
+    if dead_letters:
+        dead_letters.log_stats()
+        dead_letters.close()
@@ -0,0 +1,205 @@
+import csv
+import json
+import logging
+import os
+import threading
+
+from table_io import ensure_parent_dir, records_to_table, write_parquet, csv_to_parquet
+
+
+def format_cell(value):
+    """CSV 셀 값 변환 (None은 빈 문자열, list/dict는 다시 읽을 수 있도록 JSON 문자열)"""
+    if value is None:
+        return ''
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def finalize_rows(part_path, path, fmt='csv'):
+    """CsvRowWriter로 기록을 마친 임시 CSV를 최종 파일로 옮기거나(csv) parquet으로 변환"""
+    if fmt == 'parquet':
+        csv_to_parquet(part_path, path)
+        os.remove(part_path)
+    else:
+        os.replace(part_path, path)
+
+
+class CsvRowWriter:
+    """고정된 컬럼 스키마로 수집한 행을 CSV 파일에 바로 추가하는 writer"""
+    def __init__(self, path, columns, resume_offset=None):
+        self.path = path
+        self.columns = list(columns)
+        self.row_count = 0
+        ensure_parent_dir(path)
+        if resume_offset is not None and os.path.exists(path):
+            # 체크포인트 이후에 기록된(불완전할 수 있는) 행은 잘라내고 이어서 기록
+            with open(path, 'r+b') as f:
+                f.truncate(resume_offset)
+            self.row_count = sum(1 for _ in self.read_rows(path))
+            self.file = open(path, 'a', encoding='utf-8-sig', newline='')
+            self.writer = csv.writer(self.file, lineterminator='\n')
+        else:
+            self.file = open(path, 'w', encoding='utf-8-sig', newline='')
+            self.writer = csv.writer(self.file, lineterminator='\n')
+            self.writer.writerow(self.columns)
+
+    def write_row(self, row):
+        self.writer.writerow([format_cell(value) for value in row])
+        self.row_count += 1
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.write_row(row)
+
+    def flush(self):
+        """버퍼를 디스크에 반영하고 현재 파일 위치(바이트)를 반환"""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    @staticmethod
+    def read_rows(path):
+        """기록된 CSV의 데이터 행을 하나씩 읽기 (헤더 제외)"""
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                yield row
+
+
+class JsonlSpool:
+    """dict 행을 JSON Lines로 추가 기록하고 키별 파일 위치를 인덱스로 유지하는 append-only 저장소
+
+    같은 키가 여러 번 기록되면 마지막 기록이 유효하다. 컬럼은 처음 나타난 순서대로 누적되어
+    export_csv에서 고정된 스키마로 사용된다.
+    """
+    def __init__(self, path, key='상세정보_URL', resume=False):
+        self.path = path
+        self.key = key
+        self.index = {}  # 키 -> 마지막 기록의 파일 위치
+        self.columns = {}  # 처음 나타난 순서를 유지하는 컬럼 집합
+        self.lock = threading.Lock()
+        ensure_parent_dir(path)
+        if resume and os.path.exists(path):
+            self.rebuild_index()
+            self.file = open(path, 'ab')
+        else:
+            self.file = open(path, 'wb')
+
+    def rebuild_index(self):
+        """기존 spool을 읽어 인덱스 복원 (마지막 불완전한 줄은 잘라냄)"""
+        valid_end = 0
+        with open(self.path, 'rb') as f:
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                self.track(record, offset)
+                valid_end = f.tell()
+        with open(self.path, 'r+b') as f:
+            f.truncate(valid_end)
+        logging.info(f"spool 복원: {self.path} ({len(self.index)}건)")
+
+    def track(self, record, offset):
+        self.index[record.get(self.key)] = offset
+        for column in record:
+            self.columns.setdefault(column, None)
+
+    def write(self, record):
+        line = (json.dumps(record, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+        with self.lock:
+            offset = self.file.tell()
+            self.file.write(line)
+            self.track(record, offset)
+
+    def flush(self):
+        with self.lock:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def get(self, key):
+        """키에 해당하는 마지막 기록 읽기"""
+        offset = self.index.get(key)
+        if offset is None:
+            return None
+        self.flush()
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def keys(self):
+        return list(self.index)
+
+    def iter_records(self):
+        """키별 마지막 기록을 기록 순서대로 읽기"""
+        self.flush()
+        with open(self.path, 'rb') as reader:
+            for offset in sorted(self.index.values()):
+                reader.seek(offset)
+                yield json.loads(reader.readline())
+
+    def iter_export(self, reader, keys=None):
+        """내보낼 레코드를 keys 순서대로(없으면 기록 순서대로) 읽기"""
+        for key in (self.keys() if keys is None else keys):
+            offset = self.index.get(key)
+            if offset is None:
+                continue
+            reader.seek(offset)
+            yield json.loads(reader.readline())
+
+    def export_csv(self, csv_path, keys=None):
+        """spool을 CSV로 변환 (keys 순서대로, 없으면 기록 순서대로) 후 기록한 행 수 반환"""
+        self.flush()
+        columns = list(self.columns)
+        ensure_parent_dir(csv_path)
+        count = 0
+        with open(self.path, 'rb') as reader, open(csv_path, 'w', encoding='utf-8-sig', newline='') as out:
+            writer = csv.writer(out, lineterminator='\n')
+            writer.writerow(columns)
+            for record in self.iter_export(reader, keys):
+                writer.writerow([format_cell(record.get(column)) for column in columns])
+                count += 1
+        return count
+
+    def export_parquet(self, parquet_path, keys=None):
+        """spool을 parquet으로 변환 (리스트 컬럼은 list<string>으로 유지) 후 기록한 행 수 반환"""
+        self.flush()
+        with open(self.path, 'rb') as reader:
+            records = list(self.iter_export(reader, keys))
+        write_parquet(records_to_table(records, list(self.columns)), parquet_path)
+        return len(records)
+
+    def export(self, path, keys=None, fmt='csv'):
+        """출력 형식(csv/parquet)에 맞게 spool 내보내기"""
+        if fmt == 'parquet':
+            return self.export_parquet(path, keys)
+        return self.export_csv(path, keys)
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+    def remove(self):
+        """CSV로 변환이 끝난 spool 파일 삭제"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
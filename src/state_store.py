@@ -0,0 +1,106 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+# 목록 행 fingerprint 계산 시 제외할 컬럼 (새 공고가 올라올 때마다 값이 바뀜)
+VOLATILE_COLUMNS = ('번호', 'No', 'NO')
+
+
+def content_hash(data):
+    """dict/list 데이터의 내용 해시 (키 순서와 무관)"""
+    payload = json.dumps(data, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def row_fingerprint(headers, row, exclude=VOLATILE_COLUMNS):
+    """목록 행의 fingerprint 계산 (번호처럼 매번 바뀌는 컬럼은 제외)"""
+    values = [value for header, value in zip(headers, row) if header not in exclude]
+    return content_hash(values)
+
+
+class PostingStateStore:
+    """상세정보_URL을 키로 공고의 마지막 수집 상태를 저장하는 SQLite 저장소"""
+    def __init__(self, db_path='crawled_data/crawl_state.sqlite', source=''):
+        self.db_path = db_path
+        self.source = source
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        # 상세 정보 워커 스레드에서도 사용하므로 연결 하나를 lock으로 보호
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS postings (
+                    url TEXT PRIMARY KEY,
+                    source TEXT,
+                    fingerprint TEXT,
+                    content_hash TEXT,
+                    detail_json TEXT,
+                    first_seen TEXT,
+                    last_seen TEXT
+                )
+            """)
+        self.stats = {'hit': 0, 'miss': 0}
+
+    def get(self, url):
+        """저장된 공고 상태 조회 (없으면 None)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT fingerprint, content_hash, detail_json, first_seen, last_seen FROM postings WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            'fingerprint': row[0],
+            'content_hash': row[1],
+            'detail': json.loads(row[2]) if row[2] else None,
+            'first_seen': row[3],
+            'last_seen': row[4],
+        }
+
+    def get_cached_detail(self, url, fingerprint):
+        """목록 행이 바뀌지 않은 공고의 저장된 상세 정보 반환 (새 공고/변경 공고는 None)"""
+        state = self.get(url)
+        hit = bool(state and state['fingerprint'] == fingerprint and state['detail'] and len(state['detail']) > 1)
+        # 파이프라인 워커 스레드에서 동시에 호출되므로 통계도 lock 안에서 갱신
+        with self.lock:
+            self.stats['hit' if hit else 'miss'] += 1
+        return state['detail'] if hit else None
+
+    def upsert(self, url, fingerprint, detail):
+        """공고 상태 저장 (상세 정보 수집에 실패한 경우 fingerprint를 비워 다음 실행에서 재수집)"""
+        now = datetime.now().isoformat(timespec='seconds')
+        if not detail or len(detail) <= 1:
+            fingerprint = None
+        with self.lock, self.conn:
+            self.conn.execute("""
+                INSERT INTO postings (url, source, fingerprint, content_hash, detail_json, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    source = excluded.source,
+                    fingerprint = excluded.fingerprint,
+                    content_hash = excluded.content_hash,
+                    detail_json = excluded.detail_json,
+                    last_seen = excluded.last_seen
+            """, (url, self.source, fingerprint, content_hash(detail or {}),
+                  json.dumps(detail or {}, ensure_ascii=False, default=str), now, now))
+
+    def touch(self, urls):
+        """이번 실행에서 목록에 다시 나타난 공고의 last_seen 갱신"""
+        now = datetime.now().isoformat(timespec='seconds')
+        with self.lock, self.conn:
+            self.conn.executemany("UPDATE postings SET last_seen = ? WHERE url = ?",
+                                  [(now, url) for url in urls])
+
+    def log_stats(self):
+        logging.info(f"상태 저장소 - 재사용: {self.stats['hit']}건, 신규/변경: {self.stats['miss']}건")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
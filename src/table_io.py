@@ -0,0 +1,116 @@
+import csv
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# 크롤러/처리 단계의 출력 형식 (parquet은 pyarrow가 설치되어 있을 때만 사용 가능)
+OUTPUT_FORMATS = ('csv', 'parquet')
+PARQUET_MAGIC = b'PAR1'
+
+
+def require_parquet():
+    if pa is None:
+        raise RuntimeError("parquet 형식을 사용하려면 pyarrow를 설치하세요. (pip install pyarrow)")
+
+
+def ensure_parent_dir(path):
+    output_dir = os.path.dirname(path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+
+def is_parquet(path):
+    """확장자 또는 파일 앞부분의 magic 바이트로 parquet 파일 여부 판단"""
+    if path.endswith('.parquet'):
+        return True
+    try:
+        with open(path, 'rb') as f:
+            return f.read(4) == PARQUET_MAGIC
+    except OSError:
+        return False
+
+
+def read_columns(path):
+    """데이터를 읽지 않고 컬럼 목록만 확인 (parquet은 파일 메타데이터, CSV는 헤더 행)"""
+    if is_parquet(path):
+        require_parquet()
+        return pq.read_schema(path).names
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        return next(csv.reader(f), [])
+
+
+def read_table(path, columns=None, dtype=None):
+    """CSV/parquet 파일을 DataFrame으로 읽기 (columns가 있으면 해당 컬럼만 읽음, dtype은 CSV에만 적용)"""
+    if is_parquet(path):
+        require_parquet()
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, usecols=columns, dtype=dtype, encoding='utf-8-sig')
+
+
+def read_records(path):
+    """CSV/parquet 파일을 dict 행 목록으로 읽기 (parquet의 리스트 컬럼은 리스트 그대로)"""
+    if is_parquet(path):
+        require_parquet()
+        return pq.read_table(path).to_pylist()
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def records_to_table(records, columns=None):
+    """dict 행 목록을 Arrow 테이블로 변환
+
+    리스트 값이 하나라도 있는 컬럼은 list<string>(문자열 값은 한 항목짜리 리스트), dict 값은 JSON 문자열,
+    나머지는 문자열로 저장하여 행마다 타입이 달라도 스키마가 하나로 정해지게 한다.
+    """
+    require_parquet()
+    if columns is None:
+        columns = list(dict.fromkeys(key for record in records for key in record))
+    arrays = []
+    for column in columns:
+        values = [record.get(column) for record in records]
+        values = [None if value == '' else value for value in values]
+        if any(isinstance(value, list) for value in values):
+            arrays.append(pa.array([None if value is None else [str(item) for item in value] if isinstance(value, list)
+                                    else [str(value)] for value in values], type=pa.list_(pa.string())))
+        else:
+            arrays.append(pa.array([None if value is None else json.dumps(value, ensure_ascii=False) if isinstance(value, dict)
+                                    else str(value) for value in values], type=pa.string()))
+    return pa.Table.from_arrays(arrays, names=list(columns))
+
+
+def write_parquet(table, path):
+    """Arrow 테이블을 parquet 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+    require_parquet()
+    ensure_parent_dir(path)
+    part_path = f"{path}.part"
+    pq.write_table(table, part_path, compression='zstd')
+    os.replace(part_path, path)
+
+
+def write_dataframe(df, path, list_columns=()):
+    """DataFrame을 dtype 그대로 parquet 파일로 저장 (list_columns는 모든 행이 빈 리스트여도 list<string>)"""
+    require_parquet()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for column in list_columns:
+        if column in table.column_names:
+            index = table.column_names.index(column)
+            table = table.set_column(index, column, table.column(index).cast(pa.list_(pa.string())))
+    write_parquet(table, path)
+
+
+def csv_to_parquet(csv_path, parquet_path):
+    """크롤러가 기록한 CSV를 모든 컬럼을 문자열로 유지한 채 parquet으로 변환하고 행 수 반환"""
+    require_parquet()
+    columns = read_columns(csv_path)
+    table = pa_csv.read_csv(csv_path, convert_options=pa_csv.ConvertOptions(
+        column_types={column: pa.string() for column in columns}, strings_can_be_null=True))
+    write_parquet(table, parquet_path)
+    return table.num_rows
@@ -0,0 +1,56 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+
+class WaitStats:
+    """크롤링 중 대기한 시간(요소 대기, 요청 속도 제한, 재시도 지연)과 실제 작업 시간 집계 (스레드 안전)
+
+    대기 시간은 종류별로 모든 스레드의 합계를 기록하고, 크롤링을 시작한 스레드(목록/브라우저 조작)의
+    대기 시간은 따로 기록하여 전체 실행 시간 중 작업에 쓴 시간을 계산한다.
+    """
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.main_thread = threading.get_ident()
+        self.waits = {}  # 종류 -> [횟수, 합계(초)]
+        self.main_wait = 0.0
+        self.lock = threading.Lock()
+
+    def reset(self):
+        """크롤링 시작 시각과 기준 스레드를 현재로 다시 설정"""
+        with self.lock:
+            self.started_at = time.perf_counter()
+            self.main_thread = threading.get_ident()
+            self.waits = {}
+            self.main_wait = 0.0
+
+    def add(self, kind, seconds):
+        if seconds <= 0:
+            return
+        with self.lock:
+            stats = self.waits.setdefault(kind, [0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            if threading.get_ident() == self.main_thread:
+                self.main_wait += seconds
+
+    @contextmanager
+    def waiting(self, kind):
+        """with 블록 동안의 시간을 kind 대기 시간으로 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(kind, time.perf_counter() - started)
+
+    def log_summary(self, name='크롤링'):
+        elapsed = time.perf_counter() - self.started_at
+        with self.lock:
+            waits = {kind: list(stats) for kind, stats in self.waits.items()}
+            main_wait = self.main_wait
+        total_wait = sum(seconds for _, seconds in waits.values())
+        detail = ', '.join(f"{kind} {seconds:.1f}초({count}회)" for kind, (count, seconds) in waits.items()) or '없음'
+        work = max(0.0, elapsed - main_wait)
+        logging.info(f"{name} 대기 시간 - 전체 {elapsed:.1f}초 중 메인 스레드 작업 {work:.1f}초, 대기 {main_wait:.1f}초 "
+                     f"({(main_wait / elapsed * 100) if elapsed else 0:.1f}%) / 모든 스레드 대기 합계 {total_wait:.1f}초: {detail}")